@@ -15,6 +15,7 @@ OUTPUT_JSON="dependency_data.json"
 NO_EXPORTS=false
 GENERATE_IMAGE=false
 IMAGE_FORMAT="png"
+JOBS=""
 
 # Colors for output
 RED='\033[0;31m'
@@ -45,6 +46,7 @@ OPTIONS:
     -n, --no-exports         Skip file exports, only show report
     -g, --generate-image     Generate visual graph image (requires graphviz)
     -f, --format FORMAT      Image format: png, svg, pdf (default: png)
+    --jobs N                 Worker processes for scanning Swift files (default: CPU count)
     -h, --help               Show this help message
 
 EXAMPLES:
@@ -95,6 +97,10 @@ while [[ $# -gt 0 ]]; do
             fi
             shift 2
             ;;
+        --jobs)
+            JOBS="$2"
+            shift 2
+            ;;
         -h|--help)
             show_usage
             exit 0
@@ -129,6 +135,10 @@ fi
 # Build Python command
 PYTHON_CMD=(python3 "$PYTHON_SCRIPT" --submodules-path "$SUBMODULES_PATH")
 
+if [[ -n "$JOBS" ]]; then
+    PYTHON_CMD+=(--jobs "$JOBS")
+fi
+
 if [[ "$NO_EXPORTS" == true ]]; then
     PYTHON_CMD+=(--no-exports)
 else
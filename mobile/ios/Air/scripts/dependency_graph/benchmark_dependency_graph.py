@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Swift Module Dependency Graph Benchmark
+
+This script generates synthetic SubModules trees and times each phase of
+build_dependency_graph.py on them, so scaling regressions show up between
+versions.
+
+Usage:
+    python3 benchmark_dependency_graph.py --preset air
+    python3 benchmark_dependency_graph.py --preset air --preset large --output results.json
+    python3 benchmark_dependency_graph.py --modules 300 --files-per-module 40 --cycle-density 0.05
+
+Each generated module imports a random set of lower-numbered modules, which
+keeps the graph acyclic; --cycle-density is the fraction of modules that also
+import a higher-numbered module and so create cycles.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict
+
+from build_dependency_graph import DependencyGraphBuilder
+
+
+PRESETS = {
+    'air': {'modules': 27, 'files_per_module': 30, 'imports_per_file': 4, 'file_size': 4000, 'cycle_density': 0.0},
+    'medium': {'modules': 500, 'files_per_module': 20, 'imports_per_file': 5, 'file_size': 4000, 'cycle_density': 0.01},
+    'large': {'modules': 2000, 'files_per_module': 50, 'imports_per_file': 6, 'file_size': 4000, 'cycle_density': 0.02},
+    'huge': {'modules': 5000, 'files_per_module': 100, 'imports_per_file': 6, 'file_size': 4000, 'cycle_density': 0.02},
+}
+
+PHASES = [
+    'scan_modules',
+    'find_swift_files',
+    'extract_imports',
+    'detect_cycles',
+    'topological_sort',
+    'export_to_dot',
+    'export_to_json',
+]
+
+SYSTEM_IMPORTS = ['Foundation', 'UIKit', 'SwiftUI', 'Combine']
+
+FILLER_LINE = "    let value{0} = compute({0}) // synthetic filler to reach the target file size\n"
+
+
+def generate_workspace(root: str, modules: int, files_per_module: int, imports_per_file: int,
+                       file_size: int, cycle_density: float, seed: int) -> str:
+    """Write a synthetic SubModules tree under root and return its path."""
+    rng = random.Random(seed)
+    submodules_path = os.path.join(root, 'SubModules')
+    names = [f"Module{i:05d}" for i in range(modules)]
+
+    for i, name in enumerate(names):
+        module_dir = os.path.join(submodules_path, name, 'Sources')
+        os.makedirs(module_dir)
+
+        # Each module draws its imports from a small pool so files agree on
+        # the module's dependencies, like real code does.
+        pool = rng.sample(names[:i], min(i, imports_per_file * 2))
+        if i + 1 < modules and rng.random() < cycle_density:
+            pool.append(rng.choice(names[i + 1:]))
+
+        for j in range(files_per_module):
+            imports = rng.sample(pool, min(len(pool), imports_per_file))
+            header = ''.join(f"import {module}\n" for module in SYSTEM_IMPORTS[:2] + imports)
+            body = [header, f"\nstruct {name}Type{j} {{\n"]
+            size = len(header)
+            line = 0
+            while size < file_size:
+                filler = FILLER_LINE.format(line)
+                body.append(filler)
+                size += len(filler)
+                line += 1
+            body.append("}\n")
+            with open(os.path.join(module_dir, f"File{j:04d}.swift"), 'w') as f:
+                f.write(''.join(body))
+
+    return submodules_path
+
+
+def run_phases(submodules_path: str, output_dir: str, jobs: int) -> Dict[str, float]:
+    """Time every phase of the analyzer once and return {phase: seconds}."""
+    builder = DependencyGraphBuilder(submodules_path)
+    steps = {
+        'scan_modules': builder.scan_modules,
+        'find_swift_files': builder.find_swift_files,
+        'extract_imports': lambda: builder.extract_imports(jobs=jobs),
+        'detect_cycles': builder.detect_cycles,
+        'topological_sort': builder.topological_sort,
+        'export_to_dot': lambda: builder.export_to_dot(os.path.join(output_dir, 'dependency_graph.dot')),
+        'export_to_json': lambda: builder.export_to_json(os.path.join(output_dir, 'dependency_data.json')),
+    }
+
+    timings = {}
+    for phase in PHASES:
+        start = time.perf_counter()
+        steps[phase]()
+        timings[phase] = time.perf_counter() - start
+    return timings
+
+
+def run_benchmark(name: str, params: Dict, repeat: int, jobs: int, seed: int, workdir: str) -> Dict:
+    """Generate one workspace, run every phase repeat times and keep the best timings."""
+    root = tempfile.mkdtemp(prefix=f"depgraph-bench-{name}-", dir=workdir)
+    try:
+        print(f"Generating '{name}': {params['modules']} modules x {params['files_per_module']} files...")
+        start = time.perf_counter()
+        submodules_path = generate_workspace(root, seed=seed, **params)
+        generation_time = time.perf_counter() - start
+
+        runs = [run_phases(submodules_path, root, jobs) for _ in range(repeat)]
+        best = {phase: min(run[phase] for run in runs) for phase in PHASES}
+
+        return {
+            'name': name,
+            'params': params,
+            'total_files': params['modules'] * params['files_per_module'],
+            'generation_seconds': generation_time,
+            'phases': best,
+            'total_seconds': sum(best.values()),
+            'runs': runs
+        }
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def print_results(results: Dict) -> None:
+    """Print one row per benchmark and one column per phase."""
+    columns = ['name', 'files'] + PHASES + ['total']
+    widths = [max(len(column), 10) for column in columns]
+    print()
+    print('  '.join(column.rjust(width) for column, width in zip(columns, widths)))
+    for benchmark in results['benchmarks']:
+        row = [benchmark['name'], str(benchmark['total_files'])]
+        row += [f"{benchmark['phases'][phase] * 1000:.1f}ms" for phase in PHASES]
+        row.append(f"{benchmark['total_seconds'] * 1000:.1f}ms")
+        print('  '.join(cell.rjust(width) for cell, width in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Benchmark build_dependency_graph.py on synthetic SubModules trees'
+    )
+    parser.add_argument('--preset', action='append', choices=sorted(PRESETS),
+                       help='Named workspace size, may be repeated (default: air)')
+    parser.add_argument('--modules', type=int, help='Number of modules (custom workspace)')
+    parser.add_argument('--files-per-module', type=int, default=20, help='Swift files per module (default: 20)')
+    parser.add_argument('--imports-per-file', type=int, default=5, help='Module imports per file (default: 5)')
+    parser.add_argument('--file-size', type=int, default=4000, help='Approximate bytes per file (default: 4000)')
+    parser.add_argument('--cycle-density', type=float, default=0.0,
+                       help='Fraction of modules that add a back edge creating a cycle (default: 0)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per workspace, best time is reported (default: 3)')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes for extract_imports (default: 1)')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed for workspace generation (default: 42)')
+    parser.add_argument('--workdir', help='Directory for generated workspaces (default: system temp dir)')
+    parser.add_argument('--output', default='benchmark_results.json',
+                       help='Output JSON file with timings (default: benchmark_results.json)')
+
+    args = parser.parse_args()
+
+    workspaces = []
+    if args.modules:
+        workspaces.append(('custom', {
+            'modules': args.modules,
+            'files_per_module': args.files_per_module,
+            'imports_per_file': args.imports_per_file,
+            'file_size': args.file_size,
+            'cycle_density': args.cycle_density
+        }))
+    for preset in args.preset or ([] if args.modules else ['air']):
+        workspaces.append((preset, PRESETS[preset]))
+
+    results = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'jobs': args.jobs,
+        'repeat': args.repeat,
+        'seed': args.seed,
+        'benchmarks': []
+    }
+
+    for name, params in workspaces:
+        results['benchmarks'].append(run_benchmark(name, params, args.repeat, args.jobs, args.seed, args.workdir))
+
+    print_results(results)
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nBenchmark results exported to: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
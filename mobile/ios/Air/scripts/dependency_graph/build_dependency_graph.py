@@ -8,20 +8,350 @@ based on import statements in Swift files.
 
 import os
 import re
+import sys
 import json
+import time
+import cProfile
+import hashlib
+import resource
+import select
+import socket
 import argparse
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from stat import S_ISSOCK
 from collections import defaultdict, deque
-from typing import Dict, Set, List, Tuple
+from typing import Dict, Set, List, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from file_walker import DEFAULT_PRUNE_DIRS, walk_files
+from compile_timings import CompileTimings
+from graph_algorithms import (
+    ReachabilityIndex,
+    build_waves,
+    condensation,
+    critical_path,
+    cyclic_components,
+    elementary_cycles,
+    estimate_makespan,
+    redundant_edges,
+    transitive_reduction,
+)
+from graph_binary import BinaryGraph, is_binary_graph, write_binary_graph
+from swift_import_lexer import lex_import_prelude
+
+
+DEFAULT_MAX_CYCLES = 100
+
+CACHE_VERSION = 4
+DEFAULT_CACHE_NAME = 'dependency_scan_cache.json'
+DEFAULT_SOCKET_NAME = 'dependency_graph.sock'
+
+# First read size for a Swift file; more is read only if the import prelude is longer.
+PRELUDE_READ_SIZE = 1024
+
+# A declaration whose modifiers include public or open, e.g.
+# "@MainActor public final class Foo" or "public private(set) var bar".
+API_DECLARATION = re.compile(
+    rb'^[ \t]*(?:@[A-Za-z_][A-Za-z0-9_.]*(?:\([^)\n]*\))?[ \t]+)*'
+    rb'(?:[a-z]+(?:\([a-z]+\))?[ \t]+)*?(?:public|open)[ \t]+(?:[a-z]+(?:\([a-z]+\))?[ \t]+)*?'
+    rb'(class|struct|enum|protocol|actor|extension|func|init|subscript|var|let|typealias|case|associatedtype|macro)'
+    rb'\b[ \t]*([^\s:(<{=,]*)',
+    re.MULTILINE
+)
+
+
+def find_import_sites(data: bytes, complete: bool = True) -> Optional[Tuple[List[Tuple[str, int, Optional[str]]], int]]:
+    """Return ([(module, line, condition), ...], end) for the import prelude of data.
+
+    condition is the enclosing #if condition, or None for unconditional
+    imports. Returns None if complete is False and data ends inside the prelude.
+    """
+    prelude = lex_import_prelude(data, complete)
+    if prelude is None:
+        return None
+    imports, end = prelude
+    return [(item.module, item.line, item.condition) for item in imports], end
+
+
+def find_public_declarations(data: bytes) -> List[Tuple[str, str, int]]:
+    """Return (kind, name, line) for every public or open declaration in data."""
+    declarations = []
+    line = 1
+    position = 0
+    for match in API_DECLARATION.finditer(data):
+        line += data.count(b'\n', position, match.start(1))
+        position = match.start(1)
+        kind = match.group(1).decode('ascii')
+        name = match.group(2).decode('utf-8', 'replace') or kind
+        declarations.append((kind, name, line))
+    return declarations
+
+
+def scan_swift_file(swift_file: str, known_hash: Optional[str] = None, api_surface: bool = False) -> Tuple[str, Optional[str], Optional[List[Tuple[str, int, Optional[str]]]], Optional[str], int, Optional[List[Tuple[str, str, int]]]]:
+    """Read one Swift file and return (path, hash, import_sites, error, bytes_read, declarations).
+
+    import_sites is a list of (module, line, condition) triples. Normally
+    only the import prelude, up to the first declaration that is not an
+    import, is read and hashed, and declarations is None. With api_surface
+    the whole file is read and hashed in the same pass and declarations
+    lists its public and open declarations. If the hash equals known_hash,
+    import_sites is None, meaning the cached result is still valid. Kept at
+    module level so it can be shipped to worker processes.
+    """
+    declarations = None
+    try:
+        with open(swift_file, 'rb') as f:
+            if api_surface:
+                data = f.read()
+                result = find_import_sites(data)
+            else:
+                data = b''
+                size = PRELUDE_READ_SIZE
+                while True:
+                    chunk = f.read(size)
+                    data += chunk
+                    result = find_import_sites(data, complete=len(chunk) < size)
+                    if result is not None:
+                        break
+                    size = len(data)
+    except Exception as e:
+        return swift_file, None, [], str(e), 0, [] if api_surface else None
+    sites, end = result
+    hashed = data if api_surface else data[:end]
+    content_hash = hashlib.blake2b(hashed, digest_size=16).hexdigest()
+    if content_hash == known_hash:
+        return swift_file, content_hash, None, None, len(data), None
+    if api_surface:
+        declarations = find_public_declarations(data)
+    return swift_file, content_hash, sites, None, len(data), declarations
+
+
+class ScanCache:
+    """Persistent per-file scan results, keyed by path, mtime, size and content hash."""
+    
+    def __init__(self, cache_file: str):
+        self.cache_file = Path(cache_file)
+        self.entries = {}  # absolute path -> {'mtime_ns', 'size', 'hash', 'imports'[, 'declarations']}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+    
+    def load(self) -> None:
+        """Load the cache file, silently starting empty if it is missing or stale."""
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') == CACHE_VERSION:
+            self.entries = data.get('files', {})
+    
+    def save(self) -> None:
+        """Write the cache back to disk if anything changed."""
+        if not self.dirty:
+            return
+        tmp_file = self.cache_file.with_name(self.cache_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump({'version': CACHE_VERSION, 'files': self.entries}, f, separators=(',', ':'))
+        os.replace(tmp_file, self.cache_file)
+        self.dirty = False
+    
+    def lookup(self, path: str, stat: os.stat_result, api_surface: bool = False) -> Optional[Dict]:
+        """Return the cached entry if the file's mtime and size are unchanged.
+
+        With api_surface, entries scanned without public declarations do not count.
+        """
+        entry = self.entries.get(path)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            if api_surface and 'declarations' not in entry:
+                return None
+            self.hits += 1
+            return entry
+        return None
+    
+    def known_hash(self, path: str, api_surface: bool = False) -> Optional[str]:
+        entry = self.entries.get(path)
+        if not entry or (api_surface and 'declarations' not in entry):
+            return None
+        return entry['hash']
+    
+    def store(self, path: str, stat: os.stat_result, content_hash: str, imports: List[Tuple[str, int, Optional[str]]],
+              declarations: Optional[List[Tuple[str, str, int]]] = None) -> None:
+        self.entries[path] = {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'hash': content_hash,
+            'imports': imports
+        }
+        if declarations is not None:
+            self.entries[path]['declarations'] = declarations
+        self.dirty = True
+    
+    def prune(self, live_paths: Set[str]) -> None:
+        """Drop entries for files that no longer exist."""
+        stale = [path for path in self.entries if path not in live_paths]
+        for path in stale:
+            del self.entries[path]
+        if stale:
+            self.dirty = True
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident set size of this process or its largest worker, in bytes."""
+    scale = 1 if sys.platform == 'darwin' else 1024  # ru_maxrss is KiB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return max(own, children) * scale
+
+
+def _cpu_seconds() -> float:
+    """User + system CPU time of this process and its finished workers."""
+    total = 0.0
+    for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN):
+        usage = resource.getrusage(who)
+        total += usage.ru_utime + usage.ru_stime
+    return total
+
+
+class PhaseProfiler:
+    """Records wall time, CPU time, I/O and peak memory for each analysis phase."""
+    
+    def __init__(self):
+        self.phases = []
+    
+    @contextmanager
+    def phase(self, name: str):
+        """Time the enclosed block; the caller may fill in 'files' and 'bytes_read'."""
+        record = {'phase': name, 'files': 0, 'bytes_read': 0}
+        wall_start = time.perf_counter()
+        cpu_start = _cpu_seconds()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall_start
+            record['cpu_seconds'] = _cpu_seconds() - cpu_start
+            record['files_per_second'] = record['files'] / record['wall_seconds'] if record['wall_seconds'] else 0.0
+            record['peak_rss_bytes'] = _peak_rss_bytes()
+            self.phases.append(record)
+    
+    def print_table(self) -> None:
+        """Print one row per phase."""
+        print("\n" + "="*60)
+        print("PROFILE")
+        print("="*60)
+        print(f"\n  {'phase':<18} {'wall':>9} {'cpu':>9} {'files':>8} {'MB read':>9} {'files/s':>10} {'peak RSS':>10}")
+        for record in self.phases:
+            print(f"  {record['phase']:<18} "
+                  f"{record['wall_seconds'] * 1000:>7.1f}ms "
+                  f"{record['cpu_seconds'] * 1000:>7.1f}ms "
+                  f"{record['files']:>8} "
+                  f"{record['bytes_read'] / 1e6:>9.2f} "
+                  f"{record['files_per_second']:>10.0f} "
+                  f"{record['peak_rss_bytes'] / 2**20:>8.1f}MB")
+        total_wall = sum(record['wall_seconds'] for record in self.phases)
+        total_cpu = sum(record['cpu_seconds'] for record in self.phases)
+        print(f"  {'total':<18} {total_wall * 1000:>7.1f}ms {total_cpu * 1000:>7.1f}ms")
+    
+    def export_to_json(self, output_file: str) -> None:
+        data = {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': sys.version.split()[0],
+            'phases': self.phases,
+            'total_wall_seconds': sum(record['wall_seconds'] for record in self.phases),
+            'total_cpu_seconds': sum(record['cpu_seconds'] for record in self.phases),
+            'peak_rss_bytes': max((record['peak_rss_bytes'] for record in self.phases), default=0)
+        }
+        with open(output_file, 'w') as f:
+            json.dump(data, f, indent=2)
+        print(f"Profile exported to: {output_file}")
+
+
+# Colors and styles for each module category in DOT exports
+CATEGORY_STYLES = {
+    'main_app': {
+        'fillcolor': '#ff6b6b',
+        'style': 'filled,bold',
+        'label': 'Main Application',
+        'color': '#d63031'
+    },
+    'core_foundation': {
+        'fillcolor': '#4ecdc4',
+        'style': 'filled,bold',
+        'label': 'Core Foundation',
+        'color': '#00b894'
+    },
+    'ui_features': {
+        'fillcolor': '#ffe66d',
+        'style': 'filled',
+        'label': 'UI Features',
+        'color': '#fdcb6e'
+    },
+    'infrastructure': {
+        'fillcolor': '#a8e6cf',
+        'style': 'filled',
+        'label': 'Infrastructure',
+        'color': '#00b894'
+    }
+}
 
 
 class DependencyGraphBuilder:
-    def __init__(self, submodules_path: str):
+    """Builds and analyzes the SubModules import graph.
+
+    By default the builder is quiet: progress and warnings are only printed
+    with verbose=True, and warnings are always collected in self.warnings.
+    Derived results (stats, categories, cycles, build order, indexes) are
+    computed on first use and memoized until the graph changes; treat them
+    as read-only.
+
+        builder = DependencyGraphBuilder('SubModules').scan()
+        builder.find_cyclic_components()
+    """
+    
+    def __init__(self, submodules_path: str, verbose: bool = False,
+                 prune_dirs: Optional[Set[str]] = None, follow_symlinks: bool = False):
         self.submodules_path = Path(submodules_path)
+        self.verbose = verbose
+        self.prune_dirs = DEFAULT_PRUNE_DIRS if prune_dirs is None else prune_dirs
+        self.follow_symlinks = follow_symlinks
         self.modules = {}  # module_name -> module_info
         self.dependencies = defaultdict(set)  # module_name -> set of dependencies
         self.reverse_dependencies = defaultdict(set)  # module_name -> set of dependents
-        
+        self.warnings = []
+        self.files_read = 0  # I/O counters for --profile
+        self.bytes_read = 0
+        self.compile_timings = None  # CompileTimings from --timing-log
+        self.compile_times = {}  # module_name -> measured times, see load_compile_timings()
+        self.compile_times_unattributed = []
+        self.api_surface_indexed = False  # set by extract_imports(api_surface=True)
+        self._derived = {}  # memoized results, cleared by _invalidate()
+    
+    def _log(self, message: str = '') -> None:
+        if self.verbose:
+            print(message)
+    
+    def _warn(self, message: str) -> None:
+        self.warnings.append(message)
+        self._log(f"Warning: {message}")
+    
+    def _invalidate(self) -> None:
+        """Forget memoized results after the modules, files or edges changed."""
+        self._derived.clear()
+    
+    def _memoized(self, key, compute):
+        if key not in self._derived:
+            self._derived[key] = compute()
+        return self._derived[key]
+    
+    def scan(self, jobs: int = 1, cache: Optional[ScanCache] = None, api_surface: bool = False) -> 'DependencyGraphBuilder':
+        """Run scan_modules, find_swift_files and extract_imports; returns self."""
+        self.scan_modules()
+        self.find_swift_files()
+        self.extract_imports(jobs=jobs, cache=cache, api_surface=api_surface)
+        return self
+    
     def scan_modules(self) -> None:
         """Scan the SubModules directory to find all modules."""
         if not self.submodules_path.exists():
@@ -33,89 +363,274 @@ class DependencyGraphBuilder:
                 self.modules[module_name] = {
                     'path': item,
                     'swift_files': [],
+                    'source_bytes': 0,
+                    'file_imports': {},
+                    'file_declarations': {},
                     'imports': set()
                 }
-                
-        print(f"Found {len(self.modules)} modules:")
+        
+        self._invalidate()
+        self._log(f"Found {len(self.modules)} modules:")
         for module in sorted(self.modules.keys()):
-            print(f"  - {module}")
-        print()
+            self._log(f"  - {module}")
+        self._log()
     
     def find_swift_files(self) -> None:
         """Find all Swift files in each module."""
         for module_name, module_info in self.modules.items():
             swift_files = []
-            module_path = module_info['path']
+            source_bytes = 0
             
             # Recursively find all .swift files
-            for swift_file in module_path.rglob('*.swift'):
+            for swift_file, stat in self._walk_swift_files(module_info['path']):
                 swift_files.append(swift_file)
+                source_bytes += stat.st_size
             
             module_info['swift_files'] = swift_files
-            print(f"{module_name}: {len(swift_files)} Swift files")
+            module_info['source_bytes'] = source_bytes
+            self._log(f"{module_name}: {len(swift_files)} Swift files")
+        
+        self._invalidate()
     
-    def extract_imports(self) -> None:
-        """Extract import statements from all Swift files."""
-        import_pattern = re.compile(r'^\s*import\s+([A-Za-z_][A-Za-z0-9_]*)', re.MULTILINE)
+    def _walk_swift_files(self, module_path: Path):
+        return walk_files(str(module_path), ('.swift',), self.prune_dirs, self.follow_symlinks, with_stat=True)
+    
+    def extract_imports(self, jobs: int = 1, cache: Optional[ScanCache] = None, api_surface: bool = False) -> None:
+        """Extract import statements from all Swift files.
+
+        With jobs > 1 the files are read and parsed in a process pool; the
+        results are merged in the same order as the serial path, so the
+        resulting graph is identical either way. With a cache, only files whose
+        mtime, size and content hash changed are re-parsed. With api_surface,
+        each file is read in full once and its public declarations are
+        indexed as well, see api_surface().
+        """
+        self.api_surface_indexed = api_surface
+        file_imports = {}
+        file_declarations = {}
+        pending = []  # (path, stat, known_hash) for files that must be read
         
-        for module_name, module_info in self.modules.items():
-            all_imports = set()
-            
-            for swift_file in module_info['swift_files']:
+        for module_info in self.modules.values():
+            for path in module_info['swift_files']:
+                if cache is None:
+                    pending.append((path, None, None))
+                    continue
+                cache_key = os.path.abspath(path)
                 try:
-                    with open(swift_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        imports = import_pattern.findall(content)
-                        all_imports.update(imports)
-                except Exception as e:
-                    print(f"Warning: Could not read {swift_file}: {e}")
-            
-            # Filter imports to only include modules that exist in our SubModules
-            filtered_imports = all_imports & set(self.modules.keys())
-            module_info['imports'] = all_imports
-            
-            # Build dependency relationships
-            self.dependencies[module_name] = filtered_imports
-            for dependency in filtered_imports:
-                self.reverse_dependencies[dependency].add(module_name)
+                    stat = os.stat(path)
+                except OSError:
+                    pending.append((path, None, None))
+                    continue
+                entry = cache.lookup(cache_key, stat, api_surface)
+                if entry is not None:
+                    file_imports[path] = entry['imports']
+                    file_declarations[path] = entry.get('declarations', [])
+                else:
+                    pending.append((path, stat, cache.known_hash(cache_key, api_surface)))
+        
+        paths = [path for path, _, _ in pending]
+        known_hashes = [known_hash for _, _, known_hash in pending]
+        api_flags = [api_surface] * len(pending)
+        if jobs > 1 and len(pending) > 1:
+            chunksize = max(1, len(pending) // (jobs * 4))
+            with ProcessPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(scan_swift_file, paths, known_hashes, api_flags, chunksize=chunksize))
+        else:
+            results = [scan_swift_file(path, known_hash, api_surface) for path, known_hash in zip(paths, known_hashes)]
+        
+        for (path, stat, _), (_, content_hash, imports, error, bytes_read, declarations) in zip(pending, results):
+            self.files_read += 1
+            self.bytes_read += bytes_read
+            if error is not None:
+                self._warn(f"Could not read {path}: {error}")
+                file_imports[path] = imports
+                file_declarations[path] = []
+                continue
+            if cache is not None:
+                cache_key = os.path.abspath(path)
+                if imports is None:
+                    imports = cache.entries[cache_key]['imports']
+                    declarations = cache.entries[cache_key].get('declarations')
+                    cache.hits += 1
+                else:
+                    cache.misses += 1
+                if stat is not None:
+                    cache.store(cache_key, stat, content_hash, imports, declarations)
+            file_imports[path] = imports
+            file_declarations[path] = declarations or []
+        
+        if cache is not None:
+            cache.prune({os.path.abspath(path) for path in file_imports})
+        
+        for module_name, module_info in self.modules.items():
+            module_info['file_imports'] = {
+                path: file_imports[path]
+                for path in module_info['swift_files']
+            }
+            module_info['file_declarations'] = {
+                path: file_declarations[path]
+                for path in module_info['swift_files']
+            } if api_surface else {}
+            filtered_imports = self._update_module_edges(module_name)
             
             if filtered_imports:
-                print(f"{module_name} depends on: {', '.join(sorted(filtered_imports))}")
-    
-    def detect_cycles(self) -> List[List[str]]:
-        """Detect circular dependencies using DFS."""
-        def dfs(node: str, path: List[str], visited: Set[str], rec_stack: Set[str]) -> List[List[str]]:
-            if node in rec_stack:
-                # Found a cycle, extract it
-                cycle_start = path.index(node)
-                return [path[cycle_start:] + [node]]
-            
-            if node in visited:
-                return []
-            
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            cycles = []
-            for dependency in self.dependencies.get(node, []):
-                cycles.extend(dfs(dependency, path.copy(), visited, rec_stack.copy()))
-            
-            rec_stack.remove(node)
-            return cycles
+                self._log(f"{module_name} depends on: {', '.join(sorted(filtered_imports))}")
         
-        all_cycles = []
-        visited = set()
+        self._invalidate()
+    
+    def _update_module_edges(self, module_name: str) -> Set[str]:
+        """Recompute a module's imports and edges from its per-file imports."""
+        module_info = self.modules[module_name]
+        all_imports = set()
+        for sites in module_info['file_imports'].values():
+            all_imports.update(module for module, _, _ in sites)
         
-        for module in self.modules.keys():
-            if module not in visited:
-                cycles = dfs(module, [], visited, set())
-                all_cycles.extend(cycles)
+        # Filter imports to only include modules that exist in our SubModules
+        filtered_imports = all_imports & set(self.modules.keys())
+        module_info['imports'] = all_imports
+        
+        # Build dependency relationships
+        for dependency in self.dependencies.get(module_name, set()) - filtered_imports:
+            self.reverse_dependencies[dependency].discard(module_name)
+        self.dependencies[module_name] = filtered_imports
+        for dependency in filtered_imports:
+            self.reverse_dependencies[dependency].add(module_name)
+        
+        return filtered_imports
+    
+    def edge_evidence(self) -> Dict[Tuple[str, str], List[Tuple[str, int, Optional[str]]]]:
+        """Map each (module, dependency) edge to the (file, line, condition) import sites behind it.
+
+        File paths are relative to the SubModules directory; condition is the
+        #if condition around the import, or None.
+        """
+        return self._memoized('edge_evidence', self._edge_evidence)
+    
+    def _edge_evidence(self) -> Dict[Tuple[str, str], List[Tuple[str, int, Optional[str]]]]:
+        evidence = defaultdict(list)
+        for module_name, module_info in self.modules.items():
+            dependencies = self.dependencies.get(module_name, set())
+            for path, sites in module_info['file_imports'].items():
+                relative = os.path.relpath(path, self.submodules_path)
+                for dependency, line, condition in sites:
+                    if dependency in dependencies:
+                        evidence[(module_name, dependency)].append((relative, line, condition))
+        for sites in evidence.values():
+            sites.sort(key=lambda site: site[:2])
+        return dict(evidence)
+    
+    def rank_edges(self) -> List[Dict]:
+        """Rank edges by how few files and import sites back them, cheapest to cut first."""
+        ranked = []
+        for (module, dependency), sites in self.edge_evidence().items():
+            ranked.append({
+                'module': module,
+                'dependency': dependency,
+                'files': len({path for path, _, _ in sites}),
+                'sites': len(sites)
+            })
+        ranked.sort(key=lambda edge: (edge['files'], edge['sites'], edge['module'], edge['dependency']))
+        return ranked
+    
+    def print_edge_report(self, limit: int = 20) -> None:
+        """Print the edges backed by the fewest import sites."""
+        evidence = self.edge_evidence()
+        ranked = self.rank_edges()
+        
+        print("\n" + "="*60)
+        print("DEPENDENCY EDGE EVIDENCE")
+        print("="*60)
+        
+        single_file = [edge for edge in ranked if edge['files'] == 1]
+        print(f"\n{len(single_file)} of {len(ranked)} edges are backed by a single file.")
+        print(f"\nWEAKEST EDGES (cheapest to cut):")
+        for edge in ranked[:limit]:
+            print(f"  {edge['module']} -> {edge['dependency']}: "
+                  f"{edge['sites']} import(s) in {edge['files']} file(s)")
+            if edge['files'] == 1:
+                for path, line, condition in evidence[(edge['module'], edge['dependency'])]:
+                    suffix = f" (#if {condition})" if condition else ''
+                    print(f"      {path}:{line}{suffix}")
+    
+    def snapshot_files(self) -> Dict[str, Tuple[int, int]]:
+        """Return {path: (mtime_ns, size)} for every Swift file in the known modules."""
+        snapshot = {}
+        for module_info in self.modules.values():
+            for swift_file, stat in self._walk_swift_files(module_info['path']):
+                snapshot[swift_file] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+    
+    def update_files(self, changed_paths: List[str], removed_paths: List[str]) -> Tuple[Set[Tuple[str, str]], Set[Tuple[str, str]]]:
+        """Re-parse changed or added files and forget removed ones.
+
+        Only the modules owning those files are recomputed. Returns the
+        (added, removed) sets of (module, dependency) edges.
+        """
+        touched = set()
+        for path in removed_paths:
+            module_name = self.module_for_path(path)
+            if module_name is None:
+                continue
+            module_info = self.modules[module_name]
+            module_info['file_imports'].pop(path, None)
+            module_info['file_declarations'].pop(path, None)
+            module_info['swift_files'] = [f for f in module_info['swift_files'] if f != path]
+            touched.add(module_name)
+        
+        for path in changed_paths:
+            module_name = self.module_for_path(path)
+            if module_name is None:
+                continue
+            _, _, imports, error, _, declarations = scan_swift_file(path, api_surface=self.api_surface_indexed)
+            if error is not None:
+                self._warn(f"Could not read {path}: {error}")
+            module_info = self.modules[module_name]
+            if path not in module_info['file_imports']:
+                module_info['swift_files'].append(path)
+            module_info['file_imports'][path] = imports
+            if self.api_surface_indexed:
+                module_info['file_declarations'][path] = declarations
+            touched.add(module_name)
+        
+        if touched:
+            self._invalidate()
+        
+        added, removed = set(), set()
+        for module_name in touched:
+            module_info = self.modules[module_name]
+            before = set(self.dependencies.get(module_name, set()))
+            after = self._update_module_edges(module_name)
+            added.update((module_name, dependency) for dependency in after - before)
+            removed.update((module_name, dependency) for dependency in before - after)
+            source_bytes = 0
+            for swift_file in module_info['swift_files']:
+                try:
+                    source_bytes += os.stat(swift_file).st_size
+                except OSError:
+                    pass
+            module_info['source_bytes'] = source_bytes
         
-        return all_cycles
+        return added, removed
+    
+    def find_cyclic_components(self) -> List[List[str]]:
+        """Find every strongly connected component that contains a cycle, in O(V+E)."""
+        return self._memoized('cyclic_components', self._find_cyclic_components)
+    
+    def _find_cyclic_components(self) -> List[List[str]]:
+        return cyclic_components(sorted(self.modules.keys()), self.dependencies)
+    
+    def detect_cycles(self, max_cycles: Optional[int] = DEFAULT_MAX_CYCLES) -> List[List[str]]:
+        """Enumerate elementary cycles (Johnson's algorithm), at most max_cycles of them."""
+        return self._memoized(('cycles', max_cycles), lambda: self._detect_cycles(max_cycles))
+    
+    def _detect_cycles(self, max_cycles: Optional[int]) -> List[List[str]]:
+        return elementary_cycles(sorted(self.modules.keys()), self.dependencies, max_cycles)
     
     def topological_sort(self) -> List[str]:
         """Perform topological sort to get build order."""
+        return self._memoized('build_order', self._topological_sort)
+    
+    def _topological_sort(self) -> List[str]:
         in_degree = {module: 0 for module in self.modules.keys()}
         
         # Calculate in-degrees
@@ -139,8 +654,312 @@ class DependencyGraphBuilder:
         
         return result
     
+    def _relative_to_submodules(self, path: str) -> Optional[Path]:
+        """Return path relative to SubModules, or None if it lies outside.
+
+        The lexical path is tried first so a symlinked file stays with the
+        module it is linked into; resolved paths cover a symlinked root.
+        """
+        root = Path(os.path.abspath(self.submodules_path))
+        candidates = ((Path(os.path.abspath(path)), root),
+                      (Path(os.path.abspath(path)), root.resolve()),
+                      (Path(path).resolve(), root.resolve()))
+        for candidate, base in candidates:
+            try:
+                return candidate.relative_to(base)
+            except ValueError:
+                continue
+        return None
+    
+    def module_for_path(self, path: str) -> Optional[str]:
+        """Return the SubModule that owns path, or None if it lies outside SubModules."""
+        relative = self._relative_to_submodules(path)
+        if relative is None or not relative.parts or relative.parts[0] not in self.modules:
+            return None
+        return relative.parts[0]
+    
+    def affected_modules(self, changed_modules: Set[str]) -> Set[str]:
+        """Return changed_modules plus every module that transitively depends on them."""
+        affected = set(changed_modules)
+        queue = deque(changed_modules)
+        while queue:
+            module = queue.popleft()
+            for dependent in self.reverse_dependencies.get(module, ()):
+                if dependent not in affected:
+                    affected.add(dependent)
+                    queue.append(dependent)
+        return affected
+    
+    def build_reachability_index(self) -> ReachabilityIndex:
+        """Precompute transitive dependencies and dependents of every module as bitsets."""
+        return self._memoized('reachability_index', self._build_reachability_index)
+    
+    def _build_reachability_index(self) -> ReachabilityIndex:
+        return ReachabilityIndex.build(self.modules.keys(), self.dependencies)
+    
+    def find_redundant_edges(self) -> List[Tuple[str, str, str]]:
+        """Return (module, dependency, via) for every direct import already implied by another path."""
+        return self._memoized('redundant_edges', self._find_redundant_edges)
+    
+    def _find_redundant_edges(self) -> List[Tuple[str, str, str]]:
+        return redundant_edges(self.modules.keys(), self.dependencies, self.build_reachability_index())
+    
+    def transitive_reduction(self) -> Dict[str, Set[str]]:
+        """Return the dependency graph with every redundant edge removed."""
+        return transitive_reduction(self.modules.keys(), self.dependencies, self.build_reachability_index())
+    
+    def print_redundancy_report(self) -> None:
+        """Print direct imports that another dependency already pulls in."""
+        redundant = self.find_redundant_edges()
+        evidence = self.edge_evidence()
+        total_edges = sum(len(deps) for deps in self.dependencies.values())
+        
+        print("\n" + "="*60)
+        print("REDUNDANT IMPORTS")
+        print("="*60)
+        
+        if not redundant:
+            print("\nNo redundant module imports found ✅")
+            return
+        
+        print(f"\n{len(redundant)} of {total_edges} module edges are implied by another dependency:")
+        for module, dependency, via in redundant:
+            sites = evidence.get((module, dependency), [])
+            files = len({path for path, _, _ in sites})
+            print(f"  {module} -> {dependency} (already via {via}; {len(sites)} import(s) in {files} file(s))")
+    
+    def api_surface(self) -> Dict:
+        """Rank modules by public symbol count times transitive dependents.
+
+        A change to a module's public interface recompiles every module that
+        transitively depends on it, so the product estimates how many
+        module rebuilds the module's API can trigger. Needs a scan with
+        extract_imports(api_surface=True).
+        """
+        return self._memoized('api_surface', self._compute_api_surface)
+    
+    def _compute_api_surface(self) -> Dict:
+        if not self.api_surface_indexed:
+            raise ValueError("public declarations were not indexed, scan with api_surface=True")
+        index = self.build_reachability_index()
+        modules = {}
+        for module_name, module_info in self.modules.items():
+            files = []
+            kinds = defaultdict(int)
+            for path, declarations in module_info['file_declarations'].items():
+                if not declarations:
+                    continue
+                file_kinds = defaultdict(int)
+                for kind, _, _ in declarations:
+                    file_kinds[kind] += 1
+                    kinds[kind] += 1
+                files.append({
+                    'file': os.path.relpath(path, self.submodules_path),
+                    'public_symbols': len(declarations),
+                    'kinds': dict(sorted(file_kinds.items()))
+                })
+            files.sort(key=lambda entry: (-entry['public_symbols'], entry['file']))
+            public_symbols = sum(entry['public_symbols'] for entry in files)
+            dependents = len(index.affected_by(module_name))
+            modules[module_name] = {
+                'public_symbols': public_symbols,
+                'transitive_dependents': dependents,
+                'rebuild_fan_out': public_symbols * dependents,
+                'kinds': dict(sorted(kinds.items())),
+                'files': files
+            }
+        ranking = sorted(modules, key=lambda name: (-modules[name]['rebuild_fan_out'],
+                                                   -modules[name]['public_symbols'], name))
+        return {'ranking': ranking, 'modules': modules}
+    
+    def print_api_surface_report(self, top_files: int = 3) -> None:
+        """Print modules ranked by public API size times transitive dependents."""
+        surface = self.api_surface()
+        
+        print("\n" + "="*60)
+        print("PUBLIC API SURFACE")
+        print("="*60)
+        
+        print(f"\n  {'module':<24} {'public':>7} {'dependents':>11} {'fan-out':>9}")
+        for name in surface['ranking']:
+            info = surface['modules'][name]
+            if not info['public_symbols']:
+                continue
+            print(f"  {name:<24} {info['public_symbols']:>7} {info['transitive_dependents']:>11} "
+                  f"{info['rebuild_fan_out']:>9}")
+        
+        print(f"\nLARGEST API FILES IN THE TOP MODULES:")
+        for name in surface['ranking'][:5]:
+            info = surface['modules'][name]
+            if not info['rebuild_fan_out']:
+                continue
+            print(f"  {name}:")
+            for entry in info['files'][:top_files]:
+                print(f"    {entry['public_symbols']:>5}  {entry['file']}")
+    
+    def export_api_surface(self, output_file: str) -> None:
+        with open(output_file, 'w') as f:
+            json.dump(self.api_surface(), f, indent=2)
+        
+        self._log(f"API surface exported to: {output_file}")
+    
+    def module_weights(self, weight: str = 'bytes') -> Dict[str, int]:
+        """Return the build cost of each module: source bytes, Swift file count or measured milliseconds."""
+        if weight == 'files':
+            return {name: len(info['swift_files']) for name, info in self.modules.items()}
+        if weight == 'time':
+            if self.compile_timings is None:
+                raise ValueError("weight 'time' needs compile timings, pass --timing-log")
+            key = 'compile_ms' if self.compile_timings.has_driver_times() else 'function_body_ms'
+            return {name: round(self.compile_times.get(name, {}).get(key, 0)) for name in self.modules}
+        return {name: info['source_bytes'] for name, info in self.modules.items()}
+    
+    def _resolve_logged_path(self, path: str, by_basename: Dict[str, List[str]]) -> Optional[str]:
+        """Map a source path from a compiler log to a path relative to SubModules."""
+        if os.path.isabs(path) and self.module_for_path(path) is not None:
+            return str(self._relative_to_submodules(path))
+        # Logs from another checkout: trust the part after SubModules/.
+        marker = f"{os.sep}{self.submodules_path.resolve().name}{os.sep}"
+        if marker in path:
+            relative = path.rsplit(marker, 1)[1]
+            if relative.split(os.sep, 1)[0] in self.modules:
+                return relative
+        candidates = by_basename.get(os.path.basename(path), [])
+        return candidates[0] if len(candidates) == 1 else None
+    
+    def load_compile_timings(self, timings: CompileTimings) -> None:
+        """Attribute measured compile times from compiler logs to modules and files.
+
+        Files that cannot be matched to exactly one SubModules file are
+        counted in self.compile_times_unattributed.
+        """
+        by_basename = defaultdict(list)
+        for module_info in self.modules.values():
+            for path in module_info['swift_files']:
+                by_basename[os.path.basename(path)].append(os.path.relpath(path, self.submodules_path))
+        
+        compile_times = {}
+        unattributed = []
+        for logged_path in timings.source_paths():
+            relative = self._resolve_logged_path(logged_path, by_basename)
+            if relative is None:
+                unattributed.append(logged_path)
+                continue
+            module_name = relative.split(os.sep, 1)[0]
+            module_times = compile_times.setdefault(module_name, {
+                'compile_ms': 0.0,
+                'function_body_ms': 0.0,
+                'files': {},
+                'slowest_function_bodies': []
+            })
+            file_times = module_times['files'].setdefault(relative, {'compile_ms': 0.0, 'function_body_ms': 0.0})
+            file_times['compile_ms'] += timings.compile_seconds.get(logged_path, 0.0) * 1000
+            file_times['function_body_ms'] += timings.function_body_ms.get(logged_path, 0.0)
+            module_times['compile_ms'] += timings.compile_seconds.get(logged_path, 0.0) * 1000
+            module_times['function_body_ms'] += timings.function_body_ms.get(logged_path, 0.0)
+            module_times['slowest_function_bodies'].extend(
+                {'ms': ms, 'file': relative, 'line': line, 'column': column, 'name': name}
+                for ms, line, column, name in timings.slowest_bodies(logged_path)
+            )
+        
+        for module_times in compile_times.values():
+            module_times['slowest_function_bodies'].sort(key=lambda body: -body['ms'])
+            del module_times['slowest_function_bodies'][timings.slowest_per_file:]
+        
+        self.compile_timings = timings
+        self.compile_times = compile_times
+        self.compile_times_unattributed = unattributed
+        self._invalidate()
+    
+    def print_compile_times(self, slowest: int = 5) -> None:
+        """Print measured compile time per module and its slowest function bodies."""
+        timings = self.compile_timings
+        print("\n" + "="*60)
+        print("MEASURED COMPILE TIMES")
+        print("="*60)
+        
+        summary = timings.summary()
+        print(f"\nRead {summary['lines_read']:,} log lines ({summary['bytes_read'] / 1e6:.1f} MB), "
+              f"timings for {summary['files']} source files, "
+              f"{len(self.compile_times_unattributed)} not matched to a SubModule")
+        
+        print(f"\n  {'module':<24} {'compile':>10} {'func bodies':>12} {'files':>6}")
+        ranked = sorted(self.compile_times.items(),
+                        key=lambda item: (-item[1]['compile_ms'], -item[1]['function_body_ms'], item[0]))
+        for module, times in ranked:
+            print(f"  {module:<24} {times['compile_ms'] / 1000:>9.2f}s {times['function_body_ms'] / 1000:>11.2f}s "
+                  f"{len(times['files']):>6}")
+        
+        if slowest:
+            print(f"\nSLOWEST FUNCTION BODIES PER MODULE:")
+            for module, times in ranked:
+                bodies = times['slowest_function_bodies'][:slowest]
+                if not bodies:
+                    continue
+                print(f"  {module}:")
+                for body in bodies:
+                    print(f"    {body['ms']:>9.1f}ms  {body['file']}:{body['line']}:{body['column']}  {body['name']}")
+        
+        if summary['task_summary']:
+            print(f"\nXCODEBUILD TIMING SUMMARY:")
+            for task, totals in summary['task_summary'].items():
+                print(f"  {task}: {totals['tasks']} tasks, {totals['seconds']:.2f}s")
+    
+    def build_schedule(self, cores: int, weight: str = 'bytes') -> Dict:
+        """Group modules into parallel build waves and estimate the build's critical path."""
+        return self._memoized(('schedule', cores, weight), lambda: self._build_schedule(cores, weight))
+    
+    def _build_schedule(self, cores: int, weight: str) -> Dict:
+        modules = sorted(self.modules.keys())
+        weights = self.module_weights(weight)
+        waves = build_waves(modules, self.dependencies)
+        path, path_weight = critical_path(modules, self.dependencies, weights)
+        total_weight = sum(weights.values())
+        makespan = estimate_makespan(modules, self.dependencies, weights, cores)
+        
+        return {
+            'weight': weight,
+            'cores': cores,
+            'waves': waves,
+            'max_parallel_width': max((len(wave) for wave in waves), default=0),
+            'critical_path': path,
+            'critical_path_weight': path_weight,
+            'total_weight': total_weight,
+            'estimated_wall_clock': makespan,
+            'estimated_speedup': total_weight / makespan if makespan else 1.0
+        }
+    
+    def print_schedule(self, cores: int, weight: str = 'bytes') -> None:
+        """Print build waves, the critical path and the estimated parallel build time."""
+        schedule = self.build_schedule(cores, weight)
+        weights = self.module_weights(weight)
+        unit = {'files': 'files', 'time': 'ms'}.get(weight, 'bytes')
+        
+        print("\n" + "="*60)
+        print("BUILD SCHEDULE")
+        print("="*60)
+        
+        print(f"\nBUILD WAVES (modules in a wave can compile in parallel):")
+        for i, wave in enumerate(schedule['waves']):
+            wave_weight = sum(weights[module] for module in wave)
+            print(f"  Wave {i} ({len(wave)} modules, {wave_weight:,} {unit}): {', '.join(wave)}")
+        
+        print(f"\nCRITICAL PATH ({schedule['critical_path_weight']:,} {unit}):")
+        print(f"  {' -> '.join(schedule['critical_path'])}")
+        
+        print(f"\nPARALLELISM:")
+        print(f"  Build depth: {len(schedule['waves'])} waves")
+        print(f"  Max parallel width: {schedule['max_parallel_width']} modules")
+        print(f"  Total work: {schedule['total_weight']:,} {unit}")
+        print(f"  Estimated wall clock on {cores} cores: {schedule['estimated_wall_clock']:,} {unit} "
+              f"({schedule['estimated_speedup']:.2f}x speedup)")
+        print(f"  Lower bound (critical path): {schedule['critical_path_weight']:,} {unit}")
+    
     def _categorize_modules(self) -> Dict[str, List[str]]:
         """Categorize modules into logical groups for visualization."""
+        return self._memoized('categories', self._compute_categories)
+    
+    def _compute_categories(self) -> Dict[str, List[str]]:
         categories = {
             'main_app': [],
             'core_foundation': [],
@@ -170,6 +989,9 @@ class DependencyGraphBuilder:
     
     def generate_stats(self) -> Dict:
         """Generate dependency statistics."""
+        return self._memoized('stats', self._generate_stats)
+    
+    def _generate_stats(self) -> Dict:
         stats = {
             'total_modules': len(self.modules),
             'total_dependencies': sum(len(deps) for deps in self.dependencies.values()),
@@ -191,104 +1013,215 @@ class DependencyGraphBuilder:
         
         return stats
     
-    def export_to_dot(self, output_file: str) -> None:
-        """Export dependency graph to DOT format for visualization with clustering."""
+    def neighbourhood(self, focus: str, depth: int) -> Set[str]:
+        """Return focus plus every module within depth edges of it in either direction."""
+        if focus not in self.modules:
+            raise ValueError(f"Unknown module: {focus}")
+        selected = {focus}
+        frontier = [focus]
+        for _ in range(depth):
+            next_frontier = []
+            for module in frontier:
+                for neighbour in self.dependencies.get(module, set()) | self.reverse_dependencies.get(module, set()):
+                    if neighbour not in selected:
+                        selected.add(neighbour)
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+        return selected
+    
+    def _dot_header(self) -> List[str]:
+        return [
+            "digraph DependencyGraph {",
+            "  rankdir=TB;",
+            "  node [shape=box, fontname=\"Helvetica\", fontsize=10];",
+            "  edge [fontname=\"Helvetica\", fontsize=8];",
+            "  compound=true;",
+            "  newrank=true;",
+            "  splines=true;",
+            "  overlap=false;",
+            "",
+        ]
+    
+    def _write_dot(self, output_file: str, lines: List[str]) -> None:
+        with open(output_file, 'w') as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+        
+        self._log(f"DOT file exported to: {output_file}")
+        self._log("You can visualize it using:")
+        self._log(f"  • PNG: dot -Tpng {output_file} -o dependency_graph.png")
+        self._log(f"  • SVG: dot -Tsvg {output_file} -o dependency_graph.svg")
+        self._log(f"  • PDF: dot -Tpdf {output_file} -o dependency_graph.pdf")
+    
+    def export_to_dot(self, output_file: str, dependencies: Optional[Dict[str, Set[str]]] = None,
+                      modules: Optional[Set[str]] = None) -> None:
+        """Export dependency graph to DOT format for visualization with clustering.
+
+        Pass dependencies to export a different edge set over the same
+        modules, e.g. the transitive reduction, and modules to export only
+        part of the graph, e.g. a neighbourhood.
+        """
         categories = self._categorize_modules()
+        if dependencies is None:
+            dependencies = self.dependencies
         
-        # Define colors and styles for each category
-        category_styles = {
-            'main_app': {
-                'fillcolor': '#ff6b6b',
-                'style': 'filled,bold',
-                'label': 'Main Application',
-                'color': '#d63031'
-            },
-            'core_foundation': {
-                'fillcolor': '#4ecdc4',
-                'style': 'filled,bold',
-                'label': 'Core Foundation',
-                'color': '#00b894'
-            },
-            'ui_features': {
-                'fillcolor': '#ffe66d',
-                'style': 'filled',
-                'label': 'UI Features',
-                'color': '#fdcb6e'
-            },
-            'infrastructure': {
-                'fillcolor': '#a8e6cf',
-                'style': 'filled',
-                'label': 'Infrastructure',
-                'color': '#00b894'
-            }
-        }
+        lines = self._dot_header()
         
-        with open(output_file, 'w') as f:
-            f.write("digraph DependencyGraph {\n")
-            f.write("  rankdir=TB;\n")
-            f.write("  node [shape=box, fontname=\"Helvetica\", fontsize=10];\n")
-            f.write("  edge [fontname=\"Helvetica\", fontsize=8];\n")
-            f.write("  compound=true;\n")
-            f.write("  newrank=true;\n")
-            f.write("  splines=true;\n")
-            f.write("  overlap=false;\n\n")
+        # Create subgraphs for each category
+        cluster_id = 0
+        for category_name, category_modules in categories.items():
+            if modules is not None:
+                category_modules = [module for module in category_modules if module in modules]
+            if not category_modules:  # Skip empty categories
+                continue
             
-            # Create subgraphs for each category
-            cluster_id = 0
-            for category_name, modules in categories.items():
-                if not modules:  # Skip empty categories
-                    continue
-                    
-                style = category_styles[category_name]
-                f.write(f'  subgraph cluster_{cluster_id} {{\n')
-                f.write(f'    label="{style["label"]}";\n')
-                f.write(f'    style="filled,rounded";\n')
-                f.write(f'    fillcolor="{style["color"]}30";\n')  # Add transparency
-                f.write(f'    color="{style["color"]}";\n')
-                f.write(f'    fontname="Helvetica-Bold";\n')
-                f.write(f'    fontsize=12;\n')
-                f.write(f'    penwidth=2;\n\n')
-                
-                # Add nodes for this category
-                for module in modules:
-                    f.write(f'    "{module}" [fillcolor="{style["fillcolor"]}", ')
-                    f.write(f'style="{style["style"]}", ')
-                    f.write(f'color="{style["color"]}"];\n')
-                
-                f.write("  }\n\n")
-                cluster_id += 1
+            style = CATEGORY_STYLES[category_name]
+            lines.append(f'  subgraph cluster_{cluster_id} {{')
+            lines.append(f'    label="{style["label"]}";')
+            lines.append(f'    style="filled,rounded";')
+            lines.append(f'    fillcolor="{style["color"]}30";')  # Add transparency
+            lines.append(f'    color="{style["color"]}";')
+            lines.append(f'    fontname="Helvetica-Bold";')
+            lines.append(f'    fontsize=12;')
+            lines.append(f'    penwidth=2;\n')
             
-            # Add edges
-            f.write("  // Dependencies\n")
-            for module, dependencies in self.dependencies.items():
-                for dependency in dependencies:
-                    # Add some styling to edges based on types
-                    edge_style = ""
-                    if module == dependency:  # Self-reference (circular)
-                        edge_style = ' [color=red, style=dashed, penwidth=2, label="circular!"]'
-                    elif dependency in ['WalletCore', 'WalletContext', 'UIComponents', 'UICharts', 'UIPasscode', 'Ledger']:
-                        edge_style = ' [color=gray, penwidth=1]'  # Dependencies to core modules
-                    elif dependency.startswith('UI'):
-                        edge_style = ' [color=blue, penwidth=1.5]'  # UI to UI dependencies
-                    
-                    f.write(f'  "{module}" -> "{dependency}"{edge_style};\n')
+            # Add nodes for this category
+            for module in category_modules:
+                lines.append(f'    "{module}" [fillcolor="{style["fillcolor"]}", '
+                             f'style="{style["style"]}", '
+                             f'color="{style["color"]}"];')
             
-            f.write("}\n")
+            lines.append("  }\n")
+            cluster_id += 1
+        
+        # Add edges
+        lines.append("  // Dependencies")
+        for module, module_dependencies in dependencies.items():
+            if modules is not None and module not in modules:
+                continue
+            for dependency in module_dependencies:
+                if modules is not None and dependency not in modules:
+                    continue
+                # Add some styling to edges based on types
+                edge_style = ""
+                if module == dependency:  # Self-reference (circular)
+                    edge_style = ' [color=red, style=dashed, penwidth=2, label="circular!"]'
+                elif dependency in ['WalletCore', 'WalletContext', 'UIComponents', 'UICharts', 'UIPasscode', 'Ledger']:
+                    edge_style = ' [color=gray, penwidth=1]'  # Dependencies to core modules
+                elif dependency.startswith('UI'):
+                    edge_style = ' [color=blue, penwidth=1.5]'  # UI to UI dependencies
+                
+                lines.append(f'  "{module}" -> "{dependency}"{edge_style};')
         
-        print(f"DOT file exported to: {output_file}")
-        print("You can visualize it using:")
-        print(f"  • PNG: dot -Tpng {output_file} -o dependency_graph.png")
-        print(f"  • SVG: dot -Tsvg {output_file} -o dependency_graph.svg")
-        print(f"  • PDF: dot -Tpdf {output_file} -o dependency_graph.pdf")
+        lines.append("}")
+        self._write_dot(output_file, lines)
+    
+    def export_condensed_dot(self, output_file: str, modules: Optional[Set[str]] = None) -> None:
+        """Export the graph with every strongly connected component collapsed into one node.
+
+        Collapsed cycles are drawn in red and labelled with their members;
+        edges carry the number of module edges they stand for.
+        """
+        selected = sorted(modules if modules is not None else self.modules.keys())
+        selected_set = set(selected)
+        adjacency = {module: self.dependencies.get(module, set()) & selected_set for module in selected}
+        components, component_of, _ = condensation(selected, adjacency)
+        
+        category_of = {}
+        for category_name, category_modules in self._categorize_modules().items():
+            for module in category_modules:
+                category_of[module] = category_name
+        
+        node_ids = []
+        lines = self._dot_header()
+        lines.append("  // Modules (cycles collapsed)")
+        for i, component in enumerate(components):
+            component = sorted(component)
+            if len(component) == 1:
+                node_ids.append(component[0])
+                style = CATEGORY_STYLES[category_of[component[0]]]
+                lines.append(f'  "{component[0]}" [fillcolor="{style["fillcolor"]}", '
+                             f'style="{style["style"]}", color="{style["color"]}"];')
+            else:
+                node_id = f"cycle_{i}"
+                node_ids.append(node_id)
+                label = f"cycle of {len(component)} modules\\n" + "\\n".join(component)
+                lines.append(f'  "{node_id}" [label="{label}", fillcolor="#ff7675", '
+                             f'style="filled,bold", color="#d63031"];')
+        
+        edge_counts = defaultdict(int)
+        for module in selected:
+            for dependency in adjacency[module]:
+                source, target = component_of[module], component_of[dependency]
+                if source != target:
+                    edge_counts[(source, target)] += 1
+        
+        lines.append("")
+        lines.append("  // Dependencies between components")
+        for (source, target), count in sorted(edge_counts.items()):
+            label = f' [label="{count}"]' if count > 1 else ''
+            lines.append(f'  "{node_ids[source]}" -> "{node_ids[target]}"{label};')
+        
+        lines.append("}")
+        self._write_dot(output_file, lines)
+    
+    def export_category_dot(self, output_file: str, modules: Optional[Set[str]] = None) -> None:
+        """Export only the category clusters with the number of module edges between them."""
+        category_of = {}
+        sizes = {}
+        for category_name, category_modules in self._categorize_modules().items():
+            if modules is not None:
+                category_modules = [module for module in category_modules if module in modules]
+            sizes[category_name] = len(category_modules)
+            for module in category_modules:
+                category_of[module] = category_name
+        
+        edge_counts = defaultdict(int)
+        for module, module_dependencies in self.dependencies.items():
+            if module not in category_of:
+                continue
+            for dependency in module_dependencies:
+                if dependency in category_of:
+                    edge_counts[(category_of[module], category_of[dependency])] += 1
+        
+        lines = self._dot_header()
+        lines.append("  // Categories")
+        for category_name, size in sizes.items():
+            if not size:
+                continue
+            style = CATEGORY_STYLES[category_name]
+            internal = edge_counts.get((category_name, category_name), 0)
+            label = f"{style['label']}\\n{size} modules, {internal} internal edges"
+            lines.append(f'  "{category_name}" [label="{label}", fillcolor="{style["fillcolor"]}", '
+                         f'style="{style["style"]}", color="{style["color"]}"];')
+        
+        lines.append("")
+        lines.append("  // Module edges between categories")
+        for (source, target), count in sorted(edge_counts.items()):
+            if source == target:
+                continue
+            penwidth = 1 + min(count, 40) / 8
+            lines.append(f'  "{source}" -> "{target}" [label="{count}", penwidth={penwidth:.1f}];')
+        
+        lines.append("}")
+        self._write_dot(output_file, lines)
     
     def export_to_json(self, output_file: str) -> None:
         """Export dependency data to JSON format."""
         categories = self._categorize_modules()
         
+        edge_evidence = defaultdict(dict)
+        for (module, dependency), sites in sorted(self.edge_evidence().items()):
+            edge_evidence[module][dependency] = [
+                {'file': path, 'line': line, 'condition': condition} if condition else {'file': path, 'line': line}
+                for path, line, condition in sites
+            ]
+        
         data = {
             'modules': {
                 name: {
                     'swift_files_count': len(info['swift_files']),
+                    'source_bytes': info['source_bytes'],
                     'all_imports': sorted(list(info['imports'])),
                     'module_dependencies': sorted(list(self.dependencies[name]))
                 }
@@ -300,15 +1233,35 @@ class DependencyGraphBuilder:
             'reverse_dependencies': {
                 module: sorted(list(deps)) for module, deps in self.reverse_dependencies.items()
             },
-            'module_categories': categories
+            'module_categories': categories,
+            'edge_evidence': edge_evidence,
+            'reachability_index': self.build_reachability_index().to_dict()
         }
+        if self.compile_timings is not None:
+            data['compile_times'] = self.compile_times
         
         with open(output_file, 'w') as f:
             json.dump(data, f, indent=2)
         
-        print(f"JSON data exported to: {output_file}")
+        self._log(f"JSON data exported to: {output_file}")
     
-    def print_report(self) -> None:
+    def export_to_binary(self, output_file: str) -> None:
+        """Export the graph, per-module metrics and closure bitsets in the compact binary format."""
+        waves = build_waves(sorted(self.modules), self.dependencies)
+        metrics = {
+            'swift_files': {name: len(info['swift_files']) for name, info in self.modules.items()},
+            'source_bytes': {name: info['source_bytes'] for name, info in self.modules.items()},
+            'fan_in': {name: len(self.reverse_dependencies.get(name, ())) for name in self.modules},
+            'fan_out': {name: len(self.dependencies.get(name, ())) for name in self.modules},
+            'build_wave': {module: i for i, wave in enumerate(waves) for module in wave}
+        }
+        if self.compile_timings is not None:
+            metrics['compile_ms'] = self.module_weights('time')
+        write_binary_graph(output_file, self.build_reachability_index(), self.dependencies, metrics)
+        
+        self._log(f"Binary graph exported to: {output_file}")
+    
+    def print_report(self, max_cycles: Optional[int] = DEFAULT_MAX_CYCLES) -> None:
         """Print a comprehensive dependency report."""
         print("\n" + "="*60)
         print("DEPENDENCY GRAPH ANALYSIS REPORT")
@@ -333,11 +1286,16 @@ class DependencyGraphBuilder:
                 print(f"  {module}: {count} dependents")
         
         # Check for cycles
-        cycles = self.detect_cycles()
-        if cycles:
+        components = self.find_cyclic_components()
+        if components:
             print(f"\nCIRCULAR DEPENDENCIES DETECTED:")
+            for i, component in enumerate(components, 1):
+                print(f"  Component {i} ({len(component)} modules): {', '.join(component)}")
+            cycles = self.detect_cycles(max_cycles)
             for i, cycle in enumerate(cycles, 1):
                 print(f"  Cycle {i}: {' -> '.join(cycle)}")
+            if max_cycles is not None and len(cycles) >= max_cycles:
+                print(f"  (stopped after {max_cycles} cycles, use --max-cycles to see more)")
         else:
             print(f"\nNo circular dependencies detected! ✅")
         
@@ -381,37 +1339,768 @@ class DependencyGraphBuilder:
                 print(f"  {module}: (no dependencies)")
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Build Swift module dependency graph')
+def build_graph(submodules_path: str, jobs: int = 1, cache_file: Optional[str] = None,
+                profiler: Optional[PhaseProfiler] = None, prune_dirs: Optional[Set[str]] = None,
+                follow_symlinks: bool = False, api_surface: bool = False) -> DependencyGraphBuilder:
+    """Run the scan -> find -> extract pipeline and return the populated builder."""
+    profiler = profiler or PhaseProfiler()
+    builder = DependencyGraphBuilder(submodules_path, verbose=True, prune_dirs=prune_dirs,
+                                     follow_symlinks=follow_symlinks)
+    
+    print("Scanning modules...")
+    with profiler.phase('scan_modules'):
+        builder.scan_modules()
+    
+    print("Finding Swift files...")
+    with profiler.phase('find_swift_files') as record:
+        builder.find_swift_files()
+        record['files'] = sum(len(info['swift_files']) for info in builder.modules.values())
+    
+    print("Extracting imports...")
+    with profiler.phase('extract_imports') as record:
+        cache = None
+        if cache_file:
+            cache = ScanCache(cache_file)
+            cache.load()
+        
+        builder.extract_imports(jobs=jobs, cache=cache, api_surface=api_surface)
+        
+        if cache is not None:
+            cache.save()
+        record['files'] = builder.files_read
+        record['bytes_read'] = builder.bytes_read
+    
+    if cache is not None:
+        print(f"Scan cache: {cache.hits} files reused, {cache.misses} re-parsed ({cache.cache_file})")
+    
+    return builder
+
+
+def export_outputs(builder: DependencyGraphBuilder, args: argparse.Namespace) -> None:
+    """Write every export requested on the command line."""
+    focus = builder.neighbourhood(args.focus, args.depth) if args.focus else None
+    if args.dot_mode == 'condensed':
+        builder.export_condensed_dot(args.output_dot, focus)
+    elif args.dot_mode == 'categories':
+        builder.export_category_dot(args.output_dot, focus)
+    else:
+        builder.export_to_dot(args.output_dot, modules=focus)
+    builder.export_to_json(args.output_json)
+    if not args.no_binary:
+        builder.export_to_binary(args.output_binary)
+    if args.api_surface:
+        builder.export_api_surface(args.api_surface)
+    if args.reduced_dot:
+        builder.export_to_dot(args.reduced_dot, builder.transitive_reduction())
+
+
+def watch(builder: DependencyGraphBuilder, args: argparse.Namespace) -> None:
+    """Poll SubModules and keep the graph, cycle report and exports up to date."""
+    print(f"\nWatching {builder.submodules_path} for changes (every {args.interval}s, Ctrl+C to stop)...")
+    snapshot = builder.snapshot_files()
+    module_names = set(builder.modules)
+    
+    while True:
+        time.sleep(args.interval)
+        
+        current_modules = {item.name for item in builder.submodules_path.iterdir() if item.is_dir()}
+        if current_modules != module_names:
+            print(f"\n[{time.strftime('%H:%M:%S')}] Module set changed, rescanning...")
+            timings = builder.compile_timings
+            builder = build_graph(str(builder.submodules_path), jobs=args.jobs, prune_dirs=builder.prune_dirs,
+                                  follow_symlinks=builder.follow_symlinks, api_surface=builder.api_surface_indexed)
+            if timings is not None:
+                builder.load_compile_timings(timings)
+            snapshot = builder.snapshot_files()
+            module_names = set(builder.modules)
+        else:
+            current = builder.snapshot_files()
+            changed = [path for path, signature in current.items() if snapshot.get(path) != signature]
+            deleted = [path for path in snapshot if path not in current]
+            snapshot = current
+            if not changed and not deleted:
+                continue
+            
+            added, removed = builder.update_files(changed, deleted)
+            print(f"\n[{time.strftime('%H:%M:%S')}] {len(changed)} changed, {len(deleted)} removed Swift files")
+            if not added and not removed:
+                print("  No dependency changes")
+                if args.api_surface and not args.no_exports:
+                    # Public declarations may still have changed
+                    builder.export_api_surface(args.api_surface)
+                continue
+            for module, dependency in sorted(added):
+                print(f"  + {module} -> {dependency}")
+            for module, dependency in sorted(removed):
+                print(f"  - {module} -> {dependency}")
+        
+        components = builder.find_cyclic_components()
+        if components:
+            print("  CIRCULAR DEPENDENCIES DETECTED:")
+            for i, component in enumerate(components, 1):
+                print(f"    Component {i}: {', '.join(component)}")
+        else:
+            print("  No circular dependencies ✅")
+        
+        if not args.no_exports:
+            export_outputs(builder, args)
+
+
+def reachability_index_from_data(data: Dict) -> ReachabilityIndex:
+    """Return the reachability index saved by export_to_json, or rebuild it from the graph."""
+    if 'reachability_index' in data:
+        return ReachabilityIndex.from_dict(data['reachability_index'])
+    return ReachabilityIndex.build(data['modules'].keys(), data['dependency_graph'])
+
+
+def query_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='build_dependency_graph.py query',
+        description='Answer reachability queries from an exported dependency_data.json without rescanning'
+    )
+    parser.add_argument('--data', default='dependency_data.json',
+                       help='JSON or binary graph file written by a previous run (default: dependency_data.json)')
+    parser.add_argument('--affected-by', metavar='MODULE',
+                       help='List modules that transitively depend on MODULE')
+    parser.add_argument('--depends-on', metavar='MODULE',
+                       help='List modules that MODULE transitively depends on')
+    parser.add_argument('--path', nargs=2, metavar=('FROM', 'TO'),
+                       help='Show the shortest dependency path from FROM to TO')
+    parser.add_argument('--why', nargs=2, metavar=('MODULE', 'DEPENDENCY'),
+                       help='Show the files and lines that make MODULE import DEPENDENCY')
+    parser.add_argument('--json', action='store_true',
+                       help='Print results as JSON')
+    
+    args = parser.parse_args(argv)
+    if not (args.affected_by or args.depends_on or args.path or args.why):
+        parser.error('one of --affected-by, --depends-on, --path or --why is required')
+    
+    try:
+        if is_binary_graph(args.data):
+            if args.why:
+                print(f"Error: --why needs the import sites from the JSON export, not {args.data}")
+                return 1
+            data = {}
+            index = BinaryGraph.open(args.data)
+        else:
+            with open(args.data, 'r') as f:
+                data = json.load(f)
+            index = reachability_index_from_data(data)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Could not load {args.data}: {e}")
+        return 1
+    
+    try:
+        requested = [args.affected_by, args.depends_on] + (args.path or []) + (args.why or [])
+        unknown = [module for module in requested if module and module not in index]
+        if unknown:
+            print(f"Error: Unknown module(s): {', '.join(unknown)}")
+            return 1
+        
+        result = {}
+        if args.affected_by:
+            result['affected_by'] = {'module': args.affected_by, 'modules': index.affected_by(args.affected_by)}
+        if args.depends_on:
+            result['depends_on'] = {'module': args.depends_on, 'modules': index.depends_on(args.depends_on)}
+        if args.path:
+            result['path'] = {'from': args.path[0], 'to': args.path[1], 'path': index.path(*args.path)}
+        if args.why:
+            module, dependency = args.why
+            sites = data.get('edge_evidence', {}).get(module, {}).get(dependency, [])
+            result['why'] = {'module': module, 'dependency': dependency, 'sites': sites}
+    finally:
+        # Release the memory map; results above are plain lists, not views into it.
+        if isinstance(index, BinaryGraph):
+            index.close()
+    
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    
+    if 'affected_by' in result:
+        modules = result['affected_by']['modules']
+        print(f"Modules affected by {args.affected_by} ({len(modules)}):")
+        for module in modules:
+            print(f"  - {module}")
+    if 'depends_on' in result:
+        modules = result['depends_on']['modules']
+        print(f"Modules {args.depends_on} depends on ({len(modules)}):")
+        for module in modules:
+            print(f"  - {module}")
+    if 'path' in result:
+        path = result['path']['path']
+        if path:
+            print(f"Path: {' -> '.join(path)}")
+        else:
+            print(f"{args.path[0]} does not depend on {args.path[1]}")
+    if 'why' in result:
+        module, dependency = args.why
+        sites = result['why']['sites']
+        if sites:
+            files = {site['file'] for site in sites}
+            print(f"{module} imports {dependency} at {len(sites)} site(s) in {len(files)} file(s):")
+            for site in sites:
+                condition = f" (#if {site['condition']})" if site.get('condition') else ''
+                print(f"  {site['file']}:{site['line']}{condition}")
+        else:
+            print(f"{module} does not import {dependency} directly")
+    return 0
+
+
+def affected_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='build_dependency_graph.py affected',
+        description='Map changed file paths to the SubModules that must be rebuilt and retested'
+    )
+    parser.add_argument('--submodules-path', default='../SubModules',
+                       help='Path to SubModules directory (default: ../SubModules)')
+    parser.add_argument('--changed-files', metavar='FILE',
+                       help='File with one changed path per line (default: read paths from stdin)')
+    parser.add_argument('--repo-root', default='.',
+                       help='Directory the changed paths are relative to (default: current directory)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                       help='Number of worker processes for scanning Swift files (default: CPU count)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_NAME,
+                       help=f'Scan cache file (default: {DEFAULT_CACHE_NAME})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-read every Swift file instead of using the scan cache')
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        if args.changed_files:
+            with open(args.changed_files, 'r') as f:
+                changed_paths = [line.strip() for line in f if line.strip()]
+        else:
+            changed_paths = [line.strip() for line in sys.stdin if line.strip()]
+        
+        # Keep stdout machine-readable: scan progress goes to stderr.
+        with redirect_stdout(sys.stderr):
+            builder = build_graph(args.submodules_path, jobs=args.jobs,
+                                  cache_file=None if args.no_cache else args.cache)
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    
+    files_by_module = defaultdict(list)
+    unmatched = []
+    for changed_path in changed_paths:
+        module = builder.module_for_path(os.path.join(args.repo_root, changed_path))
+        if module is None:
+            unmatched.append(changed_path)
+        else:
+            files_by_module[module].append(changed_path)
+    
+    changed_modules = set(files_by_module)
+    affected = builder.affected_modules(changed_modules)
+    
+    result = {
+        'changed_modules': sorted(changed_modules),
+        'affected_modules': sorted(affected),
+        'dependent_modules': sorted(affected - changed_modules),
+        'files_by_module': {module: files for module, files in sorted(files_by_module.items())},
+        'unmatched_paths': unmatched
+    }
+    print(json.dumps(result, indent=2))
+    return 0
+
+
+def _indexed_adjacency(data: Dict, ids: Dict[str, int]) -> List[Set[int]]:
+    """Return the dependency graph of an exported JSON as id-indexed adjacency sets."""
+    adjacency = [set() for _ in ids]
+    for module, dependencies in data['dependency_graph'].items():
+        adjacency[ids[module]] = {ids[dependency] for dependency in dependencies}
+    return adjacency
+
+
+def diff_dependency_data(old: Dict, new: Dict) -> Dict:
+    """Compare two dependency_data.json snapshots without rescanning the tree."""
+    names = sorted(set(old['modules']) | set(new['modules']))
+    ids = {name: i for i, name in enumerate(names)}
+    old_adjacency = _indexed_adjacency(old, ids)
+    new_adjacency = _indexed_adjacency(new, ids)
+    
+    added_edges = []
+    removed_edges = []
+    old_fan_in = [0] * len(names)
+    new_fan_in = [0] * len(names)
+    for i, (old_targets, new_targets) in enumerate(zip(old_adjacency, new_adjacency)):
+        added_edges.extend((names[i], names[j]) for j in new_targets - old_targets)
+        removed_edges.extend((names[i], names[j]) for j in old_targets - new_targets)
+        for j in old_targets:
+            old_fan_in[j] += 1
+        for j in new_targets:
+            new_fan_in[j] += 1
+    
+    fan_changes = []
+    for i, name in enumerate(names):
+        fan_in_delta = new_fan_in[i] - old_fan_in[i]
+        fan_out_delta = len(new_adjacency[i]) - len(old_adjacency[i])
+        if fan_in_delta or fan_out_delta:
+            fan_changes.append({
+                'module': name,
+                'fan_in': new_fan_in[i],
+                'fan_in_delta': fan_in_delta,
+                'fan_out': len(new_adjacency[i]),
+                'fan_out_delta': fan_out_delta
+            })
+    fan_changes.sort(key=lambda change: (-max(change['fan_in_delta'], change['fan_out_delta']), change['module']))
+    
+    old_cycles = {frozenset(component) for component in cyclic_components(old['modules'], old['dependency_graph'])}
+    new_cycles = {frozenset(component) for component in cyclic_components(new['modules'], new['dependency_graph'])}
+    old_depth = len(build_waves(old['modules'], old['dependency_graph']))
+    new_depth = len(build_waves(new['modules'], new['dependency_graph']))
+    
+    return {
+        'added_modules': sorted(set(new['modules']) - set(old['modules'])),
+        'removed_modules': sorted(set(old['modules']) - set(new['modules'])),
+        'added_edges': sorted(added_edges),
+        'removed_edges': sorted(removed_edges),
+        'new_cycles': sorted(sorted(component) for component in new_cycles - old_cycles),
+        'resolved_cycles': sorted(sorted(component) for component in old_cycles - new_cycles),
+        'wave_depth': {'old': old_depth, 'new': new_depth, 'delta': new_depth - old_depth},
+        'fan_changes': fan_changes
+    }
+
+
+def diff_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='build_dependency_graph.py diff',
+        description='Compare two exported dependency_data.json files, e.g. from the base branch and a PR'
+    )
+    parser.add_argument('old', help='Baseline dependency_data.json')
+    parser.add_argument('new', help='Changed dependency_data.json')
+    parser.add_argument('--max-added-edges', type=int, metavar='N',
+                       help='Fail if more than N module edges were added')
+    parser.add_argument('--max-new-cycles', type=int, metavar='N',
+                       help='Fail if more than N new dependency cycles appeared')
+    parser.add_argument('--max-depth-increase', type=int, metavar='N',
+                       help='Fail if the number of build waves grew by more than N')
+    parser.add_argument('--max-fan-in-increase', type=int, metavar='N',
+                       help='Fail if any module gained more than N dependents')
+    parser.add_argument('--max-fan-out-increase', type=int, metavar='N',
+                       help='Fail if any module gained more than N dependencies')
+    parser.add_argument('--json', action='store_true',
+                       help='Print the diff as JSON')
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        with open(args.old, 'r') as f:
+            old = json.load(f)
+        with open(args.new, 'r') as f:
+            new = json.load(f)
+        result = diff_dependency_data(old, new)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Error: Could not compare {args.old} and {args.new}: {e}")
+        return 1
+    
+    max_fan_in = max((change['fan_in_delta'] for change in result['fan_changes']), default=0)
+    max_fan_out = max((change['fan_out_delta'] for change in result['fan_changes']), default=0)
+    checks = [
+        ('added edges', len(result['added_edges']), args.max_added_edges),
+        ('new cycles', len(result['new_cycles']), args.max_new_cycles),
+        ('build wave increase', result['wave_depth']['delta'], args.max_depth_increase),
+        ('fan-in increase', max_fan_in, args.max_fan_in_increase),
+        ('fan-out increase', max_fan_out, args.max_fan_out_increase),
+    ]
+    result['violations'] = [
+        {'check': name, 'value': value, 'limit': limit}
+        for name, value, limit in checks
+        if limit is not None and value > limit
+    ]
+    
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 1 if result['violations'] else 0
+    
+    for label, key in (('Added modules', 'added_modules'), ('Removed modules', 'removed_modules')):
+        if result[key]:
+            print(f"{label} ({len(result[key])}): {', '.join(result[key])}")
+    for label, key in (('Added edges', 'added_edges'), ('Removed edges', 'removed_edges')):
+        print(f"{label} ({len(result[key])}):")
+        for module, dependency in result[key]:
+            print(f"  {module} -> {dependency}")
+    for label, key in (('New cycles', 'new_cycles'), ('Resolved cycles', 'resolved_cycles')):
+        if result[key]:
+            print(f"{label} ({len(result[key])}):")
+            for component in result[key]:
+                print(f"  {', '.join(component)}")
+    depth = result['wave_depth']
+    print(f"Build waves: {depth['old']} -> {depth['new']} ({depth['delta']:+d})")
+    if result['fan_changes']:
+        print("Fan-in / fan-out changes:")
+        for change in result['fan_changes']:
+            print(f"  {change['module']}: fan-in {change['fan_in']} ({change['fan_in_delta']:+d}), "
+                  f"fan-out {change['fan_out']} ({change['fan_out_delta']:+d})")
+    
+    for violation in result['violations']:
+        print(f"FAIL: {violation['check']} is {violation['value']}, limit is {violation['limit']}")
+    return 1 if result['violations'] else 0
+
+
+class GraphServer:
+    """Keeps a scanned graph in memory and answers JSON queries over a Unix socket.
+
+    Each connection sends one JSON object terminated by a newline, e.g.
+    {"query": "affected", "files": ["SubModules/WalletCore/Foo.swift"]},
+    and receives one JSON line back: {"ok": true, "result": ...} or
+    {"ok": false, "error": "..."}. SubModules is polled for changes every
+    interval seconds between requests; everything runs on one thread, so
+    queries never see a half-updated graph.
+    """
+    
+    def __init__(self, builder: DependencyGraphBuilder, socket_path: str, interval: float = 0.5,
+                 jobs: int = 1, repo_root: str = '.'):
+        self.builder = builder
+        self.socket_path = socket_path
+        self.interval = interval
+        self.jobs = jobs
+        self.repo_root = repo_root
+        self.snapshot = builder.snapshot_files()
+        self.module_names = set(builder.modules)
+        self.generation = 0  # bumped whenever the graph changes
+        self.running = False
+        self.handlers = {
+            'ping': self._ping,
+            'affected': self._affected,
+            'depends_on': self._depends_on,
+            'path': self._path,
+            'why': self._why,
+            'cycles': self._cycles,
+            'waves': self._waves,
+            'shutdown': self._shutdown,
+        }
+    
+    def refresh(self) -> None:
+        """Apply file changes since the last poll; rescan if the module set changed."""
+        builder = self.builder
+        current_modules = {item.name for item in builder.submodules_path.iterdir() if item.is_dir()}
+        if current_modules != self.module_names:
+            timings = builder.compile_timings
+            rescanned = DependencyGraphBuilder(str(builder.submodules_path), prune_dirs=builder.prune_dirs,
+                                               follow_symlinks=builder.follow_symlinks)
+            self.builder = builder = rescanned.scan(self.jobs, api_surface=builder.api_surface_indexed)
+            if timings is not None:
+                builder.load_compile_timings(timings)
+            self.snapshot = builder.snapshot_files()
+            self.module_names = set(builder.modules)
+            self.generation += 1
+            print(f"[{time.strftime('%H:%M:%S')}] Module set changed, rescanned {len(builder.modules)} modules")
+            return
+        
+        current = builder.snapshot_files()
+        changed = [path for path, signature in current.items() if self.snapshot.get(path) != signature]
+        deleted = [path for path in self.snapshot if path not in current]
+        self.snapshot = current
+        if changed or deleted:
+            added, removed = builder.update_files(changed, deleted)
+            self.generation += 1
+            print(f"[{time.strftime('%H:%M:%S')}] {len(changed)} changed, {len(deleted)} removed Swift files, "
+                  f"{len(added)} edges added, {len(removed)} removed")
+    
+    def handle(self, request: Dict) -> Dict:
+        query = request.get('query')
+        handler = self.handlers.get(query) if isinstance(query, str) else None
+        if handler is None:
+            return {'ok': False, 'error': f"Unknown query {request.get('query')!r}, "
+                                         f"expected one of: {', '.join(self.handlers)}"}
+        try:
+            return {'ok': True, 'generation': self.generation, 'result': handler(request)}
+        except (KeyError, TypeError, ValueError) as e:
+            return {'ok': False, 'error': f"Bad {request['query']} request: {e}"}
+    
+    def _check_modules(self, *modules: str) -> None:
+        unknown = [module for module in modules if module not in self.builder.modules]
+        if unknown:
+            raise ValueError(f"unknown module(s): {', '.join(unknown)}")
+    
+    def _ping(self, request: Dict) -> Dict:
+        return {
+            'modules': len(self.builder.modules),
+            'files': len(self.snapshot),
+            'dependencies': sum(len(deps) for deps in self.builder.dependencies.values())
+        }
+    
+    def _affected(self, request: Dict) -> Dict:
+        changed_modules = set(request.get('modules', []))
+        self._check_modules(*changed_modules)
+        unmatched = []
+        for changed_path in request.get('files', []):
+            module = self.builder.module_for_path(os.path.join(self.repo_root, changed_path))
+            if module is None:
+                unmatched.append(changed_path)
+            else:
+                changed_modules.add(module)
+        affected = self.builder.affected_modules(changed_modules)
+        return {
+            'changed_modules': sorted(changed_modules),
+            'affected_modules': sorted(affected),
+            'dependent_modules': sorted(affected - changed_modules),
+            'unmatched_paths': unmatched
+        }
+    
+    def _depends_on(self, request: Dict) -> List[str]:
+        self._check_modules(request['module'])
+        return self.builder.build_reachability_index().depends_on(request['module'])
+    
+    def _path(self, request: Dict) -> Optional[List[str]]:
+        self._check_modules(request['from'], request['to'])
+        return self.builder.build_reachability_index().path(request['from'], request['to'])
+    
+    def _why(self, request: Dict) -> List[Dict]:
+        self._check_modules(request['module'], request['dependency'])
+        sites = self.builder.edge_evidence().get((request['module'], request['dependency']), [])
+        return [{'file': path, 'line': line, 'condition': condition} for path, line, condition in sites]
+    
+    def _cycles(self, request: Dict) -> Dict:
+        max_cycles = request.get('max_cycles', DEFAULT_MAX_CYCLES)
+        return {
+            'components': self.builder.find_cyclic_components(),
+            'cycles': self.builder.detect_cycles(max_cycles or None)
+        }
+    
+    def _waves(self, request: Dict) -> Dict:
+        weight = request.get('weight', 'time' if self.builder.compile_timings is not None else 'bytes')
+        return self.builder.build_schedule(int(request.get('cores', os.cpu_count() or 1)), weight)
+    
+    def _shutdown(self, request: Dict) -> Dict:
+        self.running = False
+        return {}
+    
+    def _answer(self, connection: socket.socket) -> None:
+        connection.settimeout(1.0)
+        with connection, connection.makefile('rwb') as stream:
+            line = stream.readline()
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError('request must be a JSON object')
+                response = self.handle(request)
+            except ValueError as e:
+                response = {'ok': False, 'error': f"Invalid request: {e}"}
+            except Exception as e:
+                # One bad request must not take the server down
+                response = {'ok': False, 'error': f"Internal error: {type(e).__name__}: {e}"}
+            stream.write(json.dumps(response).encode('utf-8') + b'\n')
+    
+    def serve_forever(self) -> None:
+        if os.path.lexists(self.socket_path):
+            if not S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                raise RuntimeError(f"{self.socket_path} exists and is not a socket, refusing to replace it")
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise RuntimeError(f"A graph server is already listening on {self.socket_path}")
+            except OSError:
+                os.unlink(self.socket_path)  # left behind by a server that did not shut down cleanly
+            finally:
+                probe.close()
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(self.socket_path)
+            os.chmod(self.socket_path, 0o600)
+            listener.listen(16)
+            self.running = True
+            next_poll = time.monotonic() + self.interval
+            while self.running:
+                ready, _, _ = select.select([listener], [], [], max(0.0, next_poll - time.monotonic()))
+                if ready:
+                    connection, _ = listener.accept()
+                    try:
+                        self._answer(connection)
+                    except OSError as e:
+                        print(f"Warning: Could not answer request: {e}")
+                if time.monotonic() >= next_poll:
+                    self.refresh()
+                    next_poll = time.monotonic() + self.interval
+        finally:
+            listener.close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+
+def serve_main(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog='build_dependency_graph.py serve',
+        description='Keep the dependency graph warm and answer queries over a Unix socket (see graph_client.py)'
+    )
+    parser.add_argument('--submodules-path', default='../SubModules',
+                       help='Path to SubModules directory (default: ../SubModules)')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_NAME,
+                       help=f'Unix socket path to listen on (default: {DEFAULT_SOCKET_NAME})')
+    parser.add_argument('--repo-root', default='.',
+                       help="Directory the paths in 'affected' queries are relative to (default: current directory)")
+    parser.add_argument('--interval', type=float, default=0.5,
+                       help='Polling interval in seconds for file changes (default: 0.5)')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                       help='Number of worker processes for scanning Swift files (default: CPU count)')
+    parser.add_argument('--cache', default=DEFAULT_CACHE_NAME,
+                       help=f'Scan cache file (default: {DEFAULT_CACHE_NAME})')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-read every Swift file instead of using the scan cache')
+    
+    args = parser.parse_args(argv)
+    
+    try:
+        builder = build_graph(args.submodules_path, jobs=args.jobs,
+                              cache_file=None if args.no_cache else args.cache)
+        server = GraphServer(builder, args.socket, args.interval, args.jobs, args.repo_root)
+        print(f"Serving {len(builder.modules)} modules on {args.socket} (Ctrl+C to stop)")
+        sys.stdout.flush()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped serving.")
+    except Exception as e:
+        print(f"Error: {e}")
+        return 1
+    
+    return 0
+
+
+COMMANDS = {
+    'query': query_main,
+    'affected': affected_main,
+    'diff': diff_main,
+    'serve': serve_main,
+}
+
+
+def main(argv: Optional[List[str]] = None):
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+    
+    parser = argparse.ArgumentParser(
+        description='Build Swift module dependency graph',
+        epilog=f"Subcommands: {', '.join(COMMANDS)} (run '%(prog)s <subcommand> --help' for details)"
+    )
     parser.add_argument('--submodules-path', default='../SubModules', 
                        help='Path to SubModules directory (default: ../SubModules)')
     parser.add_argument('--output-dot', default='dependency_graph.dot',
                        help='Output DOT file for graph visualization')
     parser.add_argument('--output-json', default='dependency_data.json',
                        help='Output JSON file with dependency data')
+    parser.add_argument('--output-binary', default='dependency_data.bin',
+                       help='Output compact binary graph for fast queries (default: dependency_data.bin)')
+    parser.add_argument('--no-binary', action='store_true',
+                       help='Skip writing the compact binary graph')
     parser.add_argument('--no-exports', action='store_true',
                        help='Skip exporting files, only show report')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                       help='Number of worker processes for scanning Swift files (default: CPU count)')
+    parser.add_argument('--exclude-dir', action='append', default=[], metavar='NAME',
+                       help=f"Extra directory name to skip while finding Swift files, may be repeated "
+                            f"(always skipped: {', '.join(sorted(DEFAULT_PRUNE_DIRS))})")
+    parser.add_argument('--follow-symlinks', action='store_true',
+                       help='Descend into symlinked directories while finding Swift files')
+    parser.add_argument('--max-cycles', type=int, default=DEFAULT_MAX_CYCLES,
+                       help=f'Maximum number of elementary cycles to list, 0 for no limit (default: {DEFAULT_MAX_CYCLES})')
+    parser.add_argument('--schedule', action='store_true',
+                       help='Show parallel build waves, critical path and estimated build time')
+    parser.add_argument('--cores', type=int, default=os.cpu_count() or 1,
+                       help='Number of cores for the build time estimate (default: CPU count)')
+    parser.add_argument('--weight', choices=['bytes', 'files', 'time'],
+                       help='Module cost for scheduling: total source bytes, Swift file count or measured '
+                            'compile time from --timing-log (default: time with --timing-log, else bytes)')
+    parser.add_argument('--timing-log', action='append', default=[], metavar='FILE',
+                       help='Swift compiler timing log (-driver-time-compilation, -debug-time-function-bodies '
+                            'or xcodebuild -showBuildTimingSummary output), may be repeated')
+    parser.add_argument('--slowest', type=int, default=5,
+                       help='Slowest function bodies to list per module with --timing-log (default: 5)')
+    parser.add_argument('--edge-report', action='store_true',
+                       help='Rank dependency edges by how many import sites back them')
+    parser.add_argument('--redundant-imports', action='store_true',
+                       help='List module imports already implied by another dependency path')
+    parser.add_argument('--api-surface', nargs='?', const='api_surface.json', metavar='FILE',
+                       help='Index public/open declarations (reads every file in full) and rank modules by '
+                            'public symbols x transitive dependents; writes JSON (default: api_surface.json)')
+    parser.add_argument('--dot-mode', choices=['full', 'condensed', 'categories'], default='full',
+                       help='DOT export: every module, cycles collapsed into single nodes, '
+                            'or category clusters only (default: full)')
+    parser.add_argument('--focus', metavar='MODULE',
+                       help='Limit the DOT export to the neighbourhood of MODULE')
+    parser.add_argument('--depth', type=int, default=1,
+                       help='Neighbourhood radius for --focus, in dependency edges (default: 1)')
+    parser.add_argument('--reduced-dot', metavar='FILE',
+                       help='Also export the transitive reduction of the graph to this DOT file')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and update the graph and exports when Swift files change')
+    parser.add_argument('--interval', type=float, default=0.5,
+                       help='Polling interval in seconds for --watch (default: 0.5)')
+    parser.add_argument('--profile', nargs='?', const='dependency_profile.json', metavar='FILE',
+                       help='Record per-phase timing, I/O and memory and write it as JSON (default: dependency_profile.json)')
+    parser.add_argument('--pstats', metavar='FILE',
+                       help='Run the analysis under cProfile and write the stats to FILE (e.g. analysis.pstats)')
+    parser.add_argument('--cache',
+                       help=f'Scan cache file (default: {DEFAULT_CACHE_NAME} next to the JSON output)')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Re-read every Swift file instead of using the scan cache')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    
+    profiler = PhaseProfiler()
+    python_profiler = cProfile.Profile() if args.pstats else None
     
     try:
-        builder = DependencyGraphBuilder(args.submodules_path)
-        
-        print("Scanning modules...")
-        builder.scan_modules()
+        if python_profiler is not None:
+            python_profiler.enable()
         
-        print("Finding Swift files...")
-        builder.find_swift_files()
+        cache_file = None
+        if not args.no_cache:
+            cache_file = args.cache or os.path.join(os.path.dirname(args.output_json), DEFAULT_CACHE_NAME)
+        builder = build_graph(args.submodules_path, jobs=args.jobs, cache_file=cache_file, profiler=profiler,
+                              prune_dirs=DEFAULT_PRUNE_DIRS | set(args.exclude_dir),
+                              follow_symlinks=args.follow_symlinks, api_surface=bool(args.api_surface))
         
-        print("Extracting imports...")
-        builder.extract_imports()
+        if args.timing_log:
+            with profiler.phase('timing_logs') as record:
+                timings = CompileTimings()
+                for log_file in args.timing_log:
+                    print(f"Reading compiler timings from {log_file}...")
+                    timings.parse_file(log_file)
+                builder.load_compile_timings(timings)
+                record['files'] = len(args.timing_log)
+                record['bytes_read'] = timings.bytes_read
+        weight = args.weight or ('time' if args.timing_log else 'bytes')
         
-        builder.print_report()
+        with profiler.phase('report'):
+            builder.print_report(max_cycles=args.max_cycles or None)
+            
+            if args.timing_log:
+                builder.print_compile_times(args.slowest)
+            
+            if args.schedule:
+                builder.print_schedule(args.cores, weight)
+            
+            if args.edge_report:
+                builder.print_edge_report()
+            
+            if args.redundant_imports:
+                builder.print_redundancy_report()
+            
+            if args.api_surface:
+                builder.print_api_surface_report()
         
         if not args.no_exports:
-            builder.export_to_dot(args.output_dot)
-            builder.export_to_json(args.output_json)
+            with profiler.phase('export'):
+                export_outputs(builder, args)
+        
+        if python_profiler is not None:
+            python_profiler.disable()
+            python_profiler.dump_stats(args.pstats)
+            print(f"cProfile stats written to: {args.pstats} (view with: python3 -m pstats {args.pstats})")
+        
+        if args.profile:
+            profiler.print_table()
+            profiler.export_to_json(args.profile)
+        
+        if args.watch:
+            watch(builder, args)
         
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
     except Exception as e:
         print(f"Error: {e}")
         return 1
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Swift compiler timing log parser.
+
+Reads, line by line, logs produced by:
+  * -Xfrontend -debug-time-function-bodies:
+        12.34ms	/path/Module/File.swift:42:10	instance method foo(bar:)
+  * -driver-time-compilation, rows of the "Driver Compilation Time" table:
+        1.2 ( 10.0%)  0.1 ( 10.0%)  1.3 ( 10.0%)  1.4 ( 10.8%)  {compile: File.o <= File.swift}
+  * xcodebuild -showBuildTimingSummary:
+        SwiftCompile (120 tasks) | 98.765 seconds
+
+Any mix of these may appear in one log, e.g. a full xcodebuild log with the
+flags passed through OTHER_SWIFT_FLAGS. Only per-file totals and a bounded
+list of the slowest function bodies per file are kept, so memory does not
+grow with the size of the log.
+"""
+
+import heapq
+import re
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+FUNCTION_BODY = re.compile(r'^\s*(\d+(?:\.\d+)?)ms\s+(.+?\.swift):(\d+):(\d+)\s+(.*?)\s*$')
+DRIVER_TIME = re.compile(r'(\d+(?:\.\d+)?) \(\s*\d+(?:\.\d+)?%\)')
+DRIVER_JOB = re.compile(r'\{compile: .*? <= (.*)\}\s*$')
+# Sources are separated by spaces, but a path may contain spaces too
+DRIVER_SOURCE = re.compile(r'(.+?\.swift)(?=\s|$)')
+TIMING_SUMMARY = re.compile(r'^(\S.*?) \((\d+) tasks?\) \| (\d+(?:\.\d+)?) seconds\s*$')
+
+
+class CompileTimings:
+    """Measured compile times per source file, as named in the logs."""
+
+    def __init__(self, slowest_per_file: int = 10):
+        self.slowest_per_file = slowest_per_file
+        self.function_body_ms = defaultdict(float)  # source path -> summed function body time
+        self.compile_seconds = defaultdict(float)  # source path -> driver wall time of its compile jobs
+        self.slowest = defaultdict(list)  # source path -> min-heap of (ms, line, column, name)
+        self.task_summary = {}  # xcodebuild task type -> (tasks, seconds)
+        self.lines_read = 0
+        self.bytes_read = 0
+
+    def parse_file(self, log_file: str) -> None:
+        """Stream one log file into the totals."""
+        # Read bytes so bytes_read is the on-disk size, whatever the encoding and line endings.
+        with open(log_file, 'rb') as f:
+            for line in f:
+                self.lines_read += 1
+                self.bytes_read += len(line)
+                self.parse_line(line.decode('utf-8', 'replace'))
+
+    def parse_line(self, line: str) -> None:
+        if 'ms' in line and '.swift:' in line:
+            match = FUNCTION_BODY.match(line)
+            if match:
+                ms, path, line_number, column, name = match.groups()
+                self._add_function_body(path, float(ms), int(line_number), int(column), name)
+                return
+
+        if '{compile:' in line:
+            match = DRIVER_JOB.search(line)
+            times = DRIVER_TIME.findall(line)
+            if match and times:
+                sources = [source.strip() for source in DRIVER_SOURCE.findall(match.group(1))]
+                # A batch job compiles several files; split its wall time evenly.
+                for source in sources:
+                    self.compile_seconds[source] += float(times[-1]) / len(sources)
+                return
+
+        if ' task' in line and ' seconds' in line:
+            match = TIMING_SUMMARY.match(line)
+            if match:
+                task, tasks, seconds = match.groups()
+                previous_tasks, previous_seconds = self.task_summary.get(task, (0, 0.0))
+                self.task_summary[task] = (previous_tasks + int(tasks), previous_seconds + float(seconds))
+
+    def _add_function_body(self, path: str, ms: float, line: int, column: int, name: str) -> None:
+        self.function_body_ms[path] += ms
+        heap = self.slowest[path]
+        entry = (ms, line, column, name)
+        if len(heap) < self.slowest_per_file:
+            heapq.heappush(heap, entry)
+        elif entry > heap[0]:
+            heapq.heapreplace(heap, entry)
+
+    def source_paths(self) -> List[str]:
+        return sorted(set(self.function_body_ms) | set(self.compile_seconds))
+
+    def slowest_bodies(self, path: str) -> List[Tuple[float, int, int, str]]:
+        """Return the slowest function bodies seen in path, slowest first."""
+        return sorted(self.slowest.get(path, []), reverse=True)
+
+    def has_driver_times(self) -> bool:
+        return bool(self.compile_seconds)
+
+    def summary(self) -> Dict:
+        return {
+            'files': len(self.source_paths()),
+            'lines_read': self.lines_read,
+            'bytes_read': self.bytes_read,
+            'task_summary': {
+                task: {'tasks': tasks, 'seconds': seconds}
+                for task, (tasks, seconds) in sorted(self.task_summary.items())
+            }
+        }
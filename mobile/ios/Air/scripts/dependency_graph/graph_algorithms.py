@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+Graph algorithms for the Swift module dependency graph.
+
+Every function takes a list of nodes and an adjacency mapping
+(node -> iterable of successors) so it can be used on the live
+DependencyGraphBuilder state as well as on graphs loaded from JSON.
+All traversals are iterative, so deep graphs never hit the recursion limit.
+"""
+
+import heapq
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+def strongly_connected_components(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]]) -> List[List[str]]:
+    """Return the strongly connected components using Tarjan's algorithm in O(V+E).
+
+    Components are emitted in reverse topological order: a component is
+    listed before every component that depends on it.
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+
+        index[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(adjacency.get(root, ())))]
+
+        while work:
+            node, successors = work[-1]
+            descended = False
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(adjacency.get(successor, ()))))
+                    descended = True
+                    break
+                elif successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            if descended:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+
+    return components
+
+
+def cyclic_components(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]]) -> List[List[str]]:
+    """Return every component that contains a cycle, each sorted, largest first."""
+    result = []
+    for component in strongly_connected_components(nodes, adjacency):
+        if len(component) > 1 or component[0] in adjacency.get(component[0], ()):
+            result.append(sorted(component))
+    result.sort(key=lambda component: (-len(component), component))
+    return result
+
+
+def _unblock(node: str, blocked: Set[str], blocked_by: Dict[str, Set[str]]) -> None:
+    pending = {node}
+    while pending:
+        current = pending.pop()
+        if current in blocked:
+            blocked.remove(current)
+            pending.update(blocked_by[current])
+            blocked_by[current].clear()
+
+
+def iter_elementary_cycles(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]]) -> Iterator[List[str]]:
+    """Yield every elementary cycle using Johnson's algorithm.
+
+    Each cycle is yielded closed, e.g. ['A', 'B', 'A']. The search only runs
+    inside cyclic components, so acyclic parts of the graph cost nothing.
+    """
+    for component in cyclic_components(nodes, adjacency):
+        members = set(component)
+        subgraph = {node: sorted(m for m in adjacency.get(node, ()) if m in members) for node in component}
+
+        for node in component:
+            if node in subgraph[node]:
+                yield [node, node]
+                subgraph[node].remove(node)
+
+        pending = [component] if len(component) > 1 else []
+        while pending:
+            scc = pending.pop()
+            start = scc[0]
+            remaining = set(scc[1:])
+
+            path = [start]
+            blocked = {start}
+            closed = set()
+            blocked_by = defaultdict(set)
+            stack = [(start, list(reversed(subgraph[start])))]
+
+            while stack:
+                node, successors = stack[-1]
+                if successors:
+                    successor = successors.pop()
+                    if successor == start:
+                        yield path + [start]
+                        closed.update(path)
+                    elif successor not in blocked:
+                        path.append(successor)
+                        stack.append((successor, list(reversed(subgraph[successor]))))
+                        closed.discard(successor)
+                        blocked.add(successor)
+                        continue
+                if not successors:
+                    if node in closed:
+                        _unblock(node, blocked, blocked_by)
+                    else:
+                        for successor in subgraph[node]:
+                            blocked_by[successor].add(node)
+                    stack.pop()
+                    path.pop()
+
+            # Cycles through start are exhausted; search the rest without it.
+            for member in remaining:
+                subgraph[member] = [m for m in subgraph[member] if m in remaining]
+            for sub_component in cyclic_components(sorted(remaining), subgraph):
+                if len(sub_component) > 1:
+                    sub_members = set(sub_component)
+                    for member in sub_component:
+                        subgraph[member] = [m for m in subgraph[member] if m in sub_members]
+                    pending.append(sub_component)
+
+
+def elementary_cycles(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]],
+                      max_cycles: Optional[int] = None) -> List[List[str]]:
+    """Return elementary cycles, stopping after max_cycles if given."""
+    return list(islice(iter_elementary_cycles(nodes, adjacency), max_cycles))
+
+
+def condensation(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]]):
+    """Collapse each strongly connected component into a single node.
+
+    Returns (components, component_of, edges) where components is ordered so
+    that every component comes after the components it points to, and
+    edges[i] is the set of component indices that component i points to.
+    """
+    components = strongly_connected_components(nodes, adjacency)
+    component_of = {node: i for i, component in enumerate(components) for node in component}
+    edges = [set() for _ in components]
+    for node, i in component_of.items():
+        for successor in adjacency.get(node, ()):
+            j = component_of.get(successor)
+            if j is not None and j != i:
+                edges[i].add(j)
+    return components, component_of, edges
+
+
+def build_waves(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]]) -> List[List[str]]:
+    """Group nodes into waves that can be built in parallel.
+
+    Wave 0 has no dependencies; every other node sits one wave above its
+    deepest dependency. Modules in a cycle share a wave since they can only
+    be built together.
+    """
+    components, _, edges = condensation(nodes, adjacency)
+    levels = []
+    for i in range(len(components)):
+        levels.append(1 + max((levels[j] for j in edges[i]), default=-1))
+
+    waves = [[] for _ in range(max(levels, default=-1) + 1)]
+    for component, level in zip(components, levels):
+        waves[level].extend(component)
+    for wave in waves:
+        wave.sort()
+    return waves
+
+
+def critical_path(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]],
+                  weights: Dict[str, float]):
+    """Return (path, total_weight) for the heaviest dependency chain.
+
+    The path is listed in build order, starting from the module with no
+    dependencies. Members of a cycle are listed together.
+    """
+    components, _, edges = condensation(nodes, adjacency)
+    finish = []
+    via = []
+    for i, component in enumerate(components):
+        best = max(edges[i], key=lambda j: (finish[j], -j), default=None)
+        own = sum(weights.get(node, 0) for node in component)
+        finish.append(own + (finish[best] if best is not None else 0))
+        via.append(best)
+
+    if not components:
+        return [], 0
+    current = max(range(len(components)), key=lambda i: (finish[i], -i))
+    total = finish[current]
+    path = []
+    while current is not None:
+        path[:0] = sorted(components[current])
+        current = via[current]
+    return path, total
+
+
+def estimate_makespan(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]],
+                      weights: Dict[str, float], cores: int) -> float:
+    """Simulate a list-scheduled parallel build on the given number of cores.
+
+    Ready modules are started in order of their longest remaining chain of
+    dependents, which is what a build system with enough parallelism tends to
+    approximate. Returns the simulated wall-clock time in weight units.
+    """
+    components, _, edges = condensation(nodes, adjacency)
+    count = len(components)
+    own = [sum(weights.get(node, 0) for node in component) for component in components]
+    dependents = [[] for _ in range(count)]
+    for i in range(count):
+        for j in edges[i]:
+            dependents[j].append(i)
+
+    # Dependents always come later in the component order.
+    rank = [0] * count
+    for i in reversed(range(count)):
+        rank[i] = own[i] + max((rank[k] for k in dependents[i]), default=0)
+
+    remaining = [len(edges[i]) for i in range(count)]
+    ready = [(-rank[i], i) for i in range(count) if remaining[i] == 0]
+    heapq.heapify(ready)
+    running = []
+    time = 0
+    free = max(1, cores)
+
+    while ready or running:
+        while free and ready:
+            _, i = heapq.heappop(ready)
+            heapq.heappush(running, (time + own[i], i))
+            free -= 1
+        time, i = heapq.heappop(running)
+        free += 1
+        for k in dependents[i]:
+            remaining[k] -= 1
+            if remaining[k] == 0:
+                heapq.heappush(ready, (-rank[k], k))
+
+    return time
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the indices of the set bits in mask, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class ReachabilityIndex:
+    """Transitive closure of the module graph stored as one int bitmask per module.
+
+    Module ids are positions in the sorted module list. For module i,
+    dependencies[i] has a bit for every direct dependency, descendants[i]
+    for everything it transitively depends on and ancestors[i] for every
+    module that transitively depends on it.
+    """
+
+    def __init__(self, modules: List[str], dependencies: List[int], descendants: List[int], ancestors: List[int]):
+        self.modules = modules
+        self.ids = {module: i for i, module in enumerate(modules)}
+        self.dependencies = dependencies
+        self.descendants = descendants
+        self.ancestors = ancestors
+
+    @classmethod
+    def build(cls, nodes: Iterable[str], adjacency: Dict[str, Iterable[str]]) -> 'ReachabilityIndex':
+        modules = sorted(nodes)
+        ids = {module: i for i, module in enumerate(modules)}
+        dependencies = [0] * len(modules)
+        for module, i in ids.items():
+            for dependency in adjacency.get(module, ()):
+                j = ids.get(dependency)
+                if j is not None:
+                    dependencies[i] |= 1 << j
+
+        # Components come after everything they point to, so one pass suffices.
+        descendants = [0] * len(modules)
+        components, _, _ = condensation(modules, adjacency)
+        for component in components:
+            members = [ids[module] for module in component if module in ids]
+            reach = 0
+            for i in members:
+                reach |= dependencies[i]
+            for j in iter_bits(reach):
+                reach |= descendants[j]
+            for i in members:
+                descendants[i] = reach
+
+        # Walking the components backwards visits dependents first.
+        dependents = [[] for _ in modules]
+        for i, mask in enumerate(dependencies):
+            for j in iter_bits(mask):
+                dependents[j].append(i)
+        ancestors = [0] * len(modules)
+        for component in reversed(components):
+            members = [ids[module] for module in component if module in ids]
+            reach = 0
+            for i in members:
+                for k in dependents[i]:
+                    reach |= (1 << k) | ancestors[k]
+            for i in members:
+                ancestors[i] = reach
+
+        return cls(modules, dependencies, descendants, ancestors)
+
+    def to_dict(self) -> Dict:
+        return {
+            'modules': self.modules,
+            'dependencies': [format(mask, 'x') for mask in self.dependencies],
+            'descendants': [format(mask, 'x') for mask in self.descendants],
+            'ancestors': [format(mask, 'x') for mask in self.ancestors]
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ReachabilityIndex':
+        return cls(
+            list(data['modules']),
+            [int(mask, 16) for mask in data['dependencies']],
+            [int(mask, 16) for mask in data['descendants']],
+            [int(mask, 16) for mask in data['ancestors']]
+        )
+
+    def __contains__(self, module: str) -> bool:
+        return module in self.ids
+
+    def names(self, mask: int) -> List[str]:
+        return [self.modules[i] for i in iter_bits(mask)]
+
+    def affected_by(self, module: str) -> List[str]:
+        """Modules that must rebuild when module changes."""
+        return self.names(self.ancestors[self.ids[module]])
+
+    def depends_on(self, module: str) -> List[str]:
+        """Modules that module transitively depends on."""
+        return self.names(self.descendants[self.ids[module]])
+
+    def reaches(self, source: str, target: str) -> bool:
+        return bool(self.descendants[self.ids[source]] >> self.ids[target] & 1)
+
+    def path(self, source: str, target: str) -> Optional[List[str]]:
+        """Shortest dependency path from source to target, or None.
+
+        The breadth-first search only enters modules that can still reach
+        the target, so it never explores dead ends.
+        """
+        start, goal = self.ids[source], self.ids[target]
+        if not self.descendants[start] >> goal & 1:
+            return None
+        goal_bit = 1 << goal
+        previous = {start: None}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                for j in iter_bits(self.dependencies[i]):
+                    if j == goal:
+                        path = [self.modules[goal]]
+                        while i is not None:
+                            path.append(self.modules[i])
+                            i = previous[i]
+                        return path[::-1]
+                    if j in previous or not self.descendants[j] & goal_bit:
+                        continue
+                    previous[j] = i
+                    next_frontier.append(j)
+            frontier = next_frontier
+        return None
+
+
+def redundant_edges(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]],
+                    index: Optional[ReachabilityIndex] = None) -> List[Tuple[str, str, str]]:
+    """Return (source, target, via) for every edge already implied by another path.
+
+    An edge source -> target is redundant when another direct dependency
+    `via` of source, outside both endpoints' components, reaches target.
+    When source has several edges into one cycle, only the first is kept.
+    Edges inside a cycle are never reported. Removing all reported edges at
+    once keeps reachability intact, and on acyclic graphs what remains is
+    exactly the transitive reduction. Each check is a bitset test against
+    the precomputed closure.
+    """
+    nodes = list(nodes)
+    index = index or ReachabilityIndex.build(nodes, adjacency)
+    _, component_of, _ = condensation(index.modules, adjacency)
+
+    result = []
+    for source, u in index.ids.items():
+        own = component_of[source]
+        by_component = defaultdict(list)
+        for w in iter_bits(index.dependencies[u]):
+            component = component_of[index.modules[w]]
+            if component != own:
+                by_component[component].append(w)
+
+        for component, members in by_component.items():
+            target_bit = 1 << members[0]
+            via = next((w for other, witnesses in by_component.items() if other != component
+                        for w in witnesses if index.descendants[w] & target_bit), None)
+            if via is not None:
+                result.extend((source, index.modules[v], index.modules[via]) for v in members)
+            else:
+                result.extend((source, index.modules[v], index.modules[members[0]]) for v in members[1:])
+
+    result.sort()
+    return result
+
+
+def transitive_reduction(nodes: Iterable[str], adjacency: Dict[str, Iterable[str]],
+                         index: Optional[ReachabilityIndex] = None) -> Dict[str, Set[str]]:
+    """Return a copy of adjacency with every redundant edge removed."""
+    nodes = list(nodes)
+    reduced = {node: set(adjacency.get(node, ())) for node in nodes}
+    for source, target, _ in redundant_edges(nodes, adjacency, index):
+        reduced[source].discard(target)
+    return reduced
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""
+Compact binary dependency graph format.
+
+Written next to dependency_data.json so query tools and CI steps can open
+the graph without parsing JSON. All integers are little-endian and every
+section starts on an 8-byte boundary:
+
+    header      magic b'DGRAPHB1', then u32 fields: version, modules,
+                edges, metrics, bitset words per row
+    strings     u32 offsets[modules + metrics + 1], then UTF-8 bytes;
+                module names (sorted, id = position) followed by metric names
+    forward     CSR: u32 offsets[modules + 1], u32 targets[edges]
+    reverse     CSR: u32 offsets[modules + 1], u32 sources[edges]
+    metrics     u64[modules * metrics], row-major per module
+    descendants u64[modules * words] transitive dependencies, one bitset per module
+    ancestors   u64[modules * words] transitive dependents, one bitset per module
+
+BinaryGraph memory-maps the file and answers queries straight from these
+arrays; it never builds per-module Python dicts.
+"""
+
+import mmap
+import struct
+from typing import Dict, Iterator, List, Optional, Sequence
+
+from graph_algorithms import ReachabilityIndex
+
+MAGIC = b'DGRAPHB1'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8s5I')
+
+
+def _pad(buffer: bytearray) -> None:
+    buffer.extend(b'\0' * (-len(buffer) % 8))
+
+
+def _pack(buffer: bytearray, code: str, values: Sequence[int]) -> None:
+    buffer.extend(struct.pack(f'<{len(values)}{code}', *values))
+    _pad(buffer)
+
+
+def _bitset_words(mask: int, words: int) -> List[int]:
+    return [(mask >> (64 * word)) & 0xFFFFFFFFFFFFFFFF for word in range(words)]
+
+
+def write_binary_graph(output_file: str, index: ReachabilityIndex, dependencies: Dict[str, Sequence[str]],
+                       metrics: Dict[str, Dict[str, int]]) -> None:
+    """Write the graph, per-module metrics ({metric: {module: value}}) and closure bitsets."""
+    modules = index.modules
+    ids = index.ids
+    metric_names = sorted(metrics)
+    words = (len(modules) + 63) // 64
+
+    forward = [sorted(ids[dependency] for dependency in dependencies.get(module, ()) if dependency in ids)
+               for module in modules]
+    reverse = [[] for _ in modules]
+    for i, targets in enumerate(forward):
+        for j in targets:
+            reverse[j].append(i)
+    edges = sum(len(targets) for targets in forward)
+
+    buffer = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION, len(modules), edges, len(metric_names), words))
+    _pad(buffer)
+
+    encoded = [name.encode('utf-8') for name in list(modules) + metric_names]
+    offsets = [0]
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    _pack(buffer, 'I', offsets)
+    buffer.extend(b''.join(encoded))
+    _pad(buffer)
+
+    for adjacency in (forward, reverse):
+        offsets = [0]
+        for targets in adjacency:
+            offsets.append(offsets[-1] + len(targets))
+        _pack(buffer, 'I', offsets)
+        _pack(buffer, 'I', [j for targets in adjacency for j in targets])
+
+    _pack(buffer, 'Q', [metrics[name].get(module, 0) for module in modules for name in metric_names])
+    for masks in (index.descendants, index.ancestors):
+        _pack(buffer, 'Q', [word for mask in masks for word in _bitset_words(mask, words)])
+
+    with open(output_file, 'wb') as f:
+        f.write(buffer)
+
+
+def is_binary_graph(path: str) -> bool:
+    try:
+        with open(path, 'rb') as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class BinaryGraph:
+    """Read-only view of a binary graph file.
+
+        with BinaryGraph.open('dependency_data.bin') as graph:
+            graph.affected_by('WalletCore')
+    """
+
+    def __init__(self, buffer):
+        self._buffer = buffer
+        self._view = view = memoryview(buffer)
+        magic, version, modules, edges, metrics, words = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError('not a dependency graph file of a supported version')
+        self.module_count = modules
+        self.edge_count = edges
+        self.words = words
+        position = HEADER.size + (-HEADER.size % 8)
+
+        def section(code: str, count: int):
+            nonlocal position
+            size = struct.calcsize(code) * count
+            array = view[position:position + size].cast(code)
+            position += size + (-size % 8)
+            return array
+
+        self._string_offsets = section('I', modules + metrics + 1)
+        self._strings = view[position:position + self._string_offsets[-1]]
+        position += self._string_offsets[-1] + (-self._string_offsets[-1] % 8)
+        self._forward_offsets = section('I', modules + 1)
+        self._forward = section('I', edges)
+        self._reverse_offsets = section('I', modules + 1)
+        self._reverse = section('I', edges)
+        self._metrics = section('Q', modules * metrics)
+        self._descendants = section('Q', modules * words)
+        self._ancestors = section('Q', modules * words)
+        self.metric_names = [self._string(modules + i) for i in range(metrics)]
+
+    @classmethod
+    def open(cls, path: str) -> 'BinaryGraph':
+        with open(path, 'rb') as f:
+            return cls(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        for name in ('_string_offsets', '_strings', '_forward_offsets', '_forward', '_reverse_offsets',
+                     '_reverse', '_metrics', '_descendants', '_ancestors', '_view'):
+            getattr(self, name).release()
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+
+    def __enter__(self) -> 'BinaryGraph':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _string(self, i: int) -> str:
+        return bytes(self._strings[self._string_offsets[i]:self._string_offsets[i + 1]]).decode('utf-8')
+
+    def name(self, i: int) -> str:
+        return self._string(i)
+
+    def id(self, module: str) -> Optional[int]:
+        """Binary search the sorted module names."""
+        low, high = 0, self.module_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(middle) < module:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.module_count and self._string(low) == module:
+            return low
+        return None
+
+    def __contains__(self, module: str) -> bool:
+        return self.id(module) is not None
+
+    def modules(self) -> List[str]:
+        return [self._string(i) for i in range(self.module_count)]
+
+    def _row_bits(self, bitsets, i: int) -> Iterator[int]:
+        base = i * self.words
+        for word in range(self.words):
+            mask = bitsets[base + word]
+            while mask:
+                low = mask & -mask
+                yield 64 * word + low.bit_length() - 1
+                mask ^= low
+
+    def _has_bit(self, bitsets, i: int, j: int) -> bool:
+        return bool(bitsets[i * self.words + j // 64] >> (j % 64) & 1)
+
+    def dependencies(self, module: str) -> List[str]:
+        i = self.id(module)
+        return [self._string(j) for j in self._forward[self._forward_offsets[i]:self._forward_offsets[i + 1]]]
+
+    def dependents(self, module: str) -> List[str]:
+        i = self.id(module)
+        return [self._string(j) for j in self._reverse[self._reverse_offsets[i]:self._reverse_offsets[i + 1]]]
+
+    def affected_by(self, module: str) -> List[str]:
+        """Modules that must rebuild when module changes."""
+        return [self._string(j) for j in self._row_bits(self._ancestors, self.id(module))]
+
+    def depends_on(self, module: str) -> List[str]:
+        """Modules that module transitively depends on."""
+        return [self._string(j) for j in self._row_bits(self._descendants, self.id(module))]
+
+    def reaches(self, source: str, target: str) -> bool:
+        return self._has_bit(self._descendants, self.id(source), self.id(target))
+
+    def metric(self, module: str, metric: str) -> int:
+        return self._metrics[self.id(module) * len(self.metric_names) + self.metric_names.index(metric)]
+
+    def metrics(self, module: str) -> Dict[str, int]:
+        base = self.id(module) * len(self.metric_names)
+        return {name: self._metrics[base + k] for k, name in enumerate(self.metric_names)}
+
+    def path(self, source: str, target: str) -> Optional[List[str]]:
+        """Shortest dependency path from source to target, or None.
+
+        Same pruned breadth-first search as ReachabilityIndex.path.
+        """
+        start, goal = self.id(source), self.id(target)
+        if not self._has_bit(self._descendants, start, goal):
+            return None
+        previous = {start: None}
+        frontier = [start]
+        while frontier:
+            next_frontier = []
+            for i in frontier:
+                for j in self._forward[self._forward_offsets[i]:self._forward_offsets[i + 1]]:
+                    if j == goal:
+                        path = [self._string(goal)]
+                        while i is not None:
+                            path.append(self._string(i))
+                            i = previous[i]
+                        return path[::-1]
+                    if j in previous or not self._has_bit(self._descendants, j, goal):
+                        continue
+                    previous[j] = i
+                    next_frontier.append(j)
+            frontier = next_frontier
+        return None
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Thin client for `build_dependency_graph.py serve`.
+
+Sends one query to the resident graph server and prints the JSON result.
+Only imports the standard library modules it needs, so a call costs little
+more than interpreter startup.
+
+Usage:
+    python3 graph_client.py ping
+    python3 graph_client.py affected --files SubModules/WalletCore/Stores/NftStore.swift
+    python3 graph_client.py affected --modules WalletContext
+    python3 graph_client.py depends-on UIHome
+    python3 graph_client.py path AirAsFramework BigIntLib
+    python3 graph_client.py why UIHome WalletCore
+    python3 graph_client.py cycles
+    python3 graph_client.py waves --cores 8
+    python3 graph_client.py shutdown
+
+Exits with 1 if the server is not running or rejects the query.
+"""
+
+import argparse
+import json
+import socket
+import sys
+from typing import Dict
+
+DEFAULT_SOCKET_NAME = 'dependency_graph.sock'
+
+
+def send_query(socket_path: str, request: Dict, timeout: float = 30.0) -> Dict:
+    """Send one request and return the server's response object."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.settimeout(timeout)
+        connection.connect(socket_path)
+        connection.sendall(json.dumps(request).encode('utf-8') + b'\n')
+        with connection.makefile('rb') as stream:
+            reply = stream.readline()
+    if not reply:
+        raise ConnectionError('the server closed the connection without answering')
+    return json.loads(reply)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query a running dependency graph server')
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_NAME,
+                       help=f'Unix socket of the server (default: {DEFAULT_SOCKET_NAME})')
+    subparsers = parser.add_subparsers(dest='query', required=True)
+
+    subparsers.add_parser('ping', help='Show the size of the loaded graph')
+    affected = subparsers.add_parser('affected', help='Modules to rebuild for changed files or modules')
+    affected.add_argument('--files', nargs='*', default=[], help='Changed file paths')
+    affected.add_argument('--modules', nargs='*', default=[], help='Changed modules')
+    depends_on = subparsers.add_parser('depends-on', help='Modules MODULE transitively depends on')
+    depends_on.add_argument('module')
+    path = subparsers.add_parser('path', help='Shortest dependency path from FROM to TO')
+    path.add_argument('source', metavar='FROM')
+    path.add_argument('target', metavar='TO')
+    why = subparsers.add_parser('why', help='Import sites that make MODULE depend on DEPENDENCY')
+    why.add_argument('module')
+    why.add_argument('dependency')
+    cycles = subparsers.add_parser('cycles', help='Dependency cycles')
+    cycles.add_argument('--max-cycles', type=int, default=100, help='0 for no limit (default: 100)')
+    waves = subparsers.add_parser('waves', help='Build waves and critical path')
+    waves.add_argument('--cores', type=int, help='Cores for the build time estimate (default: server CPU count)')
+    waves.add_argument('--weight', choices=['bytes', 'files', 'time'], help='Module cost (default: server choice)')
+    subparsers.add_parser('shutdown', help='Stop the server')
+
+    args = parser.parse_args()
+
+    request = {'query': args.query.replace('-', '_')}
+    if args.query == 'affected':
+        request.update(files=args.files, modules=args.modules)
+    elif args.query in ('depends-on', 'why'):
+        request['module'] = args.module
+        if args.query == 'why':
+            request['dependency'] = args.dependency
+    elif args.query == 'path':
+        request.update({'from': args.source, 'to': args.target})
+    elif args.query == 'cycles':
+        request['max_cycles'] = args.max_cycles
+    elif args.query == 'waves':
+        request.update({key: value for key, value in (('cores', args.cores), ('weight', args.weight)) if value})
+
+    try:
+        response = send_query(args.socket, request)
+    except OSError as e:
+        print(f"Error: Could not reach the graph server at {args.socket}: {e}", file=sys.stderr)
+        print("Start it with: python3 build_dependency_graph.py serve", file=sys.stderr)
+        return 1
+
+    if not response.get('ok'):
+        print(f"Error: {response.get('error')}", file=sys.stderr)
+        return 1
+    print(json.dumps(response['result'], indent=2))
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
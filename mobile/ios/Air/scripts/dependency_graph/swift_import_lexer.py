@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Swift import prelude lexer.
+
+Reads only the import section at the top of a Swift file and stops at the
+first token that starts anything other than an import declaration. Handles
+attributes (@_exported, @testable, @preconcurrency, ...), kind-qualified
+imports such as `import struct Module.Type`, access-level imports such as
+`public import Module`, nested block comments and `#if canImport(...)`
+branches, whose conditions are recorded on each import.
+A leading UTF-8 byte order mark and `#!` line are skipped.
+Works on bytes so callers can feed it a prefix of the file and read more only
+when the prelude runs past the end of the buffer.
+
+Imports placed after the first declaration are not seen. Swift style keeps
+imports at the top, and such late imports in this tree only name system
+frameworks.
+"""
+
+import re
+from typing import List, NamedTuple, Optional, Tuple
+
+UTF8_BOM = b'\xef\xbb\xbf'
+WHITESPACE = re.compile(rb'[ \t\r\n\f\v]+')
+LINE_COMMENT = re.compile(rb'//[^\n]*')
+ATTRIBUTE = re.compile(rb'@[A-Za-z_][A-Za-z0-9_]*')
+DIRECTIVE = re.compile(rb'#(if|elseif|else|endif|warning|error|sourceLocation)\b([^\n]*)')
+IMPORT_PATH = re.compile(
+    rb'(?:(public|package|internal|fileprivate|private)[ \t]+)?'
+    rb'import[ \t]+(?:(typealias|struct|class|enum|protocol|let|var|func)[ \t]+)?'
+    rb'([A-Za-z_][A-Za-z0-9_]*(?:[ \t]*\.[ \t]*[A-Za-z_][A-Za-z0-9_]*)*)'
+)
+SIMPLE_CONDITION = re.compile(r'!?[A-Za-z_][A-Za-z0-9_]*(\([^()]*\))?')
+
+
+class SwiftImport(NamedTuple):
+    module: str  # first component of the import path, i.e. the module
+    path: str  # full import path, e.g. 'os.OSAllocatedUnfairLock'
+    kind: Optional[str]  # 'struct', 'func', ... for kind-qualified imports
+    attributes: Tuple[str, ...]  # e.g. ('@testable',)
+    access: Optional[str]  # 'public', 'internal', ... for access-level imports
+    line: int
+    condition: Optional[str]  # active #if condition, None when unconditional
+
+
+def _negate(condition: str) -> str:
+    if SIMPLE_CONDITION.fullmatch(condition):
+        return condition[1:] if condition.startswith('!') else '!' + condition
+    return f"!({condition})"
+
+
+def _branch_condition(frame: List[str], is_else: bool) -> str:
+    """Condition under which the current branch of an #if block is taken."""
+    if is_else:
+        return ' && '.join(_negate(condition) for condition in frame)
+    return ' && '.join([_negate(condition) for condition in frame[:-1]] + [frame[-1]])
+
+
+def _skip_block_comment(data: bytes, position: int) -> Optional[int]:
+    """Return the offset just past the (possibly nested) comment at position, or None if unterminated."""
+    depth = 0
+    while True:
+        opening = data.find(b'/*', position)
+        closing = data.find(b'*/', position)
+        if closing < 0:
+            return None
+        if 0 <= opening < closing:
+            depth += 1
+            position = opening + 2
+        else:
+            depth -= 1
+            position = closing + 2
+            if depth == 0:
+                return position
+
+
+def _skip_parentheses(data: bytes, position: int) -> Optional[int]:
+    """Return the offset just past the balanced parentheses at position, or None if unbalanced."""
+    depth = 0
+    for offset in range(position, len(data)):
+        character = data[offset]
+        if character == 0x28:  # (
+            depth += 1
+        elif character == 0x29:  # )
+            depth -= 1
+            if depth == 0:
+                return offset + 1
+    return None
+
+
+def lex_import_prelude(data: bytes, complete: bool = True) -> Optional[Tuple[List[SwiftImport], int]]:
+    """Return (imports, end) where end is the offset of the first non-import token.
+
+    With complete=False, data is only a prefix of the file; None is returned
+    when the prelude reaches the end of the prefix and more input is needed.
+    """
+    imports = []
+    conditions = []  # one frame per open #if: conditions of its branches so far
+    in_else = []
+    attributes = []
+    attributes_start = None
+    position = 0
+    length = len(data)
+
+    if data.startswith(UTF8_BOM):
+        position = len(UTF8_BOM)
+    if data.startswith(b'#!', position):
+        newline = data.find(b'\n', position)
+        position = newline if newline >= 0 else length
+
+    while True:
+        match = WHITESPACE.match(data, position)
+        if match:
+            position = match.end()
+        # Every token below, except block comments and attribute arguments,
+        # ends on its own line, so a prefix can be lexed line by line.
+        if not complete and data.find(b'\n', position) < 0:
+            return None
+        if position >= length:
+            return imports, length
+        start = position
+        declaration_start = attributes_start if attributes_start is not None else start
+
+        if data.startswith(b'//', position):
+            position = LINE_COMMENT.match(data, position).end()
+            continue
+        if data.startswith(b'/*', position):
+            end = _skip_block_comment(data, position)
+            if end is None:
+                return None if not complete else (imports, length)
+            position = end
+            continue
+
+        if data.startswith(b'#', position):
+            match = DIRECTIVE.match(data, position)
+            if match is None:
+                return imports, declaration_start
+            directive = match.group(1)
+            text = LINE_COMMENT.sub(b'', match.group(2)).strip().decode('utf-8', 'replace')
+            if directive == b'if':
+                conditions.append([text])
+                in_else.append(False)
+            elif directive == b'elseif' and conditions:
+                conditions[-1].append(text)
+            elif directive == b'else' and conditions:
+                in_else[-1] = True
+            elif directive == b'endif' and conditions:
+                conditions.pop()
+                in_else.pop()
+            elif directive not in (b'warning', b'error', b'sourceLocation'):
+                return imports, declaration_start
+            position = match.end()
+            continue
+
+        if data.startswith(b'@', position):
+            match = ATTRIBUTE.match(data, position)
+            if match is None:
+                return imports, declaration_start
+            attributes_start = declaration_start
+            position = match.end()
+            attribute = match.group(0).decode('ascii')
+            following = WHITESPACE.match(data, position)
+            after = following.end() if following else position
+            if data.startswith(b'(', after):
+                end = _skip_parentheses(data, after)
+                if end is None:
+                    return None if not complete else (imports, declaration_start)
+                attribute += data[after:end].decode('utf-8', 'replace')
+                position = end
+            attributes.append(attribute)
+            continue
+
+        if data.startswith(b';', position):
+            position += 1
+            continue
+
+        match = IMPORT_PATH.match(data, position)
+        if match is None:
+            return imports, declaration_start
+
+        path = re.sub(rb'[ \t]+', b'', match.group(3)).decode('ascii')
+        condition = None
+        if conditions:
+            condition = ' && '.join(
+                _branch_condition(frame, is_else) for frame, is_else in zip(conditions, in_else)
+            )
+        imports.append(SwiftImport(
+            module=path.split('.', 1)[0],
+            path=path,
+            kind=match.group(2).decode('ascii') if match.group(2) else None,
+            attributes=tuple(attributes),
+            access=match.group(1).decode('ascii') if match.group(1) else None,
+            line=data.count(b'\n', 0, declaration_start) + 1,
+            condition=condition
+        ))
+        attributes = []
+        attributes_start = None
+        position = match.end()
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+Tests for build_dependency_graph.py.
+
+Run from this directory:
+    python3 -m unittest test_build_dependency_graph
+"""
+
+import io
+import json
+import os
+import tempfile
+import threading
+import unittest
+from contextlib import redirect_stdout
+
+from build_dependency_graph import (CACHE_VERSION, DependencyGraphBuilder, GraphServer, ScanCache, diff_dependency_data,
+                                    diff_main, find_public_declarations)
+from compile_timings import CompileTimings
+from graph_client import send_query
+
+SOURCES = {
+    'WalletContext/Sources/Context.swift': 'import Foundation\nimport BigIntLib\n',
+    'WalletContext/Sources/Lang.swift': 'import UIKit\n',
+    'BigIntLib/Sources/BigInt.swift': 'import Foundation\n',
+    'WalletCore/Sources/Store.swift': 'import WalletContext\n@_exported import BigIntLib\n',
+    'WalletCore/Sources/Api.swift': '#if canImport(UIKit)\nimport UIComponents\n#endif\n',
+    'UIComponents/Views/Button.swift': '// A button\nimport UIKit\nimport WalletCore\nimport WalletContext\n',
+    'UIHome/Home/HomeVC.swift': 'import UIComponents\nimport WalletCore\n\nfinal class HomeVC {}\n',
+    'UIHome/Home/HomeVM.swift': '@testable import WalletContext\nimport struct WalletCore.Store\n',
+}
+
+
+def write_sources(root: str, sources: dict = SOURCES) -> None:
+    for relative_path, source in sources.items():
+        path = os.path.join(root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+
+
+class ParallelExtractImportsTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        write_sources(self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def build(self, jobs: int) -> DependencyGraphBuilder:
+        builder = DependencyGraphBuilder(self.tempdir.name)
+        builder.scan_modules()
+        builder.find_swift_files()
+        builder.extract_imports(jobs=jobs)
+        return builder
+
+    def test_pool_matches_serial_scan(self):
+        serial = self.build(jobs=1)
+        parallel = self.build(jobs=2)
+
+        self.assertEqual(dict(serial.dependencies), dict(parallel.dependencies))
+        self.assertEqual(dict(serial.reverse_dependencies), dict(parallel.reverse_dependencies))
+        self.assertEqual(serial.dependencies['UIHome'], {'UIComponents', 'WalletCore', 'WalletContext'})
+        self.assertEqual(serial.dependencies['WalletCore'], {'WalletContext', 'BigIntLib', 'UIComponents'})
+
+
+class LibraryApiTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        write_sources(self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_scan_is_quiet_by_default(self):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            builder = DependencyGraphBuilder(self.tempdir.name).scan()
+            builder.find_cyclic_components()
+            builder.topological_sort()
+        self.assertEqual(output.getvalue(), '')
+        self.assertEqual(builder.dependencies['UIHome'], {'UIComponents', 'WalletCore', 'WalletContext'})
+
+    def test_missing_root_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            DependencyGraphBuilder(os.path.join(self.tempdir.name, 'missing')).scan()
+
+    def test_results_are_memoized_until_the_graph_changes(self):
+        builder = DependencyGraphBuilder(self.tempdir.name).scan()
+        cycles = builder.find_cyclic_components()
+        self.assertIs(builder.find_cyclic_components(), cycles)
+        self.assertEqual(cycles, [['UIComponents', 'WalletCore']])
+        self.assertIn(['UIComponents', 'WalletCore'], builder.build_schedule(cores=2)['waves'])
+
+        path = os.path.join(self.tempdir.name, 'WalletCore', 'Sources', 'Api.swift')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('import Foundation\n')
+        builder.update_files([path], [])
+
+        self.assertEqual(builder.find_cyclic_components(), [])
+        waves = builder.build_schedule(cores=2)['waves']
+        wave_of = {module: i for i, wave in enumerate(waves) for module in wave}
+        self.assertLess(wave_of['WalletCore'], wave_of['UIComponents'])
+
+
+class EdgeEvidenceTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        write_sources(self.tempdir.name)
+        self.builder = DependencyGraphBuilder(self.tempdir.name).scan()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_sites_behind_each_edge(self):
+        evidence = self.builder.edge_evidence()
+        self.assertEqual(set(evidence), {(module, dependency)
+                                         for module, dependencies in self.builder.dependencies.items()
+                                         for dependency in dependencies})
+        self.assertEqual(evidence[('WalletCore', 'UIComponents')],
+                         [(os.path.join('WalletCore', 'Sources', 'Api.swift'), 2, 'canImport(UIKit)')])
+        self.assertEqual(evidence[('UIHome', 'WalletCore')], [
+            (os.path.join('UIHome', 'Home', 'HomeVC.swift'), 2, None),
+            (os.path.join('UIHome', 'Home', 'HomeVM.swift'), 2, None),
+        ])
+
+    def test_rank_edges_cheapest_first(self):
+        ranked = self.builder.rank_edges()
+        self.assertEqual(len(ranked), sum(len(dependencies) for dependencies in self.builder.dependencies.values()))
+        self.assertEqual([(edge['files'], edge['sites']) for edge in ranked],
+                         sorted((edge['files'], edge['sites']) for edge in ranked))
+        self.assertEqual(ranked[-1], {'module': 'UIHome', 'dependency': 'WalletCore', 'files': 2, 'sites': 2})
+
+
+class CompileTimingAttributionTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tempdir.name, 'SubModules')
+        write_sources(self.root)
+        self.builder = DependencyGraphBuilder(self.root).scan()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_logged_paths_are_mapped_to_modules(self):
+        timings = CompileTimings()
+        for line in (
+            f"10.00ms\t{os.path.join(self.root, 'UIHome', 'Home', 'HomeVC.swift')}:3:1\tinit()",
+            '20.00ms\t/ci/checkout/SubModules/UIHome/Home/HomeVM.swift:1:1\tload()',
+            '5.00ms\tButton.swift:1:1\tbody',
+            '7.00ms\t/elsewhere/Unknown.swift:1:1\tbody',
+        ):
+            timings.parse_line(line)
+
+        self.builder.load_compile_timings(timings)
+
+        self.assertEqual(set(self.builder.compile_times), {'UIHome', 'UIComponents'})
+        self.assertEqual(self.builder.compile_times['UIHome']['function_body_ms'], 30.0)
+        self.assertEqual(self.builder.compile_times['UIHome']['slowest_function_bodies'][0]['name'], 'load()')
+        self.assertEqual(self.builder.compile_times_unattributed, ['/elsewhere/Unknown.swift'])
+        self.assertEqual(self.builder.module_weights('time')['UIHome'], 30)
+        self.assertEqual(self.builder.module_weights('time')['BigIntLib'], 0)
+
+    def test_time_weight_needs_timings(self):
+        with self.assertRaises(ValueError):
+            self.builder.module_weights('time')
+
+
+class DotExportTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tempdir.name, 'SubModules')
+        write_sources(self.root)
+        self.builder = DependencyGraphBuilder(self.root).scan()
+        self.output = os.path.join(self.tempdir.name, 'graph.dot')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def edges(self):
+        with open(self.output) as f:
+            return sorted(line.strip() for line in f if '->' in line)
+
+    def test_neighbourhood(self):
+        self.assertEqual(self.builder.neighbourhood('BigIntLib', 0), {'BigIntLib'})
+        self.assertEqual(self.builder.neighbourhood('BigIntLib', 1), {'BigIntLib', 'WalletContext', 'WalletCore'})
+        self.assertEqual(self.builder.neighbourhood('BigIntLib', 3), set(self.builder.modules))
+        with self.assertRaises(ValueError):
+            self.builder.neighbourhood('UIKit', 1)
+
+    def test_condensed_dot_collapses_cycles_and_counts_edges(self):
+        self.builder.export_condensed_dot(self.output)
+        with open(self.output) as f:
+            self.assertIn('cycle of 2 modules\\nUIComponents\\nWalletCore', f.read())
+        cycle = [line.split('"')[1] for line in self.edges() if line.startswith('"cycle_')][0]
+        self.assertEqual(self.edges(), sorted([
+            f'"{cycle}" -> "BigIntLib";',
+            f'"{cycle}" -> "WalletContext" [label="2"];',
+            '"UIHome" -> "WalletContext";',
+            f'"UIHome" -> "{cycle}" [label="2"];',
+            '"WalletContext" -> "BigIntLib";',
+        ]))
+
+    def test_condensed_dot_of_a_focus(self):
+        self.builder.export_condensed_dot(self.output, {'UIHome', 'WalletContext'})
+        self.assertEqual(self.edges(), ['"UIHome" -> "WalletContext";'])
+
+
+class ApiSurfaceTest(unittest.TestCase):
+    API_SOURCES = {
+        'WalletContext/Sources/Api.swift': (
+            'import Foundation\n\n'
+            'public struct Config {\n'
+            '    public let name: String\n'
+            '    public init(name: String) {}\n'
+            '    let hidden = 0\n'
+            '}\n'
+            '@MainActor public final class Store {}\n'
+            'public private(set) var counter = 0\n'
+            '// public func commented()\n'
+        ),
+        'BigIntLib/Sources/BigInt.swift': 'import Foundation\npublic struct BigInt {}\n',
+    }
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        write_sources(self.tempdir.name)
+        write_sources(self.tempdir.name, self.API_SOURCES)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_find_public_declarations(self):
+        data = self.API_SOURCES['WalletContext/Sources/Api.swift'].encode('utf-8')
+        self.assertEqual(find_public_declarations(data), [
+            ('struct', 'Config', 3), ('let', 'name', 4), ('init', 'init', 5),
+            ('class', 'Store', 8), ('var', 'counter', 9),
+        ])
+
+    def test_rebuild_fan_out_ranking(self):
+        builder = DependencyGraphBuilder(self.tempdir.name).scan(api_surface=True)
+        surface = builder.api_surface()
+        self.assertEqual(surface['ranking'][:2], ['WalletContext', 'BigIntLib'])
+        context = surface['modules']['WalletContext']
+        self.assertEqual((context['public_symbols'], context['transitive_dependents'], context['rebuild_fan_out']),
+                         (5, 3, 15))
+        self.assertEqual(context['kinds'], {'class': 1, 'init': 1, 'let': 1, 'struct': 1, 'var': 1})
+        self.assertEqual(context['files'][0]['file'], os.path.join('WalletContext', 'Sources', 'Api.swift'))
+        self.assertEqual(surface['modules']['BigIntLib']['rebuild_fan_out'], 4)
+
+    def test_needs_an_api_surface_scan(self):
+        builder = DependencyGraphBuilder(self.tempdir.name).scan()
+        with self.assertRaises(ValueError):
+            builder.api_surface()
+
+
+class ScanCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tempdir.name, 'SubModules')
+        self.cache_file = os.path.join(self.tempdir.name, 'cache.json')
+        write_sources(self.root)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def build(self, api_surface: bool = False):
+        cache = ScanCache(self.cache_file)
+        cache.load()
+        builder = DependencyGraphBuilder(self.root)
+        builder.scan_modules()
+        builder.find_swift_files()
+        builder.extract_imports(cache=cache, api_surface=api_surface)
+        cache.save()
+        return builder, cache
+
+    def write(self, relative_path: str, source: str) -> str:
+        path = os.path.join(self.root, relative_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        return path
+
+    def test_second_run_is_served_from_cache(self):
+        cold, cold_cache = self.build()
+        warm, warm_cache = self.build()
+
+        self.assertEqual((cold_cache.hits, cold_cache.misses), (0, len(SOURCES)))
+        self.assertEqual((warm_cache.hits, warm_cache.misses), (len(SOURCES), 0))
+        self.assertEqual(warm.files_read, 0)
+        self.assertEqual(dict(cold.dependencies), dict(warm.dependencies))
+
+    def test_edited_file_is_rescanned(self):
+        self.build()
+        self.write('UIHome/Home/HomeVC.swift', 'import BigIntLib\n')
+
+        builder, cache = self.build()
+
+        self.assertEqual((cache.hits, cache.misses), (len(SOURCES) - 1, 1))
+        self.assertIn('BigIntLib', builder.dependencies['UIHome'])
+        self.assertNotIn('UIComponents', builder.dependencies['UIHome'])
+
+    def test_touched_file_with_same_prelude_keeps_cached_imports(self):
+        self.build()
+        path = self.write('UIHome/Home/HomeVC.swift', 'import UIComponents\nimport WalletCore\n\nfinal class HomeVC { }\n')
+
+        _, cache = self.build()
+
+        self.assertEqual(cache.misses, 0)
+        self.assertEqual(cache.entries[os.path.abspath(path)]['size'], os.stat(path).st_size)
+
+    def test_removed_files_are_pruned(self):
+        self.build()
+        path = os.path.join(self.root, 'UIHome/Home/HomeVM.swift')
+        os.remove(path)
+
+        _, cache = self.build()
+
+        self.assertNotIn(os.path.abspath(path), cache.entries)
+        self.assertEqual(len(cache.entries), len(SOURCES) - 1)
+
+    def test_api_surface_needs_declarations(self):
+        self.build()
+        _, cache = self.build(api_surface=True)
+        self.assertEqual(cache.misses, len(SOURCES))
+        _, cache = self.build(api_surface=True)
+        self.assertEqual(cache.misses, 0)
+
+    def test_other_cache_version_is_ignored(self):
+        with open(self.cache_file, 'w') as f:
+            json.dump({'version': CACHE_VERSION - 1, 'files': {'stale.swift': {}}}, f)
+        cache = ScanCache(self.cache_file)
+        cache.load()
+        self.assertEqual(cache.entries, {})
+
+
+class DiffDependencyDataTest(unittest.TestCase):
+    OLD = {
+        'modules': {'A': {}, 'B': {}, 'C': {}},
+        'dependency_graph': {'A': ['B'], 'B': ['C'], 'C': []},
+    }
+    NEW = {
+        'modules': {'A': {}, 'B': {}, 'C': {}, 'D': {}},
+        'dependency_graph': {'A': ['B', 'C'], 'B': ['C'], 'C': ['D'], 'D': ['B']},
+    }
+
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, data in (('old.json', self.OLD), ('new.json', self.NEW)):
+            path = os.path.join(self.tempdir.name, name)
+            with open(path, 'w') as f:
+                json.dump(data, f)
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def run_diff(self, *limits: str):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            status = diff_main(self.paths + ['--json'] + list(limits))
+        return status, json.loads(output.getvalue())
+
+    def test_diff(self):
+        result = diff_dependency_data(self.OLD, self.NEW)
+        self.assertEqual(result['added_modules'], ['D'])
+        self.assertEqual(result['removed_modules'], [])
+        self.assertEqual(result['added_edges'], [('A', 'C'), ('C', 'D'), ('D', 'B')])
+        self.assertEqual(result['removed_edges'], [])
+        self.assertEqual(result['new_cycles'], [['B', 'C', 'D']])
+        self.assertEqual(result['wave_depth'], {'old': 3, 'new': 2, 'delta': -1})
+        self.assertEqual([change['module'] for change in result['fan_changes']], ['A', 'B', 'C', 'D'])
+        self.assertEqual(diff_dependency_data(self.NEW, self.OLD)['resolved_cycles'], [['B', 'C', 'D']])
+
+    def test_identical_snapshots(self):
+        result = diff_dependency_data(self.OLD, self.OLD)
+        self.assertEqual(result['added_edges'], [])
+        self.assertEqual(result['fan_changes'], [])
+        self.assertEqual(result['wave_depth']['delta'], 0)
+
+    def test_limits_at_the_value_pass(self):
+        status, result = self.run_diff('--max-added-edges', '3', '--max-new-cycles', '1',
+                                       '--max-depth-increase', '0', '--max-fan-in-increase', '1',
+                                       '--max-fan-out-increase', '1')
+        self.assertEqual(status, 0)
+        self.assertEqual(result['violations'], [])
+
+    def test_limits_below_the_value_fail(self):
+        status, result = self.run_diff('--max-added-edges', '2', '--max-new-cycles', '0',
+                                       '--max-fan-in-increase', '0')
+        self.assertEqual(status, 1)
+        self.assertEqual(result['violations'], [
+            {'check': 'added edges', 'value': 3, 'limit': 2},
+            {'check': 'new cycles', 'value': 1, 'limit': 0},
+            {'check': 'fan-in increase', 'value': 1, 'limit': 0},
+        ])
+
+
+class GraphServerTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tempdir.name, 'SubModules')
+        write_sources(self.root)
+        builder = DependencyGraphBuilder(self.root).scan()
+        self.server = GraphServer(builder, os.path.join(self.tempdir.name, 'graph.sock'), interval=0.05,
+                                  repo_root=self.tempdir.name)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_queries(self):
+        affected = self.server.handle({'query': 'affected', 'files': ['SubModules/UIHome/Home/HomeVC.swift', 'README.md']})
+        self.assertTrue(affected['ok'])
+        self.assertEqual(affected['result']['changed_modules'], ['UIHome'])
+        self.assertEqual(affected['result']['unmatched_paths'], ['README.md'])
+        self.assertEqual(self.server.handle({'query': 'path', 'from': 'UIHome', 'to': 'BigIntLib'})['result'],
+                         ['UIHome', 'WalletContext', 'BigIntLib'])
+        self.assertEqual(self.server.handle({'query': 'why', 'module': 'WalletCore', 'dependency': 'UIComponents'})['result'],
+                         [{'file': os.path.join('WalletCore', 'Sources', 'Api.swift'), 'line': 2,
+                           'condition': 'canImport(UIKit)'}])
+        self.assertEqual(self.server.handle({'query': 'cycles'})['result']['components'], [['UIComponents', 'WalletCore']])
+
+    def test_bad_requests(self):
+        self.assertFalse(self.server.handle({'query': 'nope'})['ok'])
+        self.assertFalse(self.server.handle({'query': 'path', 'from': 'UIHome'})['ok'])
+        self.assertIn('unknown module', self.server.handle({'query': 'depends_on', 'module': 'UIKit'})['error'])
+
+    def test_refresh_picks_up_edits(self):
+        path = os.path.join(self.root, 'WalletCore', 'Sources', 'Api.swift')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('import Foundation\n\n')
+        with redirect_stdout(io.StringIO()):
+            self.server.refresh()
+        response = self.server.handle({'query': 'cycles'})
+        self.assertEqual(response['generation'], 1)
+        self.assertEqual(response['result']['components'], [])
+
+    def test_socket_round_trip(self):
+        thread = threading.Thread(target=self.server.serve_forever)
+        with redirect_stdout(io.StringIO()):
+            thread.start()
+            try:
+                # running is set once the socket is listening
+                for _ in range(500):
+                    if self.server.running:
+                        break
+                    thread.join(0.01)
+                response = send_query(self.server.socket_path, {'query': 'ping'})
+                self.assertEqual(response['result']['modules'], len({path.split('/')[0] for path in SOURCES}))
+                self.assertTrue(send_query(self.server.socket_path, {'query': 'shutdown'})['ok'])
+            finally:
+                self.server.running = False
+                thread.join(5)
+        self.assertFalse(os.path.exists(self.server.socket_path))
+
+
+class SymlinkedRootTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.real_root = os.path.join(self.tempdir.name, 'SubModules')
+        write_sources(self.real_root)
+        self.link_root = os.path.join(self.tempdir.name, 'LinkedSubModules')
+        os.symlink(self.real_root, self.link_root)
+        self.builder = DependencyGraphBuilder(self.link_root)
+        self.builder.scan_modules()
+        self.builder.find_swift_files()
+        self.builder.extract_imports(jobs=1)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_module_for_path_through_link_and_target(self):
+        relative = os.path.join('UIHome', 'Home', 'HomeVC.swift')
+        self.assertEqual(self.builder.module_for_path(os.path.join(self.link_root, relative)), 'UIHome')
+        self.assertEqual(self.builder.module_for_path(os.path.join(self.real_root, relative)), 'UIHome')
+        self.assertIsNone(self.builder.module_for_path(os.path.join(self.tempdir.name, 'Other.swift')))
+
+    def test_update_files_under_linked_root(self):
+        path = os.path.join(self.link_root, 'UIHome', 'Home', 'HomeVC.swift')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('import UIComponents\nimport BigIntLib\n')
+
+        added, removed = self.builder.update_files([path], [])
+
+        self.assertEqual(added, {('UIHome', 'BigIntLib')})
+        self.assertEqual(removed, set())
+        self.assertTrue(self.builder.affected_modules({'BigIntLib'}) >= {'WalletContext', 'WalletCore', 'UIHome'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Tests for compile_timings.py.
+
+Run from this directory:
+    python3 -m unittest test_compile_timings
+"""
+
+import os
+import tempfile
+import unittest
+
+from compile_timings import CompileTimings
+
+LOG = (
+    '12.50ms\t/src/SubModules/WalletCore/Sources/Store.swift:42:10\tinstance method load(from:)\r\n'
+    '0.40ms\t/src/SubModules/WalletCore/Sources/Store.swift:7:5\tgetter count\r\n'
+    '3.00ms\t/src/SubModules/UIHome/Главная/HomeVC.swift:1:1\tinit()\r\n'
+    '   1.2000 ( 10.0%)   0.1000 ( 10.0%)   1.3000 ( 10.0%)   2.0000 ( 10.8%)  '
+    '{compile: Store.o <= /src/SubModules/WalletCore/Sources/Store.swift /src/SubModules/My Folder/Api.swift}\r\n'
+    'SwiftCompile (120 tasks) | 98.765 seconds\r\n'
+    'SwiftCompile (1 task) | 1.235 seconds\r\n'
+).encode('utf-8') + b'not UTF-8: \xff\n'
+
+
+class CompileTimingsTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.log_file = os.path.join(self.tempdir.name, 'build.log')
+        with open(self.log_file, 'wb') as f:
+            f.write(LOG)
+        self.timings = CompileTimings(slowest_per_file=1)
+        self.timings.parse_file(self.log_file)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def test_bytes_read_is_the_file_size(self):
+        self.assertEqual(self.timings.bytes_read, os.path.getsize(self.log_file))
+        self.assertEqual(self.timings.lines_read, 7)
+
+    def test_function_bodies(self):
+        store = '/src/SubModules/WalletCore/Sources/Store.swift'
+        self.assertAlmostEqual(self.timings.function_body_ms[store], 12.9)
+        self.assertEqual(self.timings.slowest_bodies(store), [(12.5, 42, 10, 'instance method load(from:)')])
+        self.assertEqual(self.timings.function_body_ms['/src/SubModules/UIHome/Главная/HomeVC.swift'], 3.0)
+
+    def test_batch_driver_job_splits_wall_time(self):
+        self.assertEqual(dict(self.timings.compile_seconds), {
+            '/src/SubModules/WalletCore/Sources/Store.swift': 1.0,
+            '/src/SubModules/My Folder/Api.swift': 1.0,
+        })
+        self.assertTrue(self.timings.has_driver_times())
+
+    def test_task_summary(self):
+        summary = self.timings.summary()
+        self.assertEqual(list(summary['task_summary']), ['SwiftCompile'])
+        self.assertEqual(summary['task_summary']['SwiftCompile']['tasks'], 121)
+        self.assertAlmostEqual(summary['task_summary']['SwiftCompile']['seconds'], 100.0)
+        self.assertEqual(summary['files'], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for graph_algorithms.py.
+
+Run from this directory:
+    python3 -m unittest test_graph_algorithms
+"""
+
+import unittest
+
+from graph_algorithms import (ReachabilityIndex, build_waves, critical_path, cyclic_components, elementary_cycles,
+                              estimate_makespan, redundant_edges, strongly_connected_components,
+                              transitive_reduction)
+
+# module -> modules it depends on
+ACYCLIC = {
+    'App': {'UIHome', 'UIComponents', 'WalletCore'},
+    'UIHome': {'UIComponents', 'WalletCore'},
+    'UIComponents': {'WalletCore'},
+    'WalletCore': {'WalletContext'},
+    'WalletContext': set(),
+}
+
+CYCLIC = {
+    'A': {'B'},
+    'B': {'C'},
+    'C': {'A', 'D'},
+    'D': {'E'},
+    'E': {'D'},
+    'F': {'F'},
+    'G': {'A'},
+}
+
+
+def reachable(graph, start):
+    """Every node reachable from start in at least one step, by plain search."""
+    seen = set()
+    stack = list(graph[start])
+    while stack:
+        node = stack.pop()
+        if node not in seen:
+            seen.add(node)
+            stack.extend(graph.get(node, ()))
+    return seen
+
+
+def canonical(cycle):
+    """Drop the repeated start node and rotate the cycle to start at its smallest node."""
+    assert cycle[0] == cycle[-1], cycle
+    cycle = cycle[:-1]
+    start = cycle.index(min(cycle))
+    return tuple(cycle[start:] + cycle[:start])
+
+
+class CycleDetectionTest(unittest.TestCase):
+    def test_acyclic_graph_has_no_cycles(self):
+        self.assertEqual(cyclic_components(ACYCLIC, ACYCLIC), [])
+        self.assertEqual(elementary_cycles(ACYCLIC, ACYCLIC), [])
+
+    def test_components_cover_every_node(self):
+        components = strongly_connected_components(CYCLIC, CYCLIC)
+        self.assertEqual(sorted(node for component in components for node in component), sorted(CYCLIC))
+
+    def test_cyclic_components_largest_first_with_self_loops(self):
+        self.assertEqual(cyclic_components(CYCLIC, CYCLIC), [['A', 'B', 'C'], ['D', 'E'], ['F']])
+
+    def test_elementary_cycles(self):
+        cycles = {canonical(cycle) for cycle in elementary_cycles(CYCLIC, CYCLIC)}
+        self.assertEqual(cycles, {('A', 'B', 'C'), ('D', 'E'), ('F',)})
+
+    def test_elementary_cycles_sharing_nodes(self):
+        graph = {'A': {'B', 'C'}, 'B': {'A', 'C'}, 'C': {'A'}}
+        cycles = {canonical(cycle) for cycle in elementary_cycles(graph, graph)}
+        self.assertEqual(cycles, {('A', 'B'), ('A', 'C'), ('A', 'B', 'C')})
+
+    def test_max_cycles_limit(self):
+        self.assertEqual(len(elementary_cycles(CYCLIC, CYCLIC, max_cycles=2)), 2)
+
+    def test_deep_chain_does_not_recurse(self):
+        chain = {f'M{i}': {f'M{i + 1}'} for i in range(5000)}
+        chain['M5000'] = {'M0'}
+        self.assertEqual(len(cyclic_components(chain, chain)[0]), 5001)
+
+
+class ScheduleTest(unittest.TestCase):
+    # A -> B -> D is the heaviest chain: 2 + 5 + 1
+    GRAPH = {'A': set(), 'B': {'A'}, 'C': {'A'}, 'D': {'B', 'C'}, 'E': set()}
+    WEIGHTS = {'A': 2, 'B': 5, 'C': 1, 'D': 1, 'E': 4}
+
+    def test_waves(self):
+        self.assertEqual(build_waves(self.GRAPH, self.GRAPH), [['A', 'E'], ['B', 'C'], ['D']])
+        self.assertEqual(build_waves(ACYCLIC, ACYCLIC),
+                         [['WalletContext'], ['WalletCore'], ['UIComponents'], ['UIHome'], ['App']])
+
+    def test_cycle_members_share_a_wave(self):
+        graph = {'X': {'Y'}, 'Y': {'X'}, 'Z': {'X'}}
+        self.assertEqual(build_waves(graph, graph), [['X', 'Y'], ['Z']])
+
+    def test_critical_path(self):
+        self.assertEqual(critical_path(self.GRAPH, self.GRAPH, self.WEIGHTS), (['A', 'B', 'D'], 8))
+        self.assertEqual(critical_path({}, {}, {}), ([], 0))
+
+    def test_makespan(self):
+        self.assertEqual(estimate_makespan(self.GRAPH, self.GRAPH, self.WEIGHTS, cores=1), 13)
+        self.assertEqual(estimate_makespan(self.GRAPH, self.GRAPH, self.WEIGHTS, cores=2), 8)
+        self.assertEqual(estimate_makespan(self.GRAPH, self.GRAPH, self.WEIGHTS, cores=16), 8)
+
+    def test_makespan_is_bounded_by_critical_path_and_total_work(self):
+        for cores in range(1, 5):
+            makespan = estimate_makespan(CYCLIC, CYCLIC, {node: 1 for node in CYCLIC}, cores)
+            self.assertGreaterEqual(makespan, critical_path(CYCLIC, CYCLIC, {node: 1 for node in CYCLIC})[1])
+            self.assertLessEqual(makespan, len(CYCLIC))
+
+
+class ReachabilityIndexTest(unittest.TestCase):
+    def test_matches_plain_search(self):
+        for graph in (ACYCLIC, CYCLIC):
+            index = ReachabilityIndex.build(graph, graph)
+            for module in graph:
+                expected = reachable(graph, module)
+                self.assertEqual(set(index.depends_on(module)), expected)
+                self.assertEqual(set(index.affected_by(module)),
+                                 {other for other in graph if module in reachable(graph, other)})
+                for other in graph:
+                    self.assertEqual(index.reaches(module, other), other in expected)
+
+    def test_shortest_path(self):
+        index = ReachabilityIndex.build(ACYCLIC, ACYCLIC)
+        self.assertEqual(index.path('App', 'WalletContext'), ['App', 'WalletCore', 'WalletContext'])
+        self.assertEqual(index.path('UIHome', 'UIComponents'), ['UIHome', 'UIComponents'])
+        self.assertIsNone(index.path('WalletContext', 'App'))
+
+    def test_path_through_cycle(self):
+        index = ReachabilityIndex.build(CYCLIC, CYCLIC)
+        self.assertEqual(index.path('G', 'E'), ['G', 'A', 'B', 'C', 'D', 'E'])
+        self.assertEqual(index.path('A', 'A'), ['A', 'B', 'C', 'A'])
+
+    def test_dependencies_outside_the_node_set_are_ignored(self):
+        graph = {'App': {'WalletCore', 'UIKit'}, 'WalletCore': {'Foundation'}}
+        index = ReachabilityIndex.build(graph, graph)
+        self.assertEqual(index.depends_on('App'), ['WalletCore'])
+        self.assertNotIn('UIKit', index)
+
+    def test_dict_round_trip(self):
+        index = ReachabilityIndex.build(CYCLIC, CYCLIC)
+        loaded = ReachabilityIndex.from_dict(index.to_dict())
+        self.assertEqual(loaded.modules, index.modules)
+        self.assertEqual(loaded.descendants, index.descendants)
+        self.assertEqual(loaded.ancestors, index.ancestors)
+        self.assertEqual(loaded.path('G', 'E'), index.path('G', 'E'))
+
+
+class TransitiveReductionTest(unittest.TestCase):
+    def assertSameReachability(self, graph, reduced):
+        for module in graph:
+            self.assertEqual(reachable(reduced, module), reachable(graph, module), module)
+
+    def test_acyclic_reduction(self):
+        reduced = transitive_reduction(ACYCLIC, ACYCLIC)
+        self.assertEqual(reduced, {
+            'App': {'UIHome'},
+            'UIHome': {'UIComponents'},
+            'UIComponents': {'WalletCore'},
+            'WalletCore': {'WalletContext'},
+            'WalletContext': set(),
+        })
+        self.assertSameReachability(ACYCLIC, reduced)
+        self.assertEqual(ACYCLIC['App'], {'UIHome', 'UIComponents', 'WalletCore'})
+
+    def test_redundant_edges_name_a_witness(self):
+        edges = redundant_edges(ACYCLIC, ACYCLIC)
+        self.assertEqual([(source, target) for source, target, _ in edges],
+                         [('App', 'UIComponents'), ('App', 'WalletCore'), ('UIHome', 'WalletCore')])
+        for source, target, via in edges:
+            self.assertIn(via, ACYCLIC[source])
+            self.assertIn(target, reachable(ACYCLIC, via))
+
+    def test_edges_inside_cycles_are_kept(self):
+        reduced = transitive_reduction(CYCLIC, CYCLIC)
+        self.assertEqual(reduced, CYCLIC)
+
+    def test_parallel_edges_into_a_cycle(self):
+        graph = {'S': {'A', 'B', 'T'}, 'A': {'B'}, 'B': {'A'}, 'T': {'A'}, 'U': {'A', 'B'}}
+        reduced = transitive_reduction(graph, graph)
+        self.assertEqual(reduced['S'], {'T'})
+        self.assertEqual(len(reduced['U']), 1)
+        self.assertEqual(reduced['A'], {'B'})
+        self.assertSameReachability(graph, reduced)
+
+
+if __name__ == '__main__':
+    unittest.main()
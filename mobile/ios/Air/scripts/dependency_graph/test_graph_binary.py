@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Tests for graph_binary.py.
+
+Run from this directory:
+    python3 -m unittest test_graph_binary
+"""
+
+import os
+import random
+import tempfile
+import unittest
+
+from graph_algorithms import ReachabilityIndex
+from graph_binary import BinaryGraph, is_binary_graph, write_binary_graph
+
+
+def random_graph(count: int, seed: int):
+    """A graph with forward edges plus a few back edges, so it has cycles."""
+    rng = random.Random(seed)
+    names = [f'Module{i:03d}' for i in range(count)] + ['Módulo']
+    graph = {name: set() for name in names}
+    for i, name in enumerate(names):
+        for j in rng.sample(range(len(names)), 3):
+            if j > i or rng.random() < 0.05:
+                graph[name].add(names[j])
+    return graph
+
+
+class BinaryGraphRoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tempdir.name, 'dependency_data.bin')
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, graph, metrics=None):
+        index = ReachabilityIndex.build(graph, graph)
+        write_binary_graph(self.path, index, graph, metrics or {})
+        return index
+
+    def test_queries_match_the_reachability_index(self):
+        # More than 64 modules, so every bitset row spans several words.
+        graph = random_graph(150, seed=7)
+        index = self.write(graph)
+
+        with BinaryGraph.open(self.path) as binary:
+            self.assertEqual(binary.modules(), index.modules)
+            self.assertEqual(binary.words, 3)
+            for module in index.modules:
+                self.assertEqual(binary.dependencies(module), sorted(graph[module]))
+                self.assertEqual(binary.dependents(module),
+                                 sorted(other for other in graph if module in graph[other]))
+                self.assertEqual(binary.depends_on(module), index.depends_on(module))
+                self.assertEqual(binary.affected_by(module), index.affected_by(module))
+            for source, target in random.Random(1).sample([(a, b) for a in graph for b in graph], 500):
+                self.assertEqual(binary.reaches(source, target), index.reaches(source, target))
+                self.assertEqual(binary.path(source, target), index.path(source, target))
+
+    def test_metrics_and_lookup(self):
+        graph = {'WalletCore': {'WalletContext'}, 'WalletContext': set(), 'UIHome': {'WalletCore'}}
+        self.write(graph, {'source_bytes': {'WalletCore': 2 ** 40, 'UIHome': 7}, 'files': {'UIHome': 3}})
+
+        with BinaryGraph.open(self.path) as binary:
+            self.assertEqual(binary.metric_names, ['files', 'source_bytes'])
+            self.assertEqual(binary.metrics('WalletCore'), {'files': 0, 'source_bytes': 2 ** 40})
+            self.assertEqual(binary.metric('UIHome', 'files'), 3)
+            self.assertIn('WalletContext', binary)
+            self.assertNotIn('UIKit', binary)
+            self.assertIsNone(binary.id('Aaa'))
+            self.assertIsNone(binary.id('Zzz'))
+            self.assertEqual(binary.path('UIHome', 'WalletContext'), ['UIHome', 'WalletCore', 'WalletContext'])
+
+    def test_empty_graph(self):
+        self.write({})
+        with BinaryGraph.open(self.path) as binary:
+            self.assertEqual(binary.modules(), [])
+            self.assertNotIn('WalletCore', binary)
+
+    def test_format_detection(self):
+        self.write({'A': set()})
+        json_path = os.path.join(self.tempdir.name, 'dependency_data.json')
+        with open(json_path, 'w') as f:
+            f.write('{}')
+        self.assertTrue(is_binary_graph(self.path))
+        self.assertFalse(is_binary_graph(json_path))
+        self.assertFalse(is_binary_graph(os.path.join(self.tempdir.name, 'missing.bin')))
+        with open(json_path, 'rb') as f:
+            with self.assertRaises(ValueError):
+                BinaryGraph(f.read().ljust(64, b'\0'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Tests for swift_import_lexer.py.
+
+Run from this directory:
+    python3 -m unittest test_swift_import_lexer
+"""
+
+import unittest
+
+from swift_import_lexer import UTF8_BOM, lex_import_prelude
+
+
+def modules(source: bytes):
+    imports, _ = lex_import_prelude(source)
+    return [item.module for item in imports]
+
+
+class LexImportPreludeTest(unittest.TestCase):
+    def test_stops_at_first_declaration(self):
+        source = b'import Foundation\nimport UIKit\n\nfinal class A {}\nimport Late\n'
+        imports, end = lex_import_prelude(source)
+        self.assertEqual([item.module for item in imports], ['Foundation', 'UIKit'])
+        self.assertEqual([item.line for item in imports], [1, 2])
+        self.assertEqual(source[end:].split(b'\n', 1)[0], b'final class A {}')
+
+    def test_leading_bom_and_shebang(self):
+        self.assertEqual(modules(UTF8_BOM + b'import Foundation\n'), ['Foundation'])
+        self.assertEqual(modules(UTF8_BOM + b'#!/usr/bin/swift\nimport Foundation\n'), ['Foundation'])
+
+    def test_if_elseif_else_conditions(self):
+        source = (b'#if canImport(UIKit)\nimport UIKit\n'
+                  b'#elseif os(macOS)\nimport AppKit\n'
+                  b'#else\nimport Foundation\n#endif\n'
+                  b'import WalletCore\n')
+        imports, _ = lex_import_prelude(source)
+        self.assertEqual([(item.module, item.condition) for item in imports], [
+            ('UIKit', 'canImport(UIKit)'),
+            ('AppKit', '!canImport(UIKit) && os(macOS)'),
+            ('Foundation', '!canImport(UIKit) && !os(macOS)'),
+            ('WalletCore', None),
+        ])
+
+    def test_nested_block_comments(self):
+        source = b'/* outer /* inner */ still a comment */\nimport Foundation\n/**/import UIKit\n'
+        self.assertEqual(modules(source), ['Foundation', 'UIKit'])
+
+    def test_kind_qualified_imports(self):
+        source = b'import struct WalletCore.Store\nimport func Darwin.C.exit\nimport os . OSAllocatedUnfairLock\n'
+        imports, _ = lex_import_prelude(source)
+        self.assertEqual([(item.module, item.path, item.kind) for item in imports], [
+            ('WalletCore', 'WalletCore.Store', 'struct'),
+            ('Darwin', 'Darwin.C.exit', 'func'),
+            ('os', 'os.OSAllocatedUnfairLock', None),
+        ])
+
+    def test_access_level_imports(self):
+        source = (b'public import WalletContext\npackage import WalletCore\n'
+                  b'internal import UIKit\nfileprivate import struct BigIntLib.BigInt\n'
+                  b'private import Foundation\n@preconcurrency public import Combine\n'
+                  b'import UIComponents\npublic struct Late {}\nimport Missing\n')
+        imports, _ = lex_import_prelude(source)
+        self.assertEqual([(item.module, item.access) for item in imports], [
+            ('WalletContext', 'public'),
+            ('WalletCore', 'package'),
+            ('UIKit', 'internal'),
+            ('BigIntLib', 'fileprivate'),
+            ('Foundation', 'private'),
+            ('Combine', 'public'),
+            ('UIComponents', None),
+        ])
+        self.assertEqual(imports[5].attributes, ('@preconcurrency',))
+
+    def test_attributes(self):
+        source = b'@_exported import BigIntLib\n@testable\nimport WalletContext\n@_spi(Internal) import WalletCore\n'
+        imports, _ = lex_import_prelude(source)
+        self.assertEqual([(item.module, item.attributes, item.line) for item in imports], [
+            ('BigIntLib', ('@_exported',), 1),
+            ('WalletContext', ('@testable',), 2),
+            ('WalletCore', ('@_spi(Internal)',), 4),
+        ])
+
+    def test_attribute_on_declaration_ends_prelude_before_attribute(self):
+        source = b'import UIKit\n@MainActor\nfinal class A {}\n'
+        imports, end = lex_import_prelude(source)
+        self.assertEqual([item.module for item in imports], ['UIKit'])
+        self.assertTrue(source[end:].startswith(b'@MainActor'))
+
+    def test_incomplete_prefix_asks_for_more(self):
+        self.assertIsNone(lex_import_prelude(b'import Foundation\nimport UIK', complete=False))
+        self.assertIsNone(lex_import_prelude(b'import Foundation\n/* open', complete=False))
+        imports, _ = lex_import_prelude(b'import Foundation\nclass A {\n', complete=False)
+        self.assertEqual([item.module for item in imports], ['Foundation'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Fast File Walker
+
+Shared by the dependency graph and localization scripts to find source files
+without descending into VCS metadata, node_modules, Pods or build output.
+Built on os.scandir, so directory entries are classified without a stat call
+per file and pruned directories are never opened.
+
+Usage from a script in a sibling directory:
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+    from file_walker import walk_files
+
+    for path in walk_files(root, suffixes=('.swift',)):
+        ...
+"""
+
+import os
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+DEFAULT_PRUNE_DIRS = frozenset({
+    '.git',
+    '.hg',
+    '.svn',
+    'node_modules',
+    'Pods',
+    '.build',
+    'DerivedData',
+})
+
+
+def walk_files(root: str,
+               suffixes: Tuple[str, ...] = ('.swift',),
+               prune_dirs: Optional[Iterable[str]] = None,
+               follow_symlinks: bool = False,
+               with_stat: bool = False) -> Iterator[Union[str, Tuple[str, os.stat_result]]]:
+    """Yield paths of files under root whose names end with one of suffixes.
+
+    Directories whose name is in prune_dirs (default: DEFAULT_PRUNE_DIRS) are
+    skipped entirely. Symlinked files are always yielded; symlinked
+    directories are only entered with follow_symlinks=True, in which case
+    each directory is visited once so link loops terminate. With
+    with_stat=True, (path, stat_result) pairs are yielded instead of bare
+    paths, stat'ing the link target for symlinked files.
+    """
+    prune = DEFAULT_PRUNE_DIRS if prune_dirs is None else frozenset(prune_dirs)
+    stack = [root]
+    visited = set()
+
+    if follow_symlinks:
+        try:
+            root_stat = os.stat(root)
+            visited.add((root_stat.st_dev, root_stat.st_ino))
+        except OSError:
+            return
+
+    while stack:
+        directory = stack.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if entry.name in prune:
+                            continue
+                        if follow_symlinks:
+                            target = entry.stat()
+                            key = (target.st_dev, target.st_ino)
+                            if key in visited:
+                                continue
+                            visited.add(key)
+                        stack.append(entry.path)
+                    elif entry.name.endswith(suffixes) and entry.is_file():
+                        if with_stat:
+                            yield entry.path, entry.stat()
+                        else:
+                            yield entry.path
+                except OSError:
+                    continue
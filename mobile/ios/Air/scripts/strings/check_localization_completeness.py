@@ -11,6 +11,8 @@ since plural forms are language-dependent and may differ between languages.
 Usage:
     python check_localization_completeness.py --base en.yaml --compare ru.yaml
     python check_localization_completeness.py --base /path/to/base.yaml --compare /path/to/compare.yaml --verbose
+    python check_localization_completeness.py --all
+    python check_localization_completeness.py --all --i18n-dir /path/to/src/i18n --json
 
 The script will:
 1. Load the base (English) localization file
@@ -30,6 +32,9 @@ Examples:
     # Check with verbose output
     python check_localization_completeness.py --base /path/to/en.yaml --compare /path/to/ru.yaml --verbose
 
+    # Check every locale in src/i18n and src/i18n/air against its en.yaml in one run
+    python check_localization_completeness.py --all
+
 Output format:
     MISSING KEYS IN ru.yaml:
     - missing_key_1
@@ -39,27 +44,50 @@ Output format:
     - extra_key_1
     - extra_key_2
 
+With --all, every *.yaml file next to each en.yaml (src/i18n and
+src/i18n/air) is loaded in a process pool, each base is flattened once, and
+one coverage matrix of missing and extraneous counts per locale is printed:
+
+    Catalog  Locale   Keys  Missing  Extraneous  Coverage
+    main     de        900        0           2    100.0%
+    air      ru        336        0           2    100.0%
+
 Note: Plural form variations (otherValue, manyValue, fewValue, etc.) are not counted as separate keys
 since they are language-dependent and expected to vary between languages.
 """
 
 import argparse
+import json
 import os
+import sys
 import yaml
-from typing import Dict, Set, Any
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Set, Any, List, Optional, Tuple
+
+# libyaml's loader when PyYAML was built with it; parses the same documents several times faster
+YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+DEFAULT_I18N_DIR = os.path.normpath(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', '..', '..', 'src', 'i18n')
+)
+# Locale catalogs checked by --all, relative to --i18n-dir; each has its own en.yaml base
+CATALOG_DIRS = (('main', ''), ('air', 'air'))
 
 
-def load_yaml_file(file_path: str) -> Dict[str, Any]:
-    """Load YAML file and return its contents as a dictionary."""
+def load_yaml_file(file_path: str, loader=yaml.SafeLoader, errors=None) -> Dict[str, Any]:
+    """Load YAML file and return its contents as a dictionary.
+
+    Errors are printed to errors (default: stdout). --all passes YAML_LOADER
+    and stderr, so its --json output stays parseable.
+    """
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=loader)
             return data if data is not None else {}
     except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.")
+        print(f"Error: File '{file_path}' not found.", file=errors)
         return {}
     except yaml.YAMLError as e:
-        print(f"Error parsing YAML file '{file_path}': {e}")
+        print(f"Error parsing YAML file '{file_path}': {e}", file=errors)
         return {}
 
 
@@ -130,20 +158,121 @@ def print_results(missing_keys: Set[str], extraneous_keys: Set[str], compare_fil
         print("🎉 Localization is complete and clean!")
 
 
+def load_locale_keys(file_path: str) -> Tuple[str, Optional[Set[str]]]:
+    """Load and flatten one locale file; keys are None if it is empty or could not be loaded."""
+    data = load_yaml_file(file_path, YAML_LOADER, sys.stderr)
+    return file_path, flatten_keys(data) if data else None
+
+
+def check_all_locales(i18n_dir: str, base_locale: str = 'en', jobs: int = 1) -> List[Dict[str, Any]]:
+    """Compare every locale file under i18n_dir with its catalog's base.
+
+    All files, bases included, are loaded and flattened in a process pool,
+    so each base is parsed once. Returns one row per locale, in catalog then
+    locale order.
+    """
+    files = []
+    for catalog, subdir in CATALOG_DIRS:
+        catalog_dir = os.path.join(i18n_dir, subdir)
+        if not os.path.isfile(os.path.join(catalog_dir, f"{base_locale}.yaml")):
+            continue
+        files.extend(
+            (catalog, os.path.join(catalog_dir, name))
+            for name in sorted(os.listdir(catalog_dir)) if name.endswith('.yaml')
+        )
+
+    paths = [file_path for _, file_path in files]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(paths))) as executor:
+            loaded = dict(executor.map(load_locale_keys, paths))
+    else:
+        loaded = dict(load_locale_keys(file_path) for file_path in paths)
+
+    rows = []
+    for catalog, file_path in files:
+        locale = os.path.splitext(os.path.basename(file_path))[0]
+        if locale == base_locale:
+            continue
+        base_keys = loaded[os.path.join(os.path.dirname(file_path), f"{base_locale}.yaml")]
+        compare_keys = loaded[file_path]
+        row = {'catalog': catalog, 'locale': locale, 'file': file_path}
+        if base_keys is None or compare_keys is None:
+            row['error'] = 'empty or could not be loaded'
+        else:
+            missing_keys = get_missing_keys(base_keys, compare_keys)
+            row.update(
+                keys=len(compare_keys),
+                base_keys=len(base_keys),
+                missing=sorted(str(key) for key in missing_keys),
+                extraneous=sorted(str(key) for key in get_extraneous_keys(base_keys, compare_keys)),
+                coverage=(len(base_keys) - len(missing_keys)) / len(base_keys) * 100 if base_keys else 100.0
+            )
+        rows.append(row)
+    return rows
+
+
+def print_coverage_matrix(rows: List[Dict[str, Any]], verbose: bool = False):
+    """Print one line of missing and extraneous counts per locale."""
+    print(f"\n=== LOCALIZATION COVERAGE MATRIX ===")
+    print()
+    print(f"{'Catalog':<8} {'Locale':<8} {'Keys':>6} {'Missing':>8} {'Extraneous':>11} {'Coverage':>9}")
+    for row in rows:
+        if 'error' in row:
+            print(f"{row['catalog']:<8} {row['locale']:<8} ❌ {row['file']}: {row['error']}")
+            continue
+        status = '✅' if not row['missing'] and not row['extraneous'] else '❌' if row['missing'] else '⚠️ '
+        print(f"{row['catalog']:<8} {row['locale']:<8} {row['keys']:>6} {len(row['missing']):>8} "
+              f"{len(row['extraneous']):>11} {row['coverage']:>8.1f}%  {status}")
+
+    if verbose:
+        for row in rows:
+            for label, keys in (('MISSING', row.get('missing')), ('EXTRANEOUS', row.get('extraneous'))):
+                if keys:
+                    print(f"\n{label} KEYS IN {os.path.basename(row['file'])} ({row['catalog']}):")
+                    for key in keys:
+                        print(f"  - {key}")
+
+    print()
+    failed = [row for row in rows if row.get('error') or row['missing'] or row['extraneous']]
+    if failed:
+        print(f"Locales with issues: {len(failed)} of {len(rows)}")
+    else:
+        print("🎉 All localizations are complete and clean!")
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Check localization completeness by comparing with base English localization"
     )
     parser.add_argument(
         "--base",
-        required=True,
         help="Path to the base (English) localization file"
     )
     parser.add_argument(
         "--compare",
-        required=True,
         help="Path to the localization file to compare against the base"
     )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Check every locale in --i18n-dir and its air/ subdirectory against their en.yaml"
+    )
+    parser.add_argument(
+        "--i18n-dir",
+        default=DEFAULT_I18N_DIR,
+        help=f"Localization directory used by --all (default: {DEFAULT_I18N_DIR})"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes for loading locale files with --all (default: CPU count)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="With --all, print the coverage matrix as JSON"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -152,6 +281,23 @@ def main():
 
     args = parser.parse_args()
 
+    if args.all:
+        if not os.path.isdir(args.i18n_dir):
+            print(f"Error: Localization directory '{args.i18n_dir}' does not exist.")
+            return 1
+        rows = check_all_locales(args.i18n_dir, jobs=args.jobs)
+        if not rows:
+            print(f"Error: No locale files found next to en.yaml in '{args.i18n_dir}'.")
+            return 1
+        if args.json:
+            print(json.dumps(rows, indent=2, ensure_ascii=False))
+        else:
+            print_coverage_matrix(rows, args.verbose)
+        return 1 if any(row.get('error') or row['missing'] or row['extraneous'] for row in rows) else 0
+
+    if not args.base or not args.compare:
+        parser.error("--base and --compare are required unless --all is given")
+
     # Load the localization files
     print(f"Loading base file: {args.base}")
     base_data = load_yaml_file(args.base)
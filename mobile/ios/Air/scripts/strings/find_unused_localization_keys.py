@@ -11,10 +11,13 @@ Note: No closing parenthesis as per iOS usage pattern.
 Usage:
     python find_unused_localization_keys.py --ios-path ../../../..
     python find_unused_localization_keys.py --ios-path ../../../.. --verbose
+    python find_unused_localization_keys.py --ios-path ../../../.. --json > missing_keys.json
+    python find_unused_localization_keys.py --ios-path ../../../.. --jobs 1
+    python find_unused_localization_keys.py --ios-path ../../../.. --dead-keys
 
 The script will:
 1. Scan all Swift files in the iOS folder
-2. Extract localization keys from lang(" patterns with source file tracking
+2. Index localization keys from lang(" patterns by file, line and column in one pass
 3. Check against src/i18n/en.yaml and src/i18n/air/en.yaml
 4. Report keys used in code but missing from localization files
 5. Show source file names in parentheses for each missing key
@@ -23,16 +26,70 @@ Output format:
     - 'Try again' (LedgerAddAccountView.swift, LedgerSignView.swift)
     - 'Add Stake' (AddStakeVC.swift, EarnHeaderCell.swift)
 
+With --dead-keys the check runs the other way: lang("...") calls in Swift,
+lang('...') calls in the web app's TypeScript and LocaleController calls in
+the Android app's Kotlin go into one inverted index, and every key in
+src/i18n/*.yaml and src/i18n/air/*.yaml that nothing references is reported
+with the bytes pruning it would save in each catalog and in
+Localizable.xcstrings. Keys that only appear as plain string literals are
+kept, since computed lang() arguments are usually built from them.
+
 Exit codes:
-    0 - All keys found in localization files
-    1 - Some keys missing from localization files
+    0 - All keys found in localization files (--dead-keys: no dead keys)
+    1 - Some keys missing from localization files (--dead-keys: dead keys found)
 """
 
 import argparse
+import json
+import mmap
 import os
 import re
+import sys
 import yaml
-from typing import Dict, Set, List, Any
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext, redirect_stdout
+from typing import Dict, Set, List, Any, Iterable, Optional, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from file_walker import DEFAULT_PRUNE_DIRS, walk_files
+
+LANG_CALL = b'lang("'
+# Below this size a plain read is cheaper than setting up a mapping
+MMAP_THRESHOLD = 64 * 1024
+# Matches lang("key_name" - note no closing paren; captures the literal's
+# contents, which may contain escaped quotes such as lang("Say \"hi\"")
+LANG_PATTERN = re.compile(rb'lang\("((?:[^"\\\n]|\\.)+)"')
+# TypeScript calls lang('key', ...); getTranslation is the same function outside components
+TS_LANG_PATTERN = re.compile(rb"""\b(?:lang|getTranslation)\(\s*(?:'((?:[^'\\\n]|\\.)+)'|"((?:[^"\\\n]|\\.)+)")""")
+# Android Air loads the air catalogs too, through LocaleController.getString("key") and friends
+KOTLIN_LANG_PATTERN = re.compile(rb'\bLocaleController\.get\w*\(\s*"((?:[^"\\\n]|\\.)+)"')
+# Per source language: lang call with a literal key, any lang call, and a
+# string literal tokenizer. The tokenizer also matches comments so quotes
+# inside them do not start a string; only its string groups are collected.
+SOURCE_PATTERNS = {
+    '.swift': (
+        LANG_PATTERN,
+        re.compile(rb'\blang\('),
+        re.compile(rb'//[^\n]*|/\*.*?\*/|"((?:[^"\\\n]|\\.)*)"', re.DOTALL),
+    ),
+    '.ts': (
+        TS_LANG_PATTERN,
+        re.compile(rb'\b(?:lang|getTranslation)\('),
+        re.compile(
+            rb"""//[^\n]*|/\*.*?\*/|'((?:[^'\\\n]|\\.)*)'|"((?:[^"\\\n]|\\.)*)"|`((?:[^`\\]|\\.)*)`""",
+            re.DOTALL
+        ),
+    ),
+    '.kt': (
+        KOTLIN_LANG_PATTERN,
+        re.compile(rb'\bLocaleController\.get\w*\('),
+        re.compile(rb'//[^\n]*|/\*.*?\*/|"((?:[^"\\\n]|\\.)*)"', re.DOTALL),
+    ),
+}
+SOURCE_KINDS = {'.swift': '.swift', '.ts': '.ts', '.tsx': '.ts', '.kt': '.kt'}
+STRING_ESCAPE = re.compile(r'\\(?:u\{([0-9A-Fa-f]{1,8})\}|u([0-9A-Fa-f]{4})|(.))')
+# \$ is Kotlin's escape for a literal dollar sign, as in getString("\$accumulated_rewards")
+STRING_ESCAPES = {'0': '\0', '\\': '\\', 't': '\t', 'n': '\n', 'r': '\r', '"': '"', "'": "'", '`': '`', '$': '$'}
 
 
 def load_yaml_file(file_path: str) -> Dict[str, Any]:
@@ -76,55 +133,321 @@ def flatten_keys(data: Dict[str, Any], prefix: str = "") -> Set[str]:
     return keys
 
 
-def find_swift_files(ios_path: str) -> List[str]:
-    """Find all Swift files in the iOS directory."""
-    swift_files = []
-    for root, dirs, files in os.walk(ios_path):
-        for file in files:
-            if file.endswith('.swift'):
-                swift_files.append(os.path.join(root, file))
-    return swift_files
+def find_swift_files(ios_path: str, prune_dirs: Optional[Iterable[str]] = None,
+                     follow_symlinks: bool = False) -> List[str]:
+    """Find all Swift files in the iOS directory, skipping VCS, dependency and build folders."""
+    return list(walk_files(ios_path, ('.swift',), prune_dirs, follow_symlinks))
 
 
-def extract_localization_keys_from_file(file_path: str) -> Set[str]:
-    """Extract localization keys from a Swift file using regex pattern lang("key"."""
-    keys = set()
+def unescape_string_literal(text: str) -> str:
+    """Resolve escape sequences (\\", \\n, \\u{...}, ...) in a Swift, TypeScript or Kotlin string literal's contents."""
+    if '\\' not in text:
+        return text
+    return STRING_ESCAPE.sub(
+        lambda m: chr(int(m.group(1) or m.group(2), 16)) if m.group(1) or m.group(2)
+        else STRING_ESCAPES.get(m.group(3), m.group(0)),
+        text
+    )
+
+
+def _scan_lang_calls(data) -> List[Tuple[str, int, int, str]]:
+    """Find lang(" calls in a bytes-like buffer, decoding only what is reported."""
+    occurrences = []
+    if data.find(LANG_CALL) < 0:
+        return occurrences
+
+    line = 1
+    scanned = 0
+    for match in LANG_PATTERN.finditer(data):
+        start = match.start()
+        line += data[scanned:start].count(b'\n')
+        scanned = start
+        line_start = data.rfind(b'\n', 0, start) + 1
+        line_end = data.find(b'\n', start)
+        source_line = data[line_start:line_end if line_end >= 0 else len(data)]
+        column = len(data[line_start:start].decode('utf-8')) + 1
+        key = unescape_string_literal(match.group(1).decode('utf-8'))
+        occurrences.append((key, line, column, source_line.decode('utf-8').strip()))
+
+    return occurrences
+
+
+def extract_localization_keys_from_file(file_path: str) -> List[Tuple[str, int, int, str]]:
+    """Extract localization keys from a Swift file using regex pattern lang("key".
+
+    Returns (key, line, column, source line) for every occurrence, with
+    1-based line and column numbers. Files are never decoded as a whole:
+    only files containing lang(" are searched, and only keys and their source
+    lines are decoded. Files of MMAP_THRESHOLD bytes or more are
+    memory-mapped instead of read.
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < MMAP_THRESHOLD:
+                return _scan_lang_calls(f.read())
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return _scan_lang_calls(data)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not read file {file_path}: {e}")
+        return []
+
+
+def extract_all_keys_from_swift(ios_path: str, prune_dirs: Optional[Iterable[str]] = None,
+                                follow_symlinks: bool = False,
+                                jobs: int = 1) -> Dict[str, List[Tuple[str, int, int, str]]]:
+    """Index every localization key used in Swift files.
+
+    Returns {key: [(file path, line, column, source line), ...]} in scan order.
+    With jobs > 1 the files are scanned in batches by a process pool; results
+    are merged in file order, so the index is identical either way.
+    """
+    key_index = {}
+    swift_files = find_swift_files(ios_path, prune_dirs, follow_symlinks)
+
+    print(f"Scanning {len(swift_files)} Swift files...")
+
+    if jobs > 1 and len(swift_files) > 1:
+        chunksize = max(1, len(swift_files) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(extract_localization_keys_from_file, swift_files, chunksize=chunksize))
+    else:
+        results = [extract_localization_keys_from_file(file_path) for file_path in swift_files]
+
+    for file_path, occurrences in zip(swift_files, results):
+        for key, line, column, source_line in occurrences:
+            key_index.setdefault(key, []).append((file_path, line, column, source_line))
+
+    return key_index
 
-        # Pattern to match lang("key_name" - note no closing paren
-        # This captures the key inside the quotes
-        pattern = r'lang\("([^"]+)"'
-        matches = re.findall(pattern, content)
 
-        for match in matches:
-            keys.add(match)
+def key_files(locations: List[Tuple[str, int, int, str]]) -> List[str]:
+    """Sorted names of the files a key is used in."""
+    return sorted({os.path.basename(file_path) for file_path, _, _, _ in locations})
 
-    except Exception as e:
+
+def scan_source_file(file_path: str) -> Tuple[List[Tuple[str, int]], Set[str], int]:
+    """Scan a Swift, TypeScript or Kotlin file for the dead key report.
+
+    Returns ([(key, line)] for lang calls with a literal key, every other
+    string literal in the file, number of lang calls with a computed key).
+    """
+    lang_pattern, call_start, string_literal = SOURCE_PATTERNS[SOURCE_KINDS[os.path.splitext(file_path)[1]]]
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+    except OSError as e:
         print(f"Warning: Could not read file {file_path}: {e}")
+        return [], set(), 0
+
+    calls = []
+    line = 1
+    scanned = 0
+    for match in lang_pattern.finditer(data):
+        line += data.count(b'\n', scanned, match.start())
+        scanned = match.start()
+        calls.append((unescape_string_literal(match.group(match.lastindex).decode('utf-8', 'replace')), line))
+
+    literals = set()
+    for match in string_literal.finditer(data):
+        if match.lastindex is not None:
+            literal = match.group(match.lastindex)
+            # String templates with substitutions are computed, not keys
+            if b'${' not in literal:
+                literals.add(unescape_string_literal(literal.decode('utf-8', 'replace')))
+
+    computed_calls = len(call_start.findall(data)) - len(calls)
+    return calls, literals, computed_calls
+
+
+def build_usage_index(sources: List[Tuple[str, Tuple[str, ...]]], prune_dirs: Optional[Iterable[str]] = None,
+                      follow_symlinks: bool = False,
+                      jobs: int = 1) -> Tuple[Dict[str, List[Tuple[str, int]]], Set[str], int, int]:
+    """Build one inverted index of lang calls across Swift, TypeScript and Kotlin sources.
+
+    sources is a list of (root, suffixes). Returns ({key: [(file path, line)]},
+    all other string literals, number of lang calls with a computed key,
+    number of files scanned). With jobs > 1 files are scanned in a process
+    pool and merged in file order.
+    """
+    source_files = [
+        file_path
+        for root, suffixes in sources
+        for file_path in walk_files(root, suffixes, prune_dirs, follow_symlinks)
+    ]
+
+    print(f"Scanning {len(source_files)} source files...")
+
+    if jobs > 1 and len(source_files) > 1:
+        chunksize = max(1, len(source_files) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(scan_source_file, source_files, chunksize=chunksize))
+    else:
+        results = [scan_source_file(file_path) for file_path in source_files]
 
-    return keys
+    usage_index = {}
+    literals = set()
+    computed_calls = 0
+    for file_path, (calls, file_literals, file_computed_calls) in zip(source_files, results):
+        for key, line in calls:
+            usage_index.setdefault(key, []).append((file_path, line))
+        literals |= file_literals
+        computed_calls += file_computed_calls
 
+    return usage_index, literals, computed_calls, len(source_files)
 
-def extract_all_keys_from_swift(ios_path: str) -> Dict[str, Set[str]]:
-    """Extract all localization keys from all Swift files, tracking which file each key came from."""
-    all_keys = {}
-    swift_files = find_swift_files(ios_path)
 
-    print(f"Scanning {len(swift_files)} Swift files...")
+def catalog_entry_sizes(file_path: str) -> Dict[str, int]:
+    """Return {key: bytes} for each top-level entry of a YAML catalog.
+
+    Keys are taken as written, so `No: Нет` is the key 'No' rather than
+    False. An entry spans from its key to the next key, value lines
+    included.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    node = yaml.compose(text, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+    if not isinstance(node, yaml.MappingNode):
+        return {}
+
+    starts = [(key_node.start_mark.index, str(key_node.value)) for key_node, _ in node.value]
+    ends = [start for start, _ in starts[1:]] + [len(text)]
+    return {key: len(text[start:end].encode('utf-8')) for (start, key), end in zip(starts, ends)}
 
-    for file_path in swift_files:
-        keys = extract_localization_keys_from_file(file_path)
-        file_name = os.path.basename(file_path)
 
-        for key in keys:
-            if key in all_keys:
-                all_keys[key].add(file_name)
+def xcstrings_bytes_saved(file_path: str, keys: Set[str]) -> Tuple[int, int]:
+    """Return (keys present, bytes saved) for pruning keys from an .xcstrings catalog.
+
+    Sizes follow the formatting import_localizations.py writes the catalog with.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+
+    def size(data):
+        return len(json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8'))
+
+    strings = catalog.get('strings', {})
+    pruned = dict(catalog, strings={key: value for key, value in strings.items() if key not in keys})
+    return len(keys & strings.keys()), size(catalog) - size(pruned)
+
+
+def report_dead_keys(args, ios_path: str, prune_dirs: Iterable[str]) -> int:
+    """Report catalog keys that no Swift, TypeScript or Kotlin code references."""
+    catalog_dirs = []
+    for i18n_path in (os.path.join(ios_path, args.main_i18n), os.path.join(ios_path, args.air_i18n)):
+        catalog_dir = os.path.dirname(i18n_path)
+        if catalog_dir not in catalog_dirs:
+            catalog_dirs.append(catalog_dir)
+    catalog_files = [
+        os.path.join(catalog_dir, name)
+        for catalog_dir in catalog_dirs if os.path.isdir(catalog_dir)
+        for name in sorted(os.listdir(catalog_dir)) if name.endswith('.yaml')
+    ]
+    web_src = os.path.join(ios_path, args.web_src)
+    android_src = os.path.join(ios_path, args.android_src)
+    xcstrings_path = os.path.join(ios_path, args.xcstrings)
+
+    with redirect_stdout(sys.stderr) if args.json else nullcontext():
+        print("💀 Dead Localization Key Detector")
+        print("=================================")
+        print()
+
+        print("📱 Indexing lang() calls in Swift, TypeScript and Kotlin files...")
+        sources = [(ios_path, ('.swift',))]
+        for source_dir, suffixes in ((web_src, ('.ts', '.tsx')), (android_src, ('.kt',))):
+            if os.path.isdir(source_dir):
+                sources.append((source_dir, suffixes))
             else:
-                all_keys[key] = {file_name}
+                print(f"Warning: Source directory '{source_dir}' does not exist, skipping it.")
+        usage_index, literals, computed_calls, files_scanned = build_usage_index(
+            sources, prune_dirs, args.follow_symlinks, args.jobs
+        )
+        print(f"Found {sum(len(usages) for usages in usage_index.values())} lang() calls "
+              f"using {len(usage_index)} unique keys.")
+
+        print("\n📂 Loading localization files...")
+        catalogs = {}
+        for catalog_file in catalog_files:
+            try:
+                catalogs[catalog_file] = catalog_entry_sizes(catalog_file)
+            except (OSError, yaml.YAMLError) as e:
+                print(f"Error parsing YAML file '{catalog_file}': {e}")
+
+        if not catalogs:
+            print("❌ No localization files found.")
+            return 1
+
+        catalog_keys = set().union(*catalogs.values())
+        unreferenced = catalog_keys - set(usage_index)
+        # Keys passed to lang() through a variable or ternary usually appear
+        # as plain string literals elsewhere; keep those.
+        literal_only = unreferenced & literals
+        dead_keys = unreferenced - literals
+
+        if args.verbose:
+            for catalog_file, sizes in catalogs.items():
+                print(f"{os.path.relpath(catalog_file, ios_path)}: {len(sizes)} keys")
+            print(f"Total unique localized keys: {len(catalog_keys)}")
+            print(f"lang() calls with a computed key: {computed_calls}")
+            print(f"Keys only seen as plain string literals: {len(literal_only)}")
+
+    bytes_saved = {}
+    for catalog_file, sizes in catalogs.items():
+        dead_in_file = [key for key in sizes if key in dead_keys]
+        if dead_in_file:
+            bytes_saved[os.path.relpath(catalog_file, ios_path)] = (
+                len(dead_in_file), sum(sizes[key] for key in dead_in_file)
+            )
+    if dead_keys and os.path.exists(xcstrings_path):
+        bytes_saved[os.path.relpath(xcstrings_path, ios_path)] = xcstrings_bytes_saved(xcstrings_path, dead_keys)
+
+    if args.json:
+        result = {
+            'files_scanned': files_scanned,
+            'lang_calls': sum(len(usages) for usages in usage_index.values()),
+            'computed_lang_calls': computed_calls,
+            'catalog_keys': len(catalog_keys),
+            'literal_only_keys': sorted(literal_only),
+            'dead_keys': {
+                key: sorted(os.path.relpath(catalog_file, ios_path)
+                            for catalog_file, sizes in catalogs.items() if key in sizes)
+                for key in sorted(dead_keys)
+            },
+            'bytes_saved': {
+                path: {'keys': keys, 'bytes': size} for path, (keys, size) in bytes_saved.items()
+            }
+        }
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 1 if dead_keys else 0
+
+    print("\n=== DEAD KEY ANALYSIS ===")
+    print()
 
-    return all_keys
+    if not dead_keys:
+        print("✅ NO DEAD KEYS FOUND")
+        print("Every key in the localization files is referenced from Swift, TypeScript or Kotlin code.")
+        return 0
+
+    print(f"💀 UNREFERENCED KEYS IN LOCALIZATION FILES:")
+    print(f"   Found {len(dead_keys)} keys that no lang() call or string literal references")
+    print()
+
+    for key in sorted(dead_keys):
+        files = sorted(os.path.basename(catalog_file) for catalog_file, sizes in catalogs.items() if key in sizes)
+        print(f"  - '{key}' ({', '.join(files)})")
+
+    print(f"\nTotal dead keys: {len(dead_keys)}")
+
+    print(f"\n📦 Bytes saved by pruning them:")
+    for path, (keys, size) in bytes_saved.items():
+        print(f"  {path}: {keys} keys, {size:,} bytes")
+    print(f"  Total: {sum(size for _, size in bytes_saved.values()):,} bytes")
+
+    if computed_calls:
+        print(f"\n⚠️  {computed_calls} lang() calls pass a computed key; "
+              f"{len(literal_only)} keys seen only as plain string literals were kept.")
+
+    return 1
 
 
 def main():
@@ -146,6 +469,51 @@ def main():
         default="src/i18n/air/en.yaml",
         help="Path to air i18n YAML file (default: src/i18n/air/en.yaml)"
     )
+    parser.add_argument(
+        "--dead-keys",
+        action="store_true",
+        help="Reverse mode: report keys in the i18n YAML files that no Swift, TypeScript or Kotlin code uses"
+    )
+    parser.add_argument(
+        "--web-src",
+        default="src",
+        help="Web app TypeScript sources scanned by --dead-keys (default: src)"
+    )
+    parser.add_argument(
+        "--android-src",
+        default="mobile/android",
+        help="Android Kotlin sources scanned by --dead-keys (default: mobile/android)"
+    )
+    parser.add_argument(
+        "--xcstrings",
+        default="mobile/ios/Air/SubModules/WalletContext/Resources/Strings/Localizable.xcstrings",
+        help="Generated string catalog whose savings --dead-keys reports "
+             "(default: mobile/ios/Air/SubModules/WalletContext/Resources/Strings/Localizable.xcstrings)"
+    )
+    parser.add_argument(
+        "--exclude-dir",
+        action="append",
+        default=[],
+        metavar="NAME",
+        help=f"Extra directory name to skip while scanning, may be repeated "
+             f"(always skipped: {', '.join(sorted(DEFAULT_PRUNE_DIRS))})"
+    )
+    parser.add_argument(
+        "--follow-symlinks",
+        action="store_true",
+        help="Descend into symlinked directories while scanning"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes for scanning Swift files (default: CPU count)"
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print missing keys with their file, line and column as JSON; progress goes to stderr"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -156,6 +524,7 @@ def main():
 
     # Convert relative paths to absolute paths
     ios_path = os.path.abspath(args.ios_path)
+    prune_dirs = DEFAULT_PRUNE_DIRS | set(args.exclude_dir)
     main_i18n_path = os.path.join(ios_path, args.main_i18n)
     air_i18n_path = os.path.join(ios_path, args.air_i18n)
 
@@ -163,53 +532,74 @@ def main():
         print(f"Error: iOS path '{ios_path}' does not exist.")
         return 1
 
-    print("🔍 Swift Localization Key Scanner")
-    print("=================================")
-    print()
+    if args.dead_keys:
+        return report_dead_keys(args, ios_path, prune_dirs)
 
-    # Extract keys from Swift files
-    print("📱 Extracting localization keys from Swift files...")
-    swift_keys_dict = extract_all_keys_from_swift(ios_path)
+    # Keep stdout machine-readable in --json mode: progress goes to stderr.
+    with redirect_stdout(sys.stderr) if args.json else nullcontext():
+        print("🔍 Swift Localization Key Scanner")
+        print("=================================")
+        print()
 
-    if not swift_keys_dict:
-        print("❌ No localization keys found in Swift files.")
-        return 0
+        # Index keys used in Swift files with their locations
+        print("📱 Extracting localization keys from Swift files...")
+        swift_key_index = extract_all_keys_from_swift(
+            ios_path, prune_dirs, args.follow_symlinks, args.jobs
+        )
 
-    print(f"Found {len(swift_keys_dict)} unique localization keys in Swift code.")
+        if not swift_key_index and not args.json:
+            print("❌ No localization keys found in Swift files.")
+            return 0
 
-    # Convert to set for easier comparison
-    swift_keys = set(swift_keys_dict.keys())
+        print(f"Found {len(swift_key_index)} unique localization keys in Swift code.")
 
-    # Load localization files
-    print("\n📂 Loading localization files...")
-    main_i18n_data = load_yaml_file(main_i18n_path)
-    air_i18n_data = load_yaml_file(air_i18n_path)
+        # Convert to set for easier comparison
+        swift_keys = set(swift_key_index.keys())
 
-    if not main_i18n_data and not air_i18n_data:
-        print("❌ No localization files found.")
-        return 1
+        # Load localization files
+        print("\n📂 Loading localization files...")
+        main_i18n_data = load_yaml_file(main_i18n_path)
+        air_i18n_data = load_yaml_file(air_i18n_path)
+
+        if not main_i18n_data and not air_i18n_data:
+            print("❌ No localization files found.")
+            return 1
 
-    # Flatten keys from localization files
-    main_i18n_keys = flatten_keys(main_i18n_data) if main_i18n_data else set()
-    air_i18n_keys = flatten_keys(air_i18n_data) if air_i18n_data else set()
-    all_localized_keys = main_i18n_keys.union(air_i18n_keys)
+        # Flatten keys from localization files
+        main_i18n_keys = flatten_keys(main_i18n_data) if main_i18n_data else set()
+        air_i18n_keys = flatten_keys(air_i18n_data) if air_i18n_data else set()
+        all_localized_keys = main_i18n_keys.union(air_i18n_keys)
 
-    if args.verbose:
-        print(f"\nMain i18n file ({main_i18n_path}): {len(main_i18n_keys)} keys")
-        print(f"Air i18n file ({air_i18n_path}): {len(air_i18n_keys)} keys")
-        print(f"Total unique localized keys: {len(all_localized_keys)}")
-        print(f"Swift keys: {len(swift_keys)}")
+        if args.verbose:
+            print(f"\nMain i18n file ({main_i18n_path}): {len(main_i18n_keys)} keys")
+            print(f"Air i18n file ({air_i18n_path}): {len(air_i18n_keys)} keys")
+            print(f"Total unique localized keys: {len(all_localized_keys)}")
+            print(f"Swift keys: {len(swift_keys)}")
 
-        # Show some examples of keys with their files
-        print(f"\n📋 Sample keys found in Swift files:")
-        sample_keys = list(swift_keys_dict.keys())[:5]
-        for key in sample_keys:
-            files = sorted(list(swift_keys_dict[key]))
-            print(f"  - '{key}' ({', '.join(files)})")
+            # Show some examples of keys with their files
+            print(f"\n📋 Sample keys found in Swift files:")
+            sample_keys = list(swift_key_index.keys())[:5]
+            for key in sample_keys:
+                print(f"  - '{key}' ({', '.join(key_files(swift_key_index[key]))})")
 
     # Find missing keys
     missing_keys = swift_keys - all_localized_keys
 
+    if args.json:
+        result = {
+            'swift_keys': len(swift_keys),
+            'localized_keys': len(all_localized_keys),
+            'missing_keys': {
+                key: [
+                    {'file': os.path.relpath(file_path, ios_path), 'line': line, 'column': column}
+                    for file_path, line, column, _ in sorted(swift_key_index[key])
+                ]
+                for key in sorted(missing_keys)
+            }
+        }
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+        return 1 if missing_keys else 0
+
     print("\n=== LOCALIZATION KEY ANALYSIS ===")
     print()
 
@@ -219,39 +609,18 @@ def main():
         print()
 
         for key in sorted(missing_keys):
-            if key in swift_keys_dict:
-                files = sorted(list(swift_keys_dict[key]))
-                print(f"  - '{key}' ({', '.join(files)})")
-            else:
-                print(f"  - '{key}' (unknown file)")
+            print(f"  - '{key}' ({', '.join(key_files(swift_key_index[key]))})")
 
         print(f"\nTotal missing keys: {len(missing_keys)}")
 
-        # Show some examples of usage
+        # Show some examples of usage, straight from the index
         print(f"\n🔍 Usage examples...")
         print("(showing first 5 examples):")
 
-        examples_shown = 0
-        for swift_file in find_swift_files(ios_path):
-            if examples_shown >= 5:
-                break
-
-            try:
-                with open(swift_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-
-                for line_num, line in enumerate(lines, 1):
-                    for missing_key in missing_keys:
-                        if f'lang("{missing_key}"' in line:
-                            print(f"  📄 {os.path.basename(swift_file)}:{line_num}")
-                            print(f"     {line.strip()}")
-                            examples_shown += 1
-                            if examples_shown >= 5:
-                                break
-                    if examples_shown >= 5:
-                        break
-            except:
-                continue
+        examples = sorted(location for key in missing_keys for location in swift_key_index[key])
+        for file_path, line, _, source_line in examples[:5]:
+            print(f"  📄 {os.path.basename(file_path)}:{line}")
+            print(f"     {source_line}")
 
         return 1
     else:
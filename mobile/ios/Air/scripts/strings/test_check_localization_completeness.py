@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Tests for check_localization_completeness.py.
+
+Run from this directory:
+    python3 -m unittest test_check_localization_completeness
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from check_localization_completeness import check_all_locales, load_yaml_file
+
+CATALOGS = {
+    'en.yaml': 'Home: Home\nSettings: Settings\nWallet:\n  Send: Send\n  Receive: Receive\n'
+               '$days:\n  oneValue: "%d day"\n  otherValue: "%d days"\n',
+    'de.yaml': 'Home: Start\nSettings: Einstellungen\nWallet:\n  Send: Senden\n  Receive: Empfangen\n'
+               '$days:\n  oneValue: "%d Tag"\n  otherValue: "%d Tage"\n',
+    'ru.yaml': 'Home: Главная\nWallet:\n  Send: Отправить\n  Receive: Получить\n  Swap: Обмен\n'
+               '$days:\n  oneValue: "%d день"\n  fewValue: "%d дня"\n  manyValue: "%d дней"\n',
+    'air/en.yaml': 'Earn: Earn\nClaim: Claim\n',
+    'air/ru.yaml': 'Earn: Стейкинг\n',
+    'air/broken.yaml': 'Earn: [unclosed\n',
+}
+
+
+class CheckAllLocalesTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        for relative_path, source in CATALOGS.items():
+            path = os.path.join(self.tempdir.name, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(source)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def check(self, jobs: int = 1):
+        with redirect_stderr(io.StringIO()) as errors:
+            rows = check_all_locales(self.tempdir.name, jobs=jobs)
+        return rows, errors.getvalue()
+
+    def test_matrix(self):
+        rows, errors = self.check()
+        self.assertEqual([(row['catalog'], row['locale']) for row in rows],
+                         [('main', 'de'), ('main', 'ru'), ('air', 'broken'), ('air', 'ru')])
+        de, ru, broken, air_ru = rows
+
+        self.assertEqual((de['missing'], de['extraneous'], de['coverage']), ([], [], 100.0))
+        # Plural blocks count as one key whatever forms a locale uses
+        self.assertEqual(ru['missing'], ['Settings'])
+        self.assertEqual(ru['extraneous'], ['Wallet.Swap'])
+        self.assertEqual((ru['keys'], ru['base_keys']), (6, 6))
+        self.assertAlmostEqual(ru['coverage'], 5 / 6 * 100)
+        self.assertEqual(air_ru['missing'], ['Claim'])
+        self.assertEqual(air_ru['coverage'], 50.0)
+
+        self.assertIn('error', broken)
+        self.assertIn('broken.yaml', errors)
+
+    def test_pool_matches_serial_run(self):
+        self.assertEqual(self.check(jobs=1)[0], self.check(jobs=2)[0])
+
+    def test_catalog_without_base_is_skipped(self):
+        os.remove(os.path.join(self.tempdir.name, 'air', 'en.yaml'))
+        rows, _ = self.check()
+        self.assertEqual({row['catalog'] for row in rows}, {'main'})
+
+
+class LoadYamlFileTest(unittest.TestCase):
+    def test_single_file_errors_go_to_stdout(self):
+        with redirect_stdout(io.StringIO()) as output, redirect_stderr(io.StringIO()) as errors:
+            self.assertEqual(load_yaml_file('/nonexistent/en.yaml'), {})
+        self.assertIn('not found', output.getvalue())
+        self.assertEqual(errors.getvalue(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Tests for find_unused_localization_keys.py.
+
+Run from this directory:
+    python3 -m unittest test_find_unused_localization_keys
+"""
+
+import argparse
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+
+from find_unused_localization_keys import (MMAP_THRESHOLD, catalog_entry_sizes, extract_all_keys_from_swift,
+                                           extract_localization_keys_from_file, key_files, report_dead_keys,
+                                           scan_source_file, xcstrings_bytes_saved)
+
+
+class LocalizationScannerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def write(self, relative_path: str, source: str) -> str:
+        path = os.path.join(self.tempdir.name, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(source)
+        return path
+
+
+class ExtractLocalizationKeysTest(LocalizationScannerTestCase):
+    def test_lines_columns_and_escapes(self):
+        path = self.write('View.swift', 'let a = lang("Plain")\n'
+                                        '// Привет: lang("After Cyrillic")\n'
+                                        'let b = lang("Say \\"hi\\"\\n") + lang("\\u{1F600} Smile")\n'
+                                        'let c = lang(key)\n')
+        self.assertEqual(extract_localization_keys_from_file(path), [
+            ('Plain', 1, 9, 'let a = lang("Plain")'),
+            ('After Cyrillic', 2, 12, '// Привет: lang("After Cyrillic")'),
+            ('Say "hi"\n', 3, 9, 'let b = lang("Say \\"hi\\"\\n") + lang("\\u{1F600} Smile")'),
+            ('\U0001F600 Smile', 3, 32, 'let b = lang("Say \\"hi\\"\\n") + lang("\\u{1F600} Smile")'),
+        ])
+
+    def test_large_files_are_memory_mapped_with_the_same_result(self):
+        padding = '// padding\n' * (MMAP_THRESHOLD // 10)
+        small = self.write('Small.swift', 'lang("First")\nlet x = lang("Second")\n')
+        large = self.write('Large.swift', padding + 'lang("First")\nlet x = lang("Second")\n')
+        self.assertGreaterEqual(os.path.getsize(large), MMAP_THRESHOLD)
+        offset = padding.count('\n')
+        self.assertEqual([(key, line - offset, column) for key, line, column, _ in extract_localization_keys_from_file(large)],
+                         [(key, line, column) for key, line, column, _ in extract_localization_keys_from_file(small)])
+
+    def test_files_without_calls_and_unreadable_files(self):
+        empty = self.write('Empty.swift', '')
+        self.assertEqual(extract_localization_keys_from_file(empty), [])
+        with redirect_stdout(io.StringIO()):
+            self.assertEqual(extract_localization_keys_from_file(os.path.join(self.tempdir.name, 'Missing.swift')), [])
+
+
+class KeyIndexTest(LocalizationScannerTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write('UIHome/HomeVC.swift', 'title = lang("Home")\nsubtitle = lang("Wallet")\n')
+        self.write('UIHome/Views/Header.swift', 'label = lang("Wallet")\n')
+        self.write('UISettings/SettingsVC.swift', 'title = lang("Settings")\nback = lang("Home")\n')
+        self.write('node_modules/pkg/Ignored.swift', 'lang("Ignored")\n')
+
+    def index(self, jobs: int = 1):
+        with redirect_stdout(io.StringIO()):
+            return extract_all_keys_from_swift(self.tempdir.name, jobs=jobs)
+
+    def test_index_maps_keys_to_every_location(self):
+        index = self.index()
+        self.assertEqual(set(index), {'Home', 'Wallet', 'Settings'})
+        self.assertEqual(sorted((os.path.relpath(path, self.tempdir.name), line, column)
+                                for path, line, column, _ in index['Home']),
+                         [('UIHome/HomeVC.swift', 1, 9), ('UISettings/SettingsVC.swift', 2, 8)])
+        self.assertEqual(key_files(index['Wallet']), ['Header.swift', 'HomeVC.swift'])
+
+    def test_pool_matches_serial_scan(self):
+        serial = self.index(jobs=1)
+        parallel = self.index(jobs=2)
+        self.assertEqual(serial, parallel)
+        self.assertEqual(list(serial), list(parallel))
+
+
+class ScanSourceFileTest(LocalizationScannerTestCase):
+    def test_kotlin_dollar_escape(self):
+        path = self.write('Earn.kt', 'val title = LocaleController.getString("\\$accumulated_rewards")\n'
+                                     'val label = LocaleController.getString("Earn")\n')
+        calls, literals, computed_calls = scan_source_file(path)
+        self.assertEqual(calls, [('$accumulated_rewards', 1), ('Earn', 2)])
+        self.assertIn('$accumulated_rewards', literals)
+        self.assertEqual(computed_calls, 0)
+
+    def test_swift(self):
+        path = self.write('Home.swift', 'let a = lang("Home")\n'
+                                        '// lang("Commented \\"out\\"") "in comment"\n'
+                                        'let key = flag ? "Dynamic" : "Static"\n'
+                                        'let b = lang(key)\n')
+        calls, literals, computed_calls = scan_source_file(path)
+        self.assertEqual(calls, [('Home', 1), ('Commented "out"', 2)])
+        self.assertEqual(literals, {'Home', 'Dynamic', 'Static'})
+        self.assertEqual(computed_calls, 1)
+
+    def test_typescript(self):
+        path = self.write('Web.tsx', "lang('Single')\n"
+                                     'getTranslation("Double", { count })\n'
+                                     "lang(`Template`)\n"
+                                     "const key = `prefix ${name}`\n"
+                                     "/* 'in comment' */ const other = 'It\\'s'\n")
+        calls, literals, computed_calls = scan_source_file(path)
+        self.assertEqual(calls, [('Single', 1), ('Double', 2)])
+        self.assertEqual(literals, {'Single', 'Double', 'Template', "It's"})
+        self.assertEqual(computed_calls, 1)
+
+
+class DeadKeyReportTest(LocalizationScannerTestCase):
+    XCSTRINGS = 'mobile/ios/Air/SubModules/WalletContext/Resources/Strings/Localizable.xcstrings'
+
+    def setUp(self):
+        super().setUp()
+        self.write('src/i18n/en.yaml', 'Home: Home\nUsed In Web: Web\nDynamic: Dynamic\nDead: Gone\nNo: "No"\n')
+        self.write('src/i18n/air/en.yaml', '$accumulated_rewards: Rewards\nAlso Dead: |\n  two\n  lines\n')
+        self.write('mobile/ios/Air/Home.swift', 'lang("Home")\nlet key = flag ? "Dynamic" : "Home"\nlang(key)\n')
+        self.write('src/Web.ts', "lang('Used In Web')\n")
+        self.write('mobile/android/Earn.kt', 'LocaleController.getString("\\$accumulated_rewards")\n')
+        self.write(self.XCSTRINGS, json.dumps({
+            'sourceLanguage': 'en',
+            'strings': {'Home': {}, 'Dead': {'localizations': {'en': {'stringUnit': {'value': 'Gone'}}}}},
+            'version': '1.0',
+        }, indent=2))
+
+    def report(self):
+        args = argparse.Namespace(
+            main_i18n='src/i18n/en.yaml', air_i18n='src/i18n/air/en.yaml', web_src='src',
+            android_src='mobile/android', xcstrings=self.XCSTRINGS, follow_symlinks=False,
+            jobs=1, json=True, verbose=False
+        )
+        output = io.StringIO()
+        with redirect_stdout(output), redirect_stderr(io.StringIO()):
+            status = report_dead_keys(args, self.tempdir.name, {'node_modules'})
+        return status, json.loads(output.getvalue())
+
+    def test_catalog_entry_sizes(self):
+        path = os.path.join(self.tempdir.name, 'src/i18n/air/en.yaml')
+        self.assertEqual(catalog_entry_sizes(path), {
+            '$accumulated_rewards': len('$accumulated_rewards: Rewards\n'),
+            'Also Dead': len('Also Dead: |\n  two\n  lines\n'),
+        })
+        self.assertIn('No', catalog_entry_sizes(os.path.join(self.tempdir.name, 'src/i18n/en.yaml')))
+
+    def test_xcstrings_bytes_saved(self):
+        path = os.path.join(self.tempdir.name, self.XCSTRINGS)
+        keys, saved = xcstrings_bytes_saved(path, {'Dead', 'Not In Catalog'})
+        self.assertEqual(keys, 1)
+        self.assertGreater(saved, len('"Dead"'))
+        self.assertEqual(xcstrings_bytes_saved(path, set()), (0, 0))
+
+    def test_report(self):
+        status, result = self.report()
+        self.assertEqual(status, 1)
+        self.assertEqual(result['dead_keys'], {
+            'Also Dead': ['src/i18n/air/en.yaml'],
+            'Dead': ['src/i18n/en.yaml'],
+            'No': ['src/i18n/en.yaml'],
+        })
+        self.assertEqual(result['literal_only_keys'], ['Dynamic'])
+        self.assertEqual(result['computed_lang_calls'], 1)
+        self.assertEqual(result['bytes_saved']['src/i18n/en.yaml'],
+                         {'keys': 2, 'bytes': len('Dead: Gone\nNo: "No"\n')})
+        self.assertEqual(result['bytes_saved'][self.XCSTRINGS]['keys'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for file_walker.py.
+
+Run from this directory:
+    python3 -m unittest test_file_walker
+"""
+
+import os
+import tempfile
+import unittest
+
+from file_walker import walk_files
+
+
+class WalkFilesTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tempdir.name, 'root')
+        self.outside = os.path.join(self.tempdir.name, 'Outside')
+        for relative_path in ('root/A/One.swift', 'root/A/Two.swift', 'root/A/Notes.md', 'root/A/Nested/Three.swift',
+                              'root/A/.git/Hook.swift', 'root/A/node_modules/pkg/Four.swift',
+                              'root/A/Pods/Lib/Five.swift', 'root/B/Six.swift', 'root/B/Six.ts',
+                              'Outside/Shared.swift'):
+            path = os.path.join(self.tempdir.name, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write('// ' + relative_path)
+
+    def tearDown(self):
+        self.tempdir.cleanup()
+
+    def walk(self, **kwargs):
+        return sorted(os.path.relpath(path, self.root) for path in walk_files(self.root, **kwargs))
+
+    def test_default_pruning_and_suffixes(self):
+        self.assertEqual(self.walk(), ['A/Nested/Three.swift', 'A/One.swift', 'A/Two.swift', 'B/Six.swift'])
+        self.assertEqual(self.walk(suffixes=('.ts', '.md')), ['A/Notes.md', 'B/Six.ts'])
+
+    def test_custom_prune_dirs_replace_the_defaults(self):
+        self.assertEqual(self.walk(prune_dirs={'Nested', 'node_modules'}), [
+            'A/.git/Hook.swift', 'A/One.swift', 'A/Pods/Lib/Five.swift', 'A/Two.swift', 'B/Six.swift'])
+
+    def test_symlinked_files_are_always_yielded(self):
+        os.symlink(os.path.join(self.outside, 'Shared.swift'), os.path.join(self.root, 'B', 'Link.swift'))
+        self.assertIn('B/Link.swift', self.walk())
+        self.assertIn('B/Link.swift', self.walk(follow_symlinks=True))
+
+    def test_symlinked_directories_need_follow_symlinks(self):
+        os.symlink(self.outside, os.path.join(self.root, 'B', 'Linked'))
+        self.assertNotIn('B/Linked/Shared.swift', self.walk())
+        self.assertIn('B/Linked/Shared.swift', self.walk(follow_symlinks=True))
+
+    def test_link_loops_terminate(self):
+        os.symlink(self.root, os.path.join(self.root, 'A', 'Loop'))
+        os.symlink(os.path.join(self.root, 'B'), os.path.join(self.root, 'A', 'AlsoB'))
+        paths = self.walk(follow_symlinks=True)
+        self.assertEqual(len([path for path in paths if path.endswith('Six.swift')]), 1)
+        self.assertEqual(len(paths), 4)
+
+    def test_broken_links_and_missing_root_are_skipped(self):
+        os.symlink(os.path.join(self.tempdir.name, 'missing.swift'), os.path.join(self.root, 'B', 'Broken.swift'))
+        self.assertNotIn('B/Broken.swift', self.walk())
+        self.assertEqual(list(walk_files(os.path.join(self.tempdir.name, 'missing'))), [])
+        self.assertEqual(list(walk_files(os.path.join(self.tempdir.name, 'missing'), follow_symlinks=True)), [])
+
+    def test_with_stat_reports_the_link_target(self):
+        target = os.path.join(self.outside, 'Shared.swift')
+        os.symlink(target, os.path.join(self.root, 'B', 'Link.swift'))
+        stats = {os.path.relpath(path, self.root): stat
+                 for path, stat in walk_files(self.root, with_stat=True)}
+        self.assertEqual(stats['B/Link.swift'].st_size, os.stat(target).st_size)
+        self.assertEqual(stats['A/One.swift'].st_size, len('// root/A/One.swift'))
+
+
+if __name__ == '__main__':
+    unittest.main()